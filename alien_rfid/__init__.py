@@ -2,6 +2,23 @@
 from .alien_serial import AlienReaderSerial
 from .alien_network import AlienReaderNetwork
 from .alien_tester import AlienReaderTester
+from .alien_async import AsyncAlienReaderNetwork
+from .alien_fleet import ReaderFleet
+from .alien_stream import TagStreamListener
+from .alien_notify import NotifyReceiver
+from .alien_pool import ReaderPool, get_pool
+from .alien_reconnect import ReconnectPolicy
+from .alien_settings import ReaderSettings
+from .alien_simulator import SimulatedReader, SimulatedTag, ReaderSimulatorServer
+from .alien_metrics import ReaderMetrics
+from .alien_inventory import TagEvent, ARRIVAL, DEPARTURE, inventory_stream
+from .alien_automode import AutoModeSession
+from .alien_batch import BatchScheduler, ReadOp, WriteOp, LockOp
+from .alien_session import ReaderSession
+from .alien_antenna import AntennaSchedule
+from .alien_tuning import AcquisitionTuner
+from .alien_filter import TagFilter
+from .alien_store import TagEventStore
 
 __author__ = """Joe Sacher"""
 __email__ = 'sacherjj@gmail.com'
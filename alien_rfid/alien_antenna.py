@@ -0,0 +1,134 @@
+def reader_antennas(reader):
+    """
+    Antennas of a reader, from MaxAntenna
+
+    :param reader: connected _AlienReader
+    :return: list of antenna numbers
+    """
+    return list(range(int(reader.get_setting('MaxAntenna')) + 1))
+
+
+def antenna_sequence(antennas):
+    """
+    AntennaSequence value for antennas, in order, repeated to dwell longer on an antenna
+
+    :param antennas: antenna numbers
+    :return: AntennaSequence value as str
+    """
+    return ' '.join(str(antenna) for antenna in antennas)
+
+
+def read_tags_by_antenna(reader, antennas=None, retry_count=0):
+    """
+    Read tags on each antenna separately
+
+    AntennaSequence and TagListAntennaCombine are only sent when they differ from the reader's cached
+    values, so repeated reads of the same antennas cost a single TagList command each.
+
+    :param reader: connected _AlienReader
+    :param antennas: antenna numbers in the order to use them, default the current AntennaSequence
+    :param retry_count: retries after '(No Tags)'
+    :return: dict of antenna number to list of TagRecord, for every antenna in antennas
+    """
+    if antennas is not None:
+        reader.set_setting('AntennaSequence', antenna_sequence(antennas))
+    reader.set_setting('TagListAntennaCombine', 'Off')
+    by_antenna = {antenna: [] for antenna in antennas or ()}
+    for record in reader.read_tag_list(retry_count):
+        by_antenna.setdefault(record.antenna, []).append(record)
+    return by_antenna
+
+
+class AntennaSchedule(object):
+    """
+    Adaptive antenna schedule, dwelling on the antennas producing reads and skipping idle ones.
+
+    Each cycle the AntennaSequence repeats every antenna in proportion to its recent yield, the tag
+    reads it produced per dwell, smoothed over cycles, from min_weight up to max_weight repeats.  Antennas
+    that have gone idle drop out of the sequence, and are put back every explore_every cycles, so tags
+    arriving on them are still found.
+
+    schedule = AntennaSchedule([0, 1, 2, 3])
+    while True:
+        by_antenna = schedule.read(ar)
+        ...
+    """
+
+    def __init__(self, antennas, min_weight=1, max_weight=4, smoothing=0.5, explore_every=5):
+        """
+        :param antennas: antenna numbers to schedule
+        :param min_weight: repeats of an antenna with any yield
+        :param max_weight: repeats of the antenna with the highest yield
+        :param smoothing: weight of the latest cycle in the smoothed yield, 0 to 1
+        :param explore_every: cycles between including idle antennas
+        """
+        if not antennas:
+            raise ValueError('At least one antenna is required.')
+        self.antennas = list(antennas)
+        self.min_weight = min_weight
+        self.max_weight = max_weight
+        self.smoothing = smoothing
+        self.explore_every = explore_every
+        self.cycles = 0
+        # Antennas start with the highest yield, so each is tried before any is dropped.
+        self.yields = dict.fromkeys(self.antennas, None)
+
+    def weights(self):
+        """
+        Repeats of each antenna in the next cycle
+
+        :return: dict of antenna number to repeats, 0 for antennas left out
+        """
+        known = [value for value in self.yields.values() if value is not None]
+        best = max(known) if known else 0
+        explore = self.explore_every and self.cycles % self.explore_every == 0
+        weights = {}
+        for antenna, value in self.yields.items():
+            if value is None:
+                weights[antenna] = self.max_weight
+            elif value <= 0.01 * best or not best:
+                weights[antenna] = self.min_weight if explore or not best else 0
+            else:
+                weights[antenna] = max(self.min_weight, min(self.max_weight, round(self.max_weight * value / best)))
+        return weights
+
+    def sequence(self):
+        """
+        Antennas of the next cycle, each repeated by its weight, interleaved so dwell is spread over the cycle
+
+        :return: list of antenna numbers
+        """
+        weights = self.weights()
+        sequence = []
+        for repeat in range(max(weights.values())):
+            sequence.extend(antenna for antenna in self.antennas if weights[antenna] > repeat)
+        return sequence
+
+    def update(self, by_antenna, sequence):
+        """
+        Update antenna yields from the tags read in a cycle
+
+        :param by_antenna: dict of antenna number to TagRecord read
+        :param sequence: antennas used in the cycle
+        :return: None
+        """
+        self.cycles += 1
+        for antenna in set(sequence):
+            dwell = sequence.count(antenna)
+            value = sum(record.count or 1 for record in by_antenna.get(antenna, ())) / float(dwell)
+            previous = self.yields.get(antenna)
+            self.yields[antenna] = value if previous is None else (
+                self.smoothing * value + (1 - self.smoothing) * previous)
+
+    def read(self, reader, retry_count=0):
+        """
+        Run one cycle of the schedule on a reader
+
+        :param reader: connected _AlienReader
+        :param retry_count: retries after '(No Tags)'
+        :return: dict of antenna number to list of TagRecord
+        """
+        sequence = self.sequence()
+        by_antenna = read_tags_by_antenna(reader, sequence, retry_count)
+        self.update(by_antenna, sequence)
+        return by_antenna
@@ -0,0 +1,307 @@
+import asyncio
+from .alien_framing import FrameBuffer
+from .alien_rfid import NotConnectedException, AuthenticationException, RF_LEVEL_RANGE
+from .alien_rfid import g2_read_command, parse_g2_read, g2_write_command, check_g2_write
+from .alien_inventory import async_inventory_stream
+from .alien_taglist import COMPACT_TAG_LIST_FORMATS, TEXT_TAG_LIST, tag_list_parser
+
+
+class AsyncAlienReaderNetwork(object):
+    """
+    Object to interface with Alien RFID reader over network connection, using asyncio streams.
+
+    Mirrors AlienReaderNetwork, but every method that talks to the reader is a coroutine, so one event
+    loop can drive many readers without a thread per reader.
+
+    Designed as an async contextmanager, to be used in an async with statement.
+
+    async with AsyncAlienReaderNetwork(*args) as ar:
+        tags = await ar.read_tags()
+        ...
+    """
+
+    RECV_SIZE = 4096
+
+    def __init__(self, ipaddress='localhost', port=23, username='alien', password='password',
+                 rf_level=200, timeout=2):
+        if not RF_LEVEL_RANGE[0] <= rf_level <= RF_LEVEL_RANGE[1]:
+            raise ValueError('rf_level must be between {} and {}.'.format(*RF_LEVEL_RANGE))
+        self.ipaddress = ipaddress
+        self.port = port
+        self.username = username
+        self.password = password
+        self.rf_level = rf_level
+        self.timeout = timeout
+        self._reader = None
+        self._writer = None
+        self._connected = False
+        self._frames = FrameBuffer()
+        self.tag_list_parser = TEXT_TAG_LIST
+        self._recovering = False
+
+    @property
+    def connected(self):
+        return self._connected
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.connected:
+            await self.close()
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.ipaddress, self.port), self.timeout)
+        self._connected = True
+        s = await self.receive()
+        if "later." in s:
+            message = "Trouble Connecting to #{0}. (Someone else is talking to the reader.)".format(self.ipaddress)
+            raise Exception(message)
+        return True
+
+    async def login(self):
+        """
+        Login to reader with username and password.
+
+        :return: None
+        """
+        await self.send_receive(self.username)
+        result = await self.send_receive(self.password)
+
+        if 'Error:' in result:
+            errmsg = result.split('Error:')[1]
+            await self.close(False)
+            raise AuthenticationException("Trouble logging in: " + errmsg)
+
+    async def open(self):
+        """
+        Open connection to reader, login and set RFLevel.
+
+        :return: None
+        """
+        self._frames.clear()
+        if await self._connect():
+            await self.login()
+            await self.send_receive('RFLevel={}'.format(self.rf_level))
+
+    async def close(self, send_quit=True):
+        """
+        Close connection to reader.
+
+        :param send_quit: Default True, sends the quit command to cleanly shutdown on reader side, before disconnecting.
+        :return: None
+        """
+        writer = self._writer
+        self._connected = False
+        self._reader = None
+        self._writer = None
+        if writer is None:
+            return
+        try:
+            if send_quit:
+                writer.write(b"quit\r\n")
+                await asyncio.wait_for(writer.drain(), self.timeout)
+        except Exception:
+            pass
+        writer.close()
+        try:
+            await asyncio.wait_for(writer.wait_closed(), self.timeout)
+        except Exception:
+            pass
+
+    async def _chunk_read(self):
+        data = await asyncio.wait_for(self._reader.read(self.RECV_SIZE), self.timeout)
+        if not data:
+            self._connected = False
+            raise NotConnectedException('Connection closed by reader {}.'.format(self.ipaddress))
+        return data
+
+    async def _receive(self):
+        packet = self._frames.next_frame()
+        while packet is None:
+            self._frames.feed(await self._chunk_read())
+            packet = self._frames.next_frame()
+        packet = packet.strip()
+
+        if b'Goodbye!' in packet:
+            # Response to Quit, so socket will be automatically closed
+            await self.close(False)
+        if b'Connection Timeout' in packet:
+            raise Exception('Need to reconnect.')
+        return packet.decode('UTF-8')
+
+    async def send(self, msg=""):
+        """
+        Send message to reader
+
+        :param msg: message to send
+        :return: None
+        """
+        if self._writer is None:
+            raise NotConnectedException('Not connected to reader {}.'.format(self.ipaddress))
+        self._writer.write(bytes("{0}\r\n".format(msg), 'UTF-8'))
+        await self._writer.drain()
+
+    async def _retry_after_reopen(self, operation):
+        if self._recovering:
+            # Already reopening, so a failure of the reopen itself is raised rather than reopening again.
+            return await operation()
+        try:
+            return await operation()
+        except Exception:
+            pass
+        self._recovering = True
+        try:
+            await self.close()
+            await self.open()
+        finally:
+            self._recovering = False
+        return await operation()
+
+    async def receive(self):
+        """
+        Receive Data from RFID Reader
+
+        :return: raw text data from reader (hex if memory read)
+        """
+        return await self._retry_after_reopen(self._receive)
+
+    async def send_receive(self, msg=""):
+        """
+        Perform a send immediately followed by a receive and return received data
+
+        :param msg: Message to send
+        :return: raw text data from reader (hex if memory read)
+        """
+        async def _send_receive():
+            await self.send(msg)
+            return await self._receive()
+        return await self._retry_after_reopen(_send_receive)
+
+    async def send_many(self, msgs):
+        """
+        Send several messages in one write, then receive the responses in order
+
+        After a reconnect the whole batch is sent again, so only use for messages that are safe to repeat.
+
+        :param msgs: Messages to send
+        :return: list of raw text data from reader, in order of msgs
+        """
+        msgs = list(msgs)
+
+        async def _send_many():
+            if self._writer is None:
+                raise NotConnectedException('Not connected to reader {}.'.format(self.ipaddress))
+            self._writer.write(b''.join(bytes("{0}\r\n".format(msg), 'UTF-8') for msg in msgs))
+            await self._writer.drain()
+            return [await self._receive() for _ in msgs]
+        return await self._retry_after_reopen(_send_many)
+
+    async def set_tag_list_format(self, tag_list_format='Text', custom_format=None):
+        """
+        Set the TagListFormat used by the reader, and parsed by read_tags and read_tag_list
+
+        :param tag_list_format: Text or Custom
+        :param custom_format: TagListCustomFormat, such as '%k,%a,%r', when tag_list_format is Custom
+        :return: None
+        """
+        parser = tag_list_parser(tag_list_format, custom_format)
+        if custom_format:
+            result = await self.send_receive('TagListCustomFormat={}'.format(custom_format))
+            if 'Error' in result:
+                raise Exception('Could not set TagListCustomFormat: {}'.format(result))
+        result = await self.send_receive('TagListFormat={}'.format(parser.tag_list_format))
+        if 'Error' in result:
+            raise Exception('Could not set TagListFormat: {}'.format(result))
+        self.tag_list_parser = parser
+
+    async def use_compact_tag_list(self, custom_formats=COMPACT_TAG_LIST_FORMATS):
+        """
+        Set the first label free Custom TagListFormat the reader accepts, to cut the bytes sent and parsed
+        per tag.  Falls back to the Text format if the reader supports none of them.
+
+        A format is only used once a sample TagList parses in full, as some firmware accepts a format
+        with tokens, such as %m, that it does not report.  A sample without tags is taken as parsing.
+
+        :param custom_formats: TagListCustomFormat strings, in order of preference
+        :return: TagListCustomFormat used, or None if Text format is used
+        """
+        for custom_format in custom_formats:
+            try:
+                await self.set_tag_list_format('Custom', custom_format)
+            except Exception:
+                continue
+            sample = await self.send_receive('t')
+            # Label free lines have no spaces, so every tag line of the sample must be a record.
+            if '(No Tags)' in sample or len(self.tag_list_parser.parse(sample)) == len(sample.split()):
+                return custom_format
+        await self.set_tag_list_format('Text')
+        return None
+
+    async def _read_tag_list_text(self, retry_count):
+        return_text = ''
+        for i in range(retry_count + 1):
+            return_text = await self.send_receive('t')
+            if '(No Tags)' not in return_text:
+                break
+        return return_text
+
+    async def read_tags(self, retry_count=2):
+        """
+        Read default RFID tag
+
+        :param retry_count: attempts before aborting after failure
+        :return: list of tags
+        """
+        return self.tag_list_parser.epcs(await self._read_tag_list_text(retry_count))
+
+    async def read_tag_list(self, retry_count=2):
+        """
+        Read RFID tags with all fields reported by the reader
+
+        :param retry_count: attempts before aborting after failure
+        :return: list of TagRecord
+        """
+        return self.tag_list_parser.parse(await self._read_tag_list_text(retry_count))
+
+    def inventory_stream(self, interval=1.0, window=5.0, max_tags=10000, duration=None):
+        """
+        Poll the TagList continuously, yielding a TagEvent only when a tag arrives or departs
+
+        :param interval: seconds between polls
+        :param window: seconds without a read before a tag departs
+        :param max_tags: most tags tracked at once
+        :param duration: seconds to run for, None for until the generator is closed
+        :return: async generator of TagEvent
+        """
+        return async_inventory_stream(self, interval, window, max_tags, duration)
+
+    async def g2_read(self, bank_number, start_word, word_count, retry_count=2):
+        """
+        Read memory with low lever G2Read
+
+        :param bank_number: 0-3
+        :param start_word: position of first word to read (0-2097151)
+        :param word_count: number of words to read (0-32)
+        :param retry_count: attemps before aborting after failure
+        :return: bytearray of data read
+        """
+        command = g2_read_command(bank_number, start_word, word_count)
+        for i in range(retry_count + 1):
+            values = parse_g2_read(await self.send_receive(command))
+            if values is not None:
+                return values
+        raise Exception('Error getting G2Read({},{},{})'.format(bank_number, start_word, word_count))
+
+    async def g2_write(self, bank_number, start_word, byte_data):
+        """
+        Write to memory with low level G2Write
+
+        :param bank_number: 0-3
+        :param start_word: position of first word to write (0-2097151)
+        :param byte_data: even number of bytes
+        :return: None
+        """
+        check_g2_write(await self.send_receive(g2_write_command(bank_number, start_word, byte_data)))
@@ -0,0 +1,126 @@
+from .alien_inventory import inventory_stream
+from .alien_settings import ReaderSettings
+
+
+class AutoModeSession(object):
+    """
+    Autonomous acquisition, where the reader runs the inventory loop itself in AutoMode and pushes the
+    tags read to a TagStreamListener or NotifyReceiver, instead of being polled once per read cycle.
+
+    start configures the AutoMode settings and the collector on the reader, then turns AutoMode on.
+    stop turns it off, stops the reader sending to the collector, and puts back the settings that were
+    changed.  Settings are read and written in batches, and only those that differ are sent.
+
+    with TagStreamListener(port=4000) as listener:
+        with AutoModeSession(ar, listener, '10.0.0.50', stop_timer=500) as session:
+            for event in session.events(window=3):
+                ...
+
+    Start and stop triggers are given as the reader's 'rising falling' I/O edge masks, the default
+    '0 0' acquiring continuously.  With a start trigger, trigger() starts a cycle from the host.
+    """
+
+    def __init__(self, reader, collector, address, action='Acquire', start_trigger='0 0', stop_trigger='0 0',
+                 stop_timer=1000, start_pause=0, true_pause=0, false_pause=0, antenna_sequence=None,
+                 settings=None):
+        """
+        :param reader: connected _AlienReader
+        :param collector: TagStreamListener or NotifyReceiver the reader sends tags to
+        :param address: host name or ip address of the collector, as reachable from the reader
+        :param action: AutoAction
+        :param start_trigger: AutoStartTrigger
+        :param stop_trigger: AutoStopTrigger
+        :param stop_timer: AutoStopTimer, msec to spend on each acquisition
+        :param start_pause: AutoStartPause, msec after a start trigger before acquiring
+        :param true_pause: AutoTruePause, msec to pause after a cycle that read tags
+        :param false_pause: AutoFalsePause, msec to pause after a cycle that read none
+        :param antenna_sequence: AntennaSequence to acquire on, such as '0 1', default unchanged
+        :param settings: other settings to apply while running, by name
+        """
+        self.reader = reader
+        self.collector = collector
+        self.address = address
+        self.settings = {
+            'AutoAction': action,
+            'AutoStartTrigger': start_trigger,
+            'AutoStopTrigger': stop_trigger,
+            'AutoStopTimer': stop_timer,
+            'AutoStartPause': start_pause,
+            'AutoTruePause': true_pause,
+            'AutoFalsePause': false_pause,
+        }
+        if antenna_sequence is not None:
+            self.settings['AntennaSequence'] = antenna_sequence
+        self.settings.update(settings or {})
+        self._restore = None
+
+    @property
+    def running(self):
+        return self._restore is not None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        """
+        Configure the reader and the collector, and turn AutoMode on.
+
+        :return: None
+        """
+        if self._restore is not None:
+            return
+        reader_settings = ReaderSettings(self.reader)
+        reader_settings.apply({'AutoMode': False})
+        self._restore = reader_settings.get_all(list(self.settings), refresh=True)
+        try:
+            reader_settings.apply(self.settings)
+            self.collector.configure(self.reader, self.address)
+            reader_settings.apply({'AutoMode': True})
+        except Exception:
+            self.stop()
+            raise
+
+    def stop(self):
+        """
+        Turn AutoMode off, stop sending to the collector and put back the settings changed by start.
+
+        :return: None
+        """
+        if self._restore is None:
+            return
+        restore, self._restore = self._restore, None
+        reader_settings = ReaderSettings(self.reader)
+        reader_settings.apply({'AutoMode': False})
+        self.collector.unconfigure(self.reader)
+        reader_settings.apply(restore)
+
+    def trigger(self):
+        """
+        Start an acquisition cycle now, as if the start trigger happened.
+
+        :return: None
+        """
+        result = self.reader.send_receive('AutoModeTriggerNow')
+        if 'Error' in result:
+            raise Exception('Could not trigger AutoMode: {}'.format(result))
+
+    def events(self, interval=1.0, window=5.0, max_tags=10000, duration=None):
+        """
+        Tags arriving and departing, as reported to a TagStreamListener collector
+
+        A NotifyReceiver hands its tags to its sink, so has none to give here, and raises TypeError.
+
+        :param interval: seconds between checks for departed tags
+        :param window: seconds without a read before a tag departs
+        :param max_tags: most tags tracked at once
+        :param duration: seconds to run for, None for until the generator is closed or collector stopped
+        :return: generator of TagEvent
+        """
+        if not hasattr(self.collector, 'get'):
+            raise TypeError('events needs a TagStreamListener collector, not {}.'.format(
+                type(self.collector).__name__))
+        return inventory_stream(self.collector, interval, window, max_tags, duration)
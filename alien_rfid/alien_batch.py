@@ -0,0 +1,258 @@
+_PENDING = object()
+
+# Lock and Unlock command suffix of each lockable memory field.
+LOCK_FIELDS = ('EPC', 'User', 'KillPwd', 'AccessPwd')
+
+
+def epc_mask(epc, bank=1, bit_pointer=32):
+    """
+    AcqG2Mask value selecting only the tag with an EPC
+
+    :param epc: bytes of EPC
+    :param bank: bank to match, EPC bank by default
+    :param bit_pointer: first bit of the EPC in the bank, after the CRC and PC words
+    :return: AcqG2Mask value as str
+    """
+    epc = bytes(epc)
+    return '{}, {}, {}, {}'.format(bank, bit_pointer, len(epc) * 8, epc.hex(' ').upper())
+
+
+class ReadOp(object):
+    """
+    Read memory of a tag, the result is the bytearray read.
+    """
+
+    def __init__(self, bank_number, start_word, word_count):
+        self.bank_number = bank_number
+        self.start_word = start_word
+        self.word_count = word_count
+
+    def execute(self, reader):
+        return reader.read_bank(self.bank_number, self.start_word, self.word_count, retry_count=0)
+
+    def __repr__(self):
+        return 'ReadOp({}, {}, {})'.format(self.bank_number, self.start_word, self.word_count)
+
+
+class WriteOp(object):
+    """
+    Write memory of a tag, the result is the number of words written.
+
+    Writing the EPC changes the tag selected, so later operations on the tag are masked with the new EPC.
+    The tag is no longer selected by the old EPC once the first G2Write lands, so EPC bank writes are
+    sent whole, as one G2Write of up to 32 words, and verified by check once masked with the new EPC.
+    """
+
+    def __init__(self, bank_number, start_word, byte_data, skip_unchanged=True, verify=False):
+        self.bank_number = bank_number
+        self.start_word = start_word
+        self.byte_data = bytes(byte_data)
+        self.skip_unchanged = skip_unchanged
+        self.verify = verify
+
+    def execute(self, reader):
+        if self.bank_number == 1:
+            return reader.write_bank(1, self.start_word, self.byte_data, skip_unchanged=False, verify=False,
+                                     retry_count=0)
+        return reader.write_bank(self.bank_number, self.start_word, self.byte_data, self.skip_unchanged,
+                                 self.verify, retry_count=0)
+
+    def check(self, reader):
+        """
+        Verify an EPC bank write, once the tag is masked with its new EPC
+
+        :param reader: connected _AlienReader
+        :return: None
+        """
+        if not self.verify or self.bank_number != 1:
+            return
+        data = reader.read_bank(1, self.start_word, len(self.byte_data) // 2, retry_count=0)
+        if bytes(data) != self.byte_data:
+            raise Exception('Verify failed for G2Write(1,{}): read {}'.format(self.start_word, data.hex().upper()))
+
+    def new_epc(self, epc):
+        """
+        EPC of the tag after this write
+
+        :param epc: bytes of EPC before
+        :return: bytes of EPC after
+        """
+        if self.bank_number != 1:
+            return epc
+        offset = (self.start_word - 2) * 2
+        data = self.byte_data
+        if offset < 0:
+            data, offset = data[-offset:], 0
+        end = min(offset + len(data), len(epc))
+        if offset >= end:
+            return epc
+        return epc[:offset] + data[:end - offset] + epc[end:]
+
+    def __repr__(self):
+        return 'WriteOp({}, {}, {})'.format(self.bank_number, self.start_word, self.byte_data.hex().upper())
+
+
+class LockOp(object):
+    """
+    Lock or unlock a memory field of a tag, the result is the reader's response.
+    """
+
+    def __init__(self, field, unlock=False, access_password=None):
+        """
+        :param field: EPC, User, KillPwd or AccessPwd
+        :param unlock: unlock instead of lock
+        :param access_password: bytes of Access Pwd, default the one set on the reader
+        """
+        if field not in LOCK_FIELDS:
+            raise ValueError('field must be one of {}.'.format(', '.join(LOCK_FIELDS)))
+        self.field = field
+        self.unlock = unlock
+        self.access_password = access_password
+
+    def execute(self, reader):
+        command = '{}{}'.format('Unlock' if self.unlock else 'Lock', self.field)
+        if self.access_password is not None:
+            command += ' = ' + bytes(self.access_password).hex(' ').upper()
+        result = reader.send_receive(command)
+        if 'Error' in result or 'No tag' in result:
+            raise Exception('{} failed: {}'.format(command, result))
+        return result
+
+    def __repr__(self):
+        return 'LockOp({!r}{})'.format(self.field, ', unlock=True' if self.unlock else '')
+
+
+class TagResult(object):
+    """
+    Outcome of the operations on one tag of a BatchScheduler.
+
+    results holds the result of each operation in order, None for any not completed, error the last
+    error if not all completed, attempts the passes the tag was tried in, and epc the EPC after any
+    EPC writes.
+    """
+
+    def __init__(self, epc, operations):
+        self.original_epc = epc
+        self.epc = epc
+        self.operations = operations
+        self._results = [_PENDING] * len(operations)
+        self.error = None
+        self.attempts = 0
+
+    @property
+    def results(self):
+        return [None if result is _PENDING else result for result in self._results]
+
+    @property
+    def ok(self):
+        return _PENDING not in self._results
+
+    def __repr__(self):
+        return 'TagResult({}, {})'.format(self.original_epc.hex().upper(), 'ok' if self.ok else repr(self.error))
+
+
+class BatchScheduler(object):
+    """
+    Runs memory operations on many tags in the field, each selected in turn with AcqG2Mask.
+
+    All operations for a tag run under one mask, so the mask changes once per tag, and only when it
+    differs from the one the reader already has.  Each pass first inventories the field, so tags
+    present are done first and tags missing are left for the next pass without spending commands on
+    them.  Tags that fail are retried in a later pass, skipping the operations already done.  The
+    reader's AcqG2Mask and AcqG2MaskAction are put back when finished.
+
+    batch = BatchScheduler(ar)
+    for epc in epcs:
+        batch.add(epc, WriteOp(3, 0, user_data, verify=True), LockOp('User'))
+    results = batch.run()
+    """
+
+    def __init__(self, reader, passes=3, inventory=True):
+        """
+        :param reader: connected _AlienReader
+        :param passes: times each tag is tried before giving up
+        :param inventory: read the TagList at the start of each pass, to skip tags not in the field
+        """
+        self.reader = reader
+        self.passes = passes
+        self.inventory = inventory
+        self.results = {}
+
+    def __len__(self):
+        return len(self.results)
+
+    def add(self, epc, *operations):
+        """
+        Add operations to run on a tag, after any already added for it
+
+        :param epc: bytes of EPC of the tag
+        :param operations: ReadOp, WriteOp, LockOp, or anything with execute(reader)
+        :return: TagResult, filled in by run
+        """
+        epc = bytes(epc)
+        result = self.results.get(epc)
+        if result is None:
+            result = self.results[epc] = TagResult(epc, [])
+        result.operations.extend(operations)
+        result._results.extend([_PENDING] * len(operations))
+        return result
+
+    def _saved_mask(self):
+        saved = {}
+        for name in ('AcqG2Mask', 'AcqG2MaskAction'):
+            try:
+                saved[name] = self.reader.get_setting(name)
+            except Exception:
+                pass
+        return saved
+
+    def run(self):
+        """
+        Run all operations added
+
+        :return: dict of original EPC to TagResult
+        """
+        saved = self._saved_mask()
+        try:
+            self.reader.set_setting('AcqG2MaskAction', 'Include')
+            pending = [result for result in self.results.values() if not result.ok]
+            for _ in range(self.passes):
+                if not pending:
+                    break
+                present = None
+                if self.inventory:
+                    self.reader.set_setting('AcqG2Mask', '0')
+                    present = set(bytes(epc) for epc in self.reader.read_tags(retry_count=0))
+                failed = []
+                for result in pending:
+                    if present is not None and result.epc not in present:
+                        result.error = Exception('Tag not in field.')
+                        failed.append(result)
+                    elif not self._run_tag(result):
+                        failed.append(result)
+                pending = failed
+        finally:
+            for name, value in saved.items():
+                self.reader.set_setting(name, value)
+        return self.results
+
+    def _run_tag(self, result):
+        result.attempts += 1
+        try:
+            self.reader.set_setting('AcqG2Mask', epc_mask(result.epc))
+            for index, operation in enumerate(result.operations):
+                if result._results[index] is not _PENDING:
+                    continue
+                value = operation.execute(self.reader)
+                if isinstance(operation, WriteOp):
+                    epc = operation.new_epc(result.epc)
+                    if epc != result.epc:
+                        result.epc = epc
+                        self.reader.set_setting('AcqG2Mask', epc_mask(epc))
+                    operation.check(self.reader)
+                result._results[index] = value
+        except Exception as e:
+            result.error = e
+            return False
+        result.error = None
+        return True
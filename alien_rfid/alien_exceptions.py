@@ -0,0 +1,10 @@
+class NotConnectedException(Exception):
+    pass
+
+
+class ReaderTimeoutException(Exception):
+    pass
+
+
+class AuthenticationException(Exception):
+    pass
@@ -0,0 +1,163 @@
+from .alien_settings import ReaderSettings
+
+# Settings of a reader with no filtering.
+NO_FILTER = {
+    'AcqG2Mask': '0',
+    'AcqG2MaskAction': 'Include',
+    'RSSIFilter': '0 0',
+    'TagStreamCountFilter': '0 0',
+}
+
+
+def _mask_bits(data, bit_length):
+    # First bit_length bits of data as an int.
+    return int.from_bytes(data, 'big') >> (len(data) * 8 - bit_length)
+
+
+class TagFilter(object):
+    """
+    Tags wanted from a reader, filtered on the reader itself so other tags are never singulated, sent
+    or parsed.
+
+    epc_prefix, or a mask on any bank, compiles to AcqG2Mask, selecting only matching tags during the
+    inventory, or with exclude only the tags not matching.  rssi compiles to RSSIFilter, and min_count
+    and max_count to TagStreamCountFilter, for tags streamed in TagStreamMode or AutoMode.
+
+    tag_filter = TagFilter(epc_prefix='3034', rssi=(-70, -30))
+    tag_filter.apply(ar)
+    tags = ar.read_tag_list()
+
+    The TagList is not limited by TagStreamCountFilter, and matches checks a record against the whole
+    filter, for the count of TagList reads or records from readers without RSSIFilter.
+    """
+
+    def __init__(self, epc_prefix=None, mask=None, exclude=False, rssi=None, min_count=None, max_count=None):
+        """
+        :param epc_prefix: first bytes of the EPC, as bytes or hex str, where an odd number of hex digits
+            matches a whole number of nibbles
+        :param mask: (bank, bit pointer, bit length, bytes) to match instead of an EPC prefix
+        :param exclude: select the tags not matching the prefix or mask
+        :param rssi: (min, max) RSSI of reads kept
+        :param min_count: fewest reads of a tag before it is streamed
+        :param max_count: most reads of a tag that are streamed
+        """
+        if epc_prefix is not None and mask is not None:
+            raise ValueError('Give either epc_prefix or mask, not both.')
+        if epc_prefix is not None:
+            if isinstance(epc_prefix, str):
+                digits = epc_prefix.replace(' ', '')
+                bit_length = len(digits) * 4
+                data = bytes.fromhex(digits + '0' * (len(digits) % 2))
+            else:
+                data = bytes(epc_prefix)
+                bit_length = len(data) * 8
+            # EPC starts after the CRC and PC words of the EPC bank.
+            mask = (1, 32, bit_length, data)
+        if mask is not None:
+            bank, bit_pointer, bit_length, data = mask
+            data = bytes(data)
+            if not 0 <= bank <= 3:
+                raise ValueError('bank must be from 0 to 3.')
+            if not 0 < bit_length <= len(data) * 8:
+                raise ValueError('bit length must be from 1 to the bits of mask data.')
+            mask = (bank, bit_pointer, bit_length, data[:(bit_length + 7) // 8])
+        if rssi is not None and rssi[0] > rssi[1]:
+            raise ValueError('RSSI min must not be above max.')
+        if min_count is not None and max_count is not None and min_count > max_count:
+            raise ValueError('min_count must not be above max_count.')
+        self.mask = mask
+        self.exclude = exclude
+        self.rssi = rssi
+        self.min_count = min_count
+        self.max_count = max_count
+
+    def __repr__(self):
+        fields = []
+        if self.mask is not None:
+            fields.append('mask={}'.format(self._mask_value()))
+        if self.exclude:
+            fields.append('exclude=True')
+        for name in ('rssi', 'min_count', 'max_count'):
+            if getattr(self, name) is not None:
+                fields.append('{}={!r}'.format(name, getattr(self, name)))
+        return 'TagFilter({})'.format(', '.join(fields))
+
+    def _mask_value(self):
+        bank, bit_pointer, bit_length, data = self.mask
+        return '{}, {}, {}, {}'.format(bank, bit_pointer, bit_length, data.hex(' ').upper())
+
+    def settings(self):
+        """
+        Reader settings the filter compiles to, undoing any earlier filter
+
+        :return: dict of setting name to value
+        """
+        settings = dict(NO_FILTER)
+        if self.mask is not None:
+            settings['AcqG2Mask'] = self._mask_value()
+            settings['AcqG2MaskAction'] = 'Exclude' if self.exclude else 'Include'
+        if self.rssi is not None:
+            settings['RSSIFilter'] = '{} {}'.format(*self.rssi)
+        if self.min_count is not None or self.max_count is not None:
+            settings['TagStreamCountFilter'] = '{} {}'.format(self.min_count or 0, self.max_count or 0)
+        return settings
+
+    def apply(self, reader):
+        """
+        Filter tags on a reader, sending only the settings that differ
+
+        :param reader: connected _AlienReader
+        :return: list of names of settings sent to reader
+        """
+        return ReaderSettings(reader).apply(self.settings())
+
+    @staticmethod
+    def clear(reader):
+        """
+        Stop filtering tags on a reader
+
+        :param reader: connected _AlienReader
+        :return: list of names of settings sent to reader
+        """
+        return ReaderSettings(reader).apply(NO_FILTER)
+
+    def matches(self, record):
+        """
+        Check a record against the filter, on the host
+
+        Masks on banks other than the EPC, or before the EPC, cannot be checked against a record, and are
+        taken as matching.
+
+        :param record: TagRecord
+        :return: True if the record passes the filter
+        """
+        if self.mask is not None:
+            bank, bit_pointer, bit_length, data = self.mask
+            if bank == 1 and bit_pointer >= 32:
+                epc = bytes(record.epc)
+                start = bit_pointer - 32
+                if start + bit_length > len(epc) * 8:
+                    matched = False
+                else:
+                    value = int.from_bytes(epc, 'big') >> (len(epc) * 8 - start - bit_length)
+                    matched = value & ((1 << bit_length) - 1) == _mask_bits(data, bit_length)
+                if matched == self.exclude:
+                    return False
+        if self.rssi is not None and record.rssi is not None:
+            if not self.rssi[0] <= record.rssi <= self.rssi[1]:
+                return False
+        if record.count is not None:
+            if self.min_count is not None and record.count < self.min_count:
+                return False
+            if self.max_count is not None and record.count > self.max_count:
+                return False
+        return True
+
+    def filter(self, records):
+        """
+        Records passing the filter, on the host
+
+        :param records: TagRecord
+        :return: list of TagRecord
+        """
+        return [record for record in records if self.matches(record)]
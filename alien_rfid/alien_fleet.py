@@ -0,0 +1,167 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _reader_name(reader):
+    for attribute in ('ipaddress', '_serial_port'):
+        name = getattr(reader, attribute, None)
+        if name is not None:
+            return str(name)
+    return str(id(reader))
+
+
+class FleetTag(object):
+    """
+    A tag seen by one or more readers of a ReaderFleet.
+
+    sightings is a list of (reader name, antenna) pairs, antenna is None when the TagListFormat does not
+    report it.
+    """
+
+    __slots__ = ('epc', 'sightings')
+
+    def __init__(self, epc):
+        self.epc = epc
+        self.sightings = []
+
+    @property
+    def readers(self):
+        return sorted(set(reader for reader, antenna in self.sightings))
+
+    def __repr__(self):
+        return 'FleetTag({}, {})'.format(self.epc.hex().upper(), self.sightings)
+
+
+class ReaderFleet(object):
+    """
+    Group of Alien RFID readers that are operated on concurrently.
+
+    Each reader is used from a worker thread of a shared pool, so one inventory cycle across the fleet
+    takes about as long as the slowest reader, rather than the sum of all of them.
+
+    with ReaderFleet([AlienReaderNetwork('10.0.0.1'), AlienReaderNetwork('10.0.0.2')]) as fleet:
+        tags = fleet.inventory()
+        ...
+
+    Failures of individual readers do not abort the whole operation, they are kept in errors, keyed by
+    reader name, until the next operation.
+    """
+
+    def __init__(self, readers=(), max_workers=None):
+        self.readers = {}
+        self.errors = {}
+        self.max_workers = max_workers
+        self._executor = None
+        for reader in readers:
+            self.add(reader)
+
+    def __len__(self):
+        return len(self.readers)
+
+    def __iter__(self):
+        return iter(self.readers.values())
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def add(self, reader, name=None):
+        """
+        Add reader to fleet
+
+        :param reader: AlienReaderNetwork, AlienReaderSerial or other _AlienReader
+        :param name: name used to attribute results, defaults to ip address or serial port
+        :return: name of reader
+        """
+        if name is None:
+            name = _reader_name(reader)
+        if name in self.readers:
+            raise ValueError('Reader {} already in fleet.'.format(name))
+        self.readers[name] = reader
+        return name
+
+    def remove(self, name):
+        """
+        Remove reader from fleet, without closing it
+
+        :param name: name of reader
+        :return: reader removed
+        """
+        return self.readers.pop(name)
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers or max(len(self.readers), 1))
+        return self._executor
+
+    def map(self, operation):
+        """
+        Run operation on every reader concurrently
+
+        :param operation: callable taking a reader
+        :return: dict of reader name to result, for readers that did not raise
+        """
+        futures = {name: self._pool().submit(operation, reader) for name, reader in self.readers.items()}
+        results = {}
+        self.errors = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                self.errors[name] = e
+        return results
+
+    def open(self):
+        """
+        Open connection to every reader.
+
+        :return: None
+        """
+        self.map(lambda reader: reader.open())
+
+    def close(self):
+        """
+        Close connection to every reader and shut down worker pool.
+
+        :return: None
+        """
+        self.map(lambda reader: reader.close() if reader.connected else None)
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def read_tags(self, retry_count=2):
+        """
+        Read tags from every reader
+
+        :param retry_count: attempts before aborting after failure, per reader
+        :return: dict of reader name to list of tags
+        """
+        return self.map(lambda reader: reader.read_tags(retry_count))
+
+    def read_tag_list(self, retry_count=2):
+        """
+        Read tags, with all fields reported, from every reader
+
+        :param retry_count: attempts before aborting after failure, per reader
+        :return: dict of reader name to list of TagRecord
+        """
+        return self.map(lambda reader: reader.read_tag_list(retry_count))
+
+    def inventory(self, retry_count=2):
+        """
+        Read tags from every reader and merge into one inventory
+
+        :param retry_count: attempts before aborting after failure, per reader
+        :return: dict of EPC bytes to FleetTag
+        """
+        merged = {}
+        for name, records in self.read_tag_list(retry_count).items():
+            for record in records:
+                fleet_tag = merged.get(record.epc)
+                if fleet_tag is None:
+                    fleet_tag = merged[record.epc] = FleetTag(record.epc)
+                fleet_tag.sightings.append((name, record.antenna))
+        return merged
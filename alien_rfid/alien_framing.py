@@ -0,0 +1,67 @@
+from .alien_exceptions import ReaderTimeoutException
+
+FRAME_TERMINATOR = b'\x00'
+
+
+class FrameBuffer(object):
+    """
+    Buffered framing layer for the \\x00 terminated responses from an Alien RFID Reader.
+
+    Data is read from the connection in large chunks into a single bytearray.  Complete frames are
+    split off the front of the buffer and any leftover bytes are held for the next response, so one
+    read from the connection may satisfy several frames.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        # Position already searched for a terminator, so partial frames aren't rescanned on each chunk.
+        self._scan = 0
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def clear(self):
+        """
+        Discard any buffered data, such as a partial frame left from a dropped connection.
+        """
+        del self._buffer[:]
+        self._scan = 0
+
+    def feed(self, data):
+        """
+        Add received data to the buffer.
+
+        :param data: bytes, bytearray or memoryview of received data
+        """
+        self._buffer += data
+
+    def next_frame(self):
+        """
+        Remove and return the next complete frame, if one is buffered.
+
+        :return: frame bytes without terminator, or None if no complete frame is buffered
+        """
+        index = self._buffer.find(FRAME_TERMINATOR, self._scan)
+        if index < 0:
+            self._scan = len(self._buffer)
+            return None
+        frame = bytes(self._buffer[:index])
+        del self._buffer[:index + 1]
+        self._scan = 0
+        return frame
+
+    def read_frame(self, read_chunk):
+        """
+        Return the next frame, reading from the connection only when no complete frame is buffered.
+
+        :param read_chunk: callable returning the next chunk of received data
+        :return: frame bytes without terminator
+        """
+        frame = self.next_frame()
+        while frame is None:
+            chunk = read_chunk()
+            if not chunk:
+                raise ReaderTimeoutException('No data received from reader.')
+            self.feed(chunk)
+            frame = self.next_frame()
+        return frame
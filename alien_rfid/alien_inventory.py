@@ -0,0 +1,217 @@
+import asyncio
+import collections
+import time
+
+ARRIVAL = 'arrival'
+DEPARTURE = 'departure'
+
+
+class TagEvent(object):
+    """
+    A tag arriving in, or departing from, the field of the readers.
+
+    first_seen and last_seen are times from time.time(), count is the number of reads since arrival, and
+    antenna, rssi and reader are from the latest read.
+    """
+
+    __slots__ = ('kind', 'epc', 'first_seen', 'last_seen', 'count', 'antenna', 'rssi', 'reader')
+
+    def __init__(self, kind, epc, first_seen, last_seen, count, antenna=None, rssi=None, reader=None):
+        self.kind = kind
+        self.epc = epc
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.count = count
+        self.antenna = antenna
+        self.rssi = rssi
+        self.reader = reader
+
+    def __repr__(self):
+        return 'TagEvent({}, {}, count={})'.format(self.kind, bytes(self.epc).hex().upper(), self.count)
+
+
+class _SeenTag(object):
+    __slots__ = ('epc', 'first_seen', 'last_seen', 'count', 'antenna', 'rssi', 'reader')
+
+    def __init__(self, epc, now):
+        self.epc = epc
+        self.first_seen = now
+        self.last_seen = now
+        self.count = 0
+        self.antenna = None
+        self.rssi = None
+        self.reader = None
+
+    def event(self, kind):
+        return TagEvent(kind, self.epc, self.first_seen, self.last_seen, self.count, self.antenna, self.rssi,
+                        self.reader)
+
+
+class SeenSet(object):
+    """
+    Tags in the field, with first seen, last seen and read count of each EPC.
+
+    A tag departs when it has not been read for window seconds.  Tags are kept in order of last read, so
+    expiring departed tags only looks at the oldest, and the number held is bounded by max_tags, the tags
+    read longest ago departing early when it is exceeded.
+    """
+
+    def __init__(self, window=5.0, max_tags=10000):
+        """
+        :param window: seconds without a read before a tag departs
+        :param max_tags: most tags held
+        """
+        self.window = window
+        self.max_tags = max_tags
+        self._tags = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._tags)
+
+    def __contains__(self, epc):
+        return bytes(epc) in self._tags
+
+    def update(self, records, now=None):
+        """
+        Add reads of tags
+
+        :param records: TagRecord read
+        :param now: time of the reads, default time.time()
+        :return: list of TagEvent, ARRIVAL for new tags and DEPARTURE for any pushed out by max_tags
+        """
+        now = time.time() if now is None else now
+        events = []
+        tags = self._tags
+        for record in records:
+            epc = bytes(record.epc)
+            seen = tags.get(epc)
+            if seen is None:
+                seen = tags[epc] = _SeenTag(epc, now)
+                arrived = True
+            else:
+                tags.move_to_end(epc)
+                arrived = False
+            seen.last_seen = now
+            seen.count += record.count or 1
+            seen.antenna = record.antenna
+            seen.rssi = record.rssi
+            seen.reader = record.reader
+            if arrived:
+                events.append(seen.event(ARRIVAL))
+        while len(tags) > self.max_tags:
+            events.append(tags.popitem(last=False)[1].event(DEPARTURE))
+        return events
+
+    def expire(self, now=None):
+        """
+        Remove tags not read within window
+
+        :param now: current time, default time.time()
+        :return: list of DEPARTURE TagEvent
+        """
+        now = time.time() if now is None else now
+        events = []
+        tags = self._tags
+        while tags:
+            seen = next(iter(tags.values()))
+            if now - seen.last_seen < self.window:
+                break
+            del tags[seen.epc]
+            events.append(seen.event(DEPARTURE))
+        return events
+
+    def clear(self):
+        """
+        Remove every tag
+
+        :return: list of DEPARTURE TagEvent
+        """
+        events = [seen.event(DEPARTURE) for seen in self._tags.values()]
+        self._tags.clear()
+        return events
+
+
+def inventory_stream(source, interval=1.0, window=5.0, max_tags=10000, duration=None):
+    """
+    Continuous inventory, yielding only tags arriving and departing
+
+    source is either a connected reader, polled with read_tag_list every interval seconds, or a
+    TagStreamListener, or anything else with get(timeout), receiving tags pushed by readers in
+    TagStreamMode or AutoMode, where interval is how often departures are checked for.
+
+    for event in inventory_stream(ar, interval=0.5, window=3):
+        if event.kind == ARRIVAL:
+            ...
+
+    :param source: _AlienReader or TagStreamListener
+    :param interval: seconds between polls, or departure checks
+    :param window: seconds without a read before a tag departs
+    :param max_tags: most tags held in the seen set
+    :param duration: seconds to run for, None for until closed.  Tags still present depart at the end.
+    :return: generator of TagEvent
+    """
+    seen = SeenSet(window, max_tags)
+    poll = hasattr(source, 'read_tag_list')
+    end = None if duration is None else time.monotonic() + duration
+    next_cycle = time.monotonic()
+    while end is None or time.monotonic() < end:
+        if not getattr(source, 'running', True):
+            # Listener stopped, so nothing more will arrive.
+            break
+        if poll:
+            events = seen.update(source.read_tag_list(retry_count=0))
+        else:
+            events = seen.update(_pushed_records(source, next_cycle + interval))
+        events += seen.expire()
+        for event in events:
+            yield event
+        next_cycle += interval
+        delay = next_cycle - time.monotonic()
+        if delay < 0:
+            # Polling takes longer than interval, so carry on without trying to catch up.
+            next_cycle = time.monotonic()
+        elif poll:
+            time.sleep(delay if end is None else min(delay, max(end - time.monotonic(), 0)))
+    for event in seen.clear():
+        yield event
+
+
+def _pushed_records(listener, until):
+    # Records received until the next departure check is due.
+    records = []
+    while True:
+        record = listener.get(max(until - time.monotonic(), 0))
+        if record is None:
+            return records
+        records.append(record)
+        if time.monotonic() >= until:
+            # Tags still arriving must not hold back the departure check, the rest are taken by the next.
+            return records
+
+
+async def async_inventory_stream(reader, interval=1.0, window=5.0, max_tags=10000, duration=None):
+    """
+    inventory_stream, polling an AsyncAlienReaderNetwork
+
+    async for event in async_inventory_stream(reader):
+        ...
+
+    :return: async generator of TagEvent
+    """
+    seen = SeenSet(window, max_tags)
+    loop = asyncio.get_running_loop()
+    end = None if duration is None else loop.time() + duration
+    next_cycle = loop.time()
+    while end is None or loop.time() < end:
+        events = seen.update(await reader.read_tag_list(retry_count=0))
+        events += seen.expire()
+        for event in events:
+            yield event
+        next_cycle += interval
+        delay = next_cycle - loop.time()
+        if delay < 0:
+            next_cycle = loop.time()
+        else:
+            await asyncio.sleep(delay if end is None else min(delay, max(end - loop.time(), 0)))
+    for event in seen.clear():
+        yield event
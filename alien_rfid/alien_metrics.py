@@ -0,0 +1,246 @@
+import bisect
+import re
+import threading
+
+# Upper bounds in seconds of the histogram buckets, the last bucket takes anything slower.
+DEFAULT_BOUNDS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                  2.5, 5.0, 10.0)
+
+# Phases of a command timed by ReaderMetrics.
+SEND = 'send'
+FIRST_BYTE = 'first_byte'
+FRAMING = 'framing'
+TOTAL = 'total'
+PARSE = 'parse'
+
+# Verb of anything not in the reader command set, so free text such as a password never becomes a label.
+OTHER = 'other'
+
+# Lower case command name to name, from the reader command help, loaded on first use.
+_VERBS = {}
+
+
+def _known_verbs():
+    if not _VERBS:
+        # Imported here, as alien_tester imports alien_rfid, which imports this module.
+        from .alien_tester import TesterIO
+        _VERBS.update((name.lower(), name) for name in re.findall(r'^  (\w+):$', TesterIO.__doc__, re.M))
+    return _VERBS
+
+
+def command_verb(msg):
+    """
+    Verb of a command, used to group its metrics, such as RFLevel for 'get RFLevel' or 'RFLevel=200'
+
+    :param msg: command text
+    :return: verb as str, OTHER for anything not in the reader command set
+    """
+    command = msg.strip()
+    if command[:4].lower() in ('get ', 'set '):
+        command = command[4:]
+    verb = command.split('=', 1)[0].strip()
+    if not verb:
+        return '(empty)'
+    return _known_verbs().get(verb.lower(), OTHER)
+
+
+class Histogram(object):
+    """
+    Distribution of timings in fixed buckets, with count, sum, min and max.
+    """
+
+    def __init__(self, bounds=DEFAULT_BOUNDS):
+        self.bounds = tuple(bounds)
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def percentile(self, fraction):
+        """
+        Upper bound of the bucket holding a percentile, exact to within the bucket width
+
+        :param fraction: percentile as fraction, such as 0.99
+        :return: seconds, or None if nothing observed
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(0.5),
+            'p99': self.percentile(0.99),
+            'buckets': dict(zip([str(bound) for bound in self.bounds] + ['+Inf'], self.buckets)),
+        }
+
+
+class ReaderMetrics(object):
+    """
+    Timings and counters of the commands sent to a reader, for finding slow readers and slow commands.
+
+    Assign to a reader's metrics attribute to turn on instrumentation, it is off by default so costs
+    nothing.  Each command is timed in phases, per command verb (t, G2Read, RFLevel, ...):
+
+      send         writing the command
+      first_byte   from sent to the first byte of the response
+      framing      from the first byte to the complete response
+      total        whole round trip, including any recovery
+      parse        parsing a TagList into tags
+
+    Counters hold recovery actions (retry, resync, reconnect), errors, '(No Tags)' retries of TagList
+    reads and failed G2Read retries.  Hooks are called with (name, verb, value) for every timing and
+    count as it happens, to forward to another metrics system, and as_dict and prometheus export the
+    totals.
+
+    ar.metrics = ReaderMetrics(labels={'reader': '10.0.0.1'})
+    ar.metrics.add_hook(lambda name, verb, value: statsd.timing('rfid.' + verb + '.' + name, value))
+    """
+
+    def __init__(self, bounds=DEFAULT_BOUNDS, labels=None):
+        """
+        :param bounds: upper bounds in seconds of histogram buckets
+        :param labels: labels added to every exported metric, such as the reader
+        """
+        self.bounds = bounds
+        self.labels = dict(labels or {})
+        self.histograms = {}
+        self.counters = {}
+        self.hooks = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        """
+        Call hook with (name, verb, value) for every timing in seconds and every count.
+
+        :param hook: callable
+        :return: None
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def observe(self, name, verb, seconds):
+        """
+        Record a timing
+
+        :param name: phase, such as TOTAL
+        :param verb: command verb
+        :param seconds: time taken
+        :return: None
+        """
+        with self._lock:
+            histogram = self.histograms.get((verb, name))
+            if histogram is None:
+                histogram = self.histograms[verb, name] = Histogram(self.bounds)
+            histogram.observe(seconds)
+        for hook in self.hooks:
+            hook(name, verb, seconds)
+
+    def count(self, name, verb=None, value=1):
+        """
+        Add to a counter
+
+        :param name: counter, such as 'reconnect'
+        :param verb: command verb it applies to, if any
+        :param value: amount to add
+        :return: None
+        """
+        with self._lock:
+            self.counters[name, verb] = self.counters.get((name, verb), 0) + value
+        for hook in self.hooks:
+            hook(name, verb, value)
+
+    def histogram(self, verb, name=TOTAL):
+        """
+        Histogram of a phase of a command verb
+
+        :return: Histogram, or None if not observed
+        """
+        return self.histograms.get((verb, name))
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def as_dict(self):
+        """
+        Every histogram and counter, for JSON export
+
+        :return: dict of 'histograms' by verb then phase, and 'counters' by name then verb
+        """
+        with self._lock:
+            histograms = {}
+            for (verb, name), histogram in sorted(self.histograms.items()):
+                histograms.setdefault(verb, {})[name] = histogram.as_dict()
+            counters = {}
+            for (name, verb), value in sorted(self.counters.items(), key=lambda item: (item[0][0], item[0][1] or '')):
+                counters.setdefault(name, {})[verb or ''] = value
+        return {'labels': dict(self.labels), 'histograms': histograms, 'counters': counters}
+
+    def prometheus(self, prefix='alien_rfid'):
+        """
+        Every histogram and counter in the Prometheus text exposition format
+
+        :param prefix: prefix of metric names
+        :return: str
+        """
+        lines = []
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items(), key=lambda item: (item[0][0], item[0][1] or ''))
+        phases = sorted(set(name for (verb, name), histogram in histograms))
+        for phase in phases:
+            metric = '{}_command_{}_seconds'.format(prefix, phase)
+            lines.append('# TYPE {} histogram'.format(metric))
+            for (verb, name), histogram in histograms:
+                if name != phase:
+                    continue
+                labels = dict(self.labels, verb=verb)
+                cumulative = 0
+                for bound, count in zip([str(bound) for bound in histogram.bounds] + ['+Inf'], histogram.buckets):
+                    cumulative += count
+                    lines.append('{}_bucket{} {}'.format(metric, _labels(dict(labels, le=bound)), cumulative))
+                lines.append('{}_sum{} {}'.format(metric, _labels(labels), histogram.sum))
+                lines.append('{}_count{} {}'.format(metric, _labels(labels), histogram.count))
+        for name in sorted(set(name for (name, verb), value in counters)):
+            metric = '{}_{}_total'.format(prefix, name)
+            lines.append('# TYPE {} counter'.format(metric))
+            for (counter, verb), value in counters:
+                if counter == name:
+                    labels = dict(self.labels, verb=verb) if verb else self.labels
+                    lines.append('{}{} {}'.format(metric, _labels(labels), value))
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join('{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                          for name, value in sorted(labels.items())) + '}'
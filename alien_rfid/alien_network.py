@@ -1,4 +1,4 @@
-from .alien_rfid import _AlienReader
+from .alien_rfid import _AlienReader, NotConnectedException, AuthenticationException
 import socket
 import time
 
@@ -14,14 +14,20 @@ class AlienReaderNetwork(_AlienReader):
         ...
     """
 
+    RECV_SIZE = 4096
+    # The reader buffers commands received over TCP and answers them in order.
+    PIPELINE_DEPTH = 32
+
     def __init__(self, ipaddress='localhost', port=23, username='alien', password='password',
                  rf_level=200, timeout=2):
-        super().__init__(rf_level)
+        super().__init__(rf_level, timeout)
         self.ipaddress = ipaddress
         self.username = username
         self.password = password
         self.port = port
         self.sock = None
+        self._recv_buffer = bytearray(self.RECV_SIZE)
+        self._recv_view = memoryview(self._recv_buffer)
 
     def __del__(self):
         super().__del__()
@@ -29,17 +35,21 @@ class AlienReaderNetwork(_AlienReader):
             self.sock = None
 
     def _login(self):
+        # Credentials are not commands, so are left out of metrics.
+        metrics, self.metrics = self.metrics, None
         try:
-            result = self.send_receive(self.username)
+            self.send_receive(self.username)
             result = self.send_receive(self.password)
-
+        finally:
+            self.metrics = metrics
+        try:
             if 'Error:' in result:
                 errmsg = result.split('Error:')[1]
                 self.close(False)
                 self._connected = False
-                raise Exception("Trouble logging in: " + errmsg)
+                raise AuthenticationException("Trouble logging in: " + errmsg)
 
-            result = self.send_receive('RFLevel={}'.format(self.rf_level))
+            self.set_setting('RFLevel', self.rf_level)
 
         except Exception as e:
             raise e
@@ -61,14 +71,24 @@ class AlienReaderNetwork(_AlienReader):
     def _byte_read(self):
         return self.sock.recv(1)
 
+    def _chunk_read(self):
+        count = self.sock.recv_into(self._recv_view)
+        if not count:
+            self._connected = False
+            raise NotConnectedException('Connection closed by reader {}.'.format(self.ipaddress))
+        return self._recv_view[:count]
+
     def _send(self, msg_bytes):
         self.sock.send(msg_bytes)
 
     def close(self, send_quit=True):
         if self.sock:
-            try:
-                self.sock.send(b"quit\r\n")
-                time.sleep(0.1)
-            except:
-                pass
+            if send_quit:
+                try:
+                    self.sock.send(b"quit\r\n")
+                    time.sleep(0.1)
+                except:
+                    pass
             self.sock.close()
+            self.sock = None
+        self._connected = False
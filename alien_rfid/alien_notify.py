@@ -0,0 +1,293 @@
+import queue
+import socketserver
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
+from .alien_framing import FrameBuffer
+from .alien_stream import _ThreadingTCPServer
+from .alien_taglist import TEXT_TAG_LIST, TagRecord
+
+
+class Notification(object):
+    """
+    A notification message sent by an Alien RFID reader in NotifyMode.
+
+    header holds every header field of the message, by name, with the common ones also available as
+    attributes.  tags is a list of TagRecord, with reader set to the IP address reporting them.
+    """
+
+    def __init__(self, header, tags):
+        self.header = header
+        self.tags = tags
+
+    @property
+    def reader_name(self):
+        return self.header.get('ReaderName')
+
+    @property
+    def ip_address(self):
+        return self.header.get('IPAddress')
+
+    @property
+    def time(self):
+        return self.header.get('Time')
+
+    @property
+    def reason(self):
+        return self.header.get('Reason')
+
+    def __repr__(self):
+        return 'Notification({!r}, {} tags)'.format(self.reason, len(self.tags))
+
+
+# XML element name to TagRecord attribute and conversion.
+_XML_FIELDS = {
+    'DiscoveryTime': ('disc', str),
+    'LastSeenTime': ('last', str),
+    'ReadCount': ('count', int),
+    'Antenna': ('antenna', int),
+    'Protocol': ('protocol', int),
+    'RSSI': ('rssi', float),
+}
+
+
+def _parse_xml_notification(payload):
+    root = ElementTree.fromstring(payload)
+    header = {}
+    tags = []
+    for element in root:
+        if element.tag == 'Alien-RFID-Tag-List':
+            for tag_element in element:
+                record = TagRecord(bytes.fromhex(tag_element.findtext('TagID', '')))
+                for field in tag_element:
+                    converter = _XML_FIELDS.get(field.tag)
+                    if converter is not None and field.text:
+                        setattr(record, converter[0], converter[1](field.text.strip()))
+                tags.append(record)
+        else:
+            header[element.tag] = (element.text or '').strip()
+    return header, tags
+
+
+def _parse_text_notification(payload, parser):
+    header = {}
+    tags = []
+    for line in payload.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line[0] == '#':
+            name, separator, value = line[1:].partition(':')
+            if separator:
+                header[name.strip()] = value.strip()
+            continue
+        record = parser.parse_line(line)
+        if record is not None:
+            tags.append(record)
+    return header, tags
+
+
+def parse_notification(payload, parser=TEXT_TAG_LIST):
+    """
+    Parse a notification message, in Text, XML or Custom NotifyFormat
+
+    :param payload: str message, without \\x00 terminator
+    :param parser: parser for tag lines, a CustomTagListParser for a Custom NotifyFormat
+    :return: Notification
+    """
+    payload = payload.strip()
+    if payload.startswith('<'):
+        header, tags = _parse_xml_notification(payload)
+    else:
+        header, tags = _parse_text_notification(payload, parser)
+    reader = header.get('IPAddress')
+    for record in tags:
+        record.reader = reader
+    return Notification(header, tags)
+
+
+class _NotifyTCPHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        receiver = self.server.receiver
+        frames = FrameBuffer()
+        while True:
+            data = self.request.recv(receiver.RECV_SIZE)
+            if not data:
+                break
+            frames.feed(data)
+            frame = frames.next_frame()
+            while frame is not None:
+                receiver._receive_payload(frame, self.client_address[0])
+                frame = frames.next_frame()
+        # Message not terminated with \x00, but closing the connection ends it.
+        if len(frames):
+            frames.feed(b'\x00')
+            receiver._receive_payload(frames.next_frame(), self.client_address[0])
+
+
+class NotifyReceiver(object):
+    """
+    Server receiving notification messages sent by Alien RFID readers in NotifyMode.
+
+    Connections from any number of readers are accepted concurrently.  Received messages are queued and
+    parsed in batches on a single dispatch thread, which hands each batch, a list of Notification, to sink.
+    A sink raising an exception loses only that batch, counted in sink_errors.
+
+    received = []
+    with NotifyReceiver(received.extend, port=4000) as receiver:
+        receiver.configure(ar, '10.0.0.50')
+        ...
+    """
+
+    RECV_SIZE = 65536
+
+    def __init__(self, sink, host='0.0.0.0', port=4000, batch_size=100, batch_interval=0.5,
+                 parser=TEXT_TAG_LIST):
+        """
+        :param sink: callable receiving each list of Notification
+        :param host: address to listen on
+        :param port: port to listen on, 0 to have one assigned
+        :param batch_size: maximum messages handed to sink at once
+        :param batch_interval: maximum seconds a received message waits for others to batch with
+        :param parser: parser for tag lines, a CustomTagListParser for a Custom NotifyFormat
+        """
+        self.sink = sink
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.parser = parser
+        self.parse_errors = 0
+        # Batches whose sink call raised, and the last exception raised, dispatch carries on after them.
+        self.sink_errors = 0
+        self.last_sink_error = None
+        self._payloads = queue.Queue()
+        self._server = None
+        self._threads = []
+
+    @property
+    def running(self):
+        return self._server is not None
+
+    @property
+    def address(self):
+        """
+        (host, port) being listened on, port is the one assigned if 0 was requested.
+        """
+        if self._server is None:
+            return self.host, self.port
+        return self._server.server_address[:2]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        """
+        Start receiving notifications on background threads.
+
+        :return: None
+        """
+        if self._server is not None:
+            return
+        self._server = _ThreadingTCPServer((self.host, self.port), _NotifyTCPHandler)
+        self._server.receiver = self
+        self._threads = [threading.Thread(target=self._server.serve_forever, daemon=True),
+                         threading.Thread(target=self._dispatch, daemon=True)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """
+        Stop receiving notifications.  Messages already received are handed to sink before returning.
+
+        :return: None
+        """
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._payloads.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._server = None
+        self._threads = []
+
+    def _receive_payload(self, payload, reader):
+        self._payloads.put((payload, reader))
+
+    def _next_batch(self):
+        first = self._payloads.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.batch_interval
+        while len(batch) < self.batch_size:
+            try:
+                item = self._payloads.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is None:
+                # Keep the stop marker, so dispatch ends after this batch.
+                self._payloads.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _dispatch(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            notifications = []
+            for payload, reader in batch:
+                try:
+                    notification = parse_notification(payload.decode('UTF-8', 'replace'), self.parser)
+                except Exception:
+                    self.parse_errors += 1
+                    continue
+                if notification.ip_address is None:
+                    for record in notification.tags:
+                        record.reader = reader
+                notifications.append(notification)
+            if notifications:
+                try:
+                    self.sink(notifications)
+                except Exception as e:
+                    self.sink_errors += 1
+                    self.last_sink_error = e
+
+    def configure(self, reader, address, notify_format='Text', trigger='Add', queue_limit=None):
+        """
+        Set reader to send notifications to this receiver
+
+        :param reader: connected _AlienReader
+        :param address: host name or ip address of this receiver, as reachable from the reader
+        :param notify_format: NotifyFormat to use, Text, XML or Custom
+        :param trigger: NotifyTrigger to use
+        :param queue_limit: NotifyQueueLimit, failed notifications the reader holds for later delivery
+        :return: None
+        """
+        commands = ['NotifyFormat={}'.format(notify_format),
+                    'NotifyTrigger={}'.format(trigger),
+                    'NotifyAddress={}:{}'.format(address, self.address[1])]
+        if queue_limit is not None:
+            commands.append('NotifyQueueLimit={}'.format(queue_limit))
+        commands.append('NotifyMode=On')
+        for command in commands:
+            result = reader.send_receive(command)
+            if 'Error' in result:
+                raise Exception('Could not configure NotifyMode: {}'.format(result))
+
+    @staticmethod
+    def unconfigure(reader):
+        """
+        Stop reader from sending notifications.
+
+        :param reader: connected _AlienReader
+        :return: None
+        """
+        reader.send_receive('NotifyMode=Off')
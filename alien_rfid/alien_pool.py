@@ -0,0 +1,152 @@
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from .alien_network import AlienReaderNetwork
+
+
+class _PooledReader(object):
+    def __init__(self, reader):
+        self.reader = reader
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
+
+class ReaderPool(object):
+    """
+    Keeps one authenticated AlienReaderNetwork session per reader, shared by every caller in the process.
+
+    A reader only accepts one client, so callers take turns on the pooled session under a lock instead of
+    each connecting, logging in and quitting.  Idle sessions are kept alive with keepalive_command, so the
+    reader's NetworkTimeout does not drop them.
+
+    with get_pool().session('10.0.0.1') as ar:
+        tags = ar.read_tags()
+        ...
+    """
+
+    def __init__(self, keepalive_interval=30, keepalive_command='get ReaderName', reader_class=AlienReaderNetwork):
+        """
+        :param keepalive_interval: seconds a session may be idle before keepalive_command is sent, None for never
+        :param keepalive_command: command sent to idle sessions
+        :param reader_class: class of reader created for new sessions
+        """
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_command = keepalive_command
+        self.reader_class = reader_class
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._keepalive_thread = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _entry(self, ipaddress, port, username, password, rf_level, timeout):
+        with self._lock:
+            entry = self._entries.get((ipaddress, port))
+            if entry is None:
+                reader = self.reader_class(ipaddress, port, username, password, rf_level, timeout)
+                entry = self._entries[(ipaddress, port)] = _PooledReader(reader)
+                self._start_keepalive()
+            elif (entry.reader.username, entry.reader.password) != (username, password):
+                raise ValueError('Pooled session to {}:{} uses different credentials.'.format(ipaddress, port))
+            return entry
+
+    @contextmanager
+    def session(self, ipaddress='localhost', port=23, username='alien', password='password', rf_level=200,
+                timeout=2):
+        """
+        Exclusive use of the pooled session to a reader, connecting it if needed.
+
+        :return: context manager giving a connected AlienReaderNetwork
+        """
+        entry = self._entry(ipaddress, port, username, password, rf_level, timeout)
+        with entry.lock:
+            reader = entry.reader
+            reader.rf_level = rf_level
+            if not reader.connected:
+                reader.open()
+            else:
+                # Only sent if different from the RFLevel already set.
+                reader.set_setting('RFLevel', rf_level)
+            try:
+                yield reader
+            finally:
+                entry.last_used = time.monotonic()
+
+    def _start_keepalive(self):
+        if self.keepalive_interval and self._keepalive_thread is None:
+            self._stop.clear()
+            self._keepalive_thread = threading.Thread(target=self._keepalive, daemon=True)
+            self._keepalive_thread.start()
+
+    def _keepalive(self):
+        while not self._stop.wait(self.keepalive_interval / 2.0):
+            self.keepalive()
+
+    def keepalive(self):
+        """
+        Send keepalive_command to connected sessions idle for keepalive_interval, skipping sessions in use.
+        Sessions that fail are closed, to be reconnected on next use.
+
+        :return: None
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+        for entry in entries:
+            if time.monotonic() - entry.last_used < (self.keepalive_interval or 0):
+                continue
+            if not entry.lock.acquire(blocking=False):
+                continue
+            try:
+                if entry.reader.connected:
+                    entry.reader.send_receive(self.keepalive_command)
+                    entry.last_used = time.monotonic()
+            except Exception:
+                self._close_reader(entry.reader)
+            finally:
+                entry.lock.release()
+
+    @staticmethod
+    def _close_reader(reader):
+        try:
+            reader.close()
+        except Exception:
+            pass
+
+    def close(self):
+        """
+        Close every pooled session and stop keepalive.
+
+        :return: None
+        """
+        self._stop.set()
+        if self._keepalive_thread is not None:
+            self._keepalive_thread.join()
+            self._keepalive_thread = None
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            with entry.lock:
+                if entry.reader.connected:
+                    self._close_reader(entry.reader)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    The process wide ReaderPool, closed at exit.
+
+    :return: ReaderPool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ReaderPool()
+            atexit.register(_pool.close)
+        return _pool
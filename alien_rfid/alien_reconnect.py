@@ -0,0 +1,98 @@
+import random
+import socket
+from .alien_exceptions import NotConnectedException, ReaderTimeoutException, AuthenticationException
+
+# Kinds of error, as classified by ReconnectPolicy.
+TIMEOUT = 'timeout'
+CONNECTION = 'connection'
+AUTH = 'auth'
+PROTOCOL = 'protocol'
+
+# Actions taken by a reader after an error.
+RAISE = 'raise'
+RETRY = 'retry'
+RESYNC = 'resync'
+RECONNECT = 'reconnect'
+
+
+class ReconnectPolicy(object):
+    """
+    Decides how a reader recovers from an error talking to the reader, and counts what happened.
+
+    Errors are classified as timeout, connection, auth or protocol.  Authentication errors are raised
+    straight away.  A timeout first drains the late response from the stream (resync) and a protocol
+    error just discards any partial response (retry), both keep the connection.  Connection errors,
+    errors that keep happening, and errors with several pipelined responses still due, close and open
+    the connection again.  Each attempt after the first waits
+    for an exponential backoff with random jitter, so many readers do not reconnect in lock step.
+
+    counters holds the number of errors of each kind, and of each recovery action taken.
+    """
+
+    def __init__(self, max_attempts=3, base_delay=0.1, max_delay=5.0, jitter=0.5):
+        """
+        :param max_attempts: recoveries attempted for one operation before raising
+        :param base_delay: seconds of backoff before the second attempt, doubling for each one after
+        :param max_delay: longest backoff in seconds
+        :param jitter: fraction of backoff randomly added or removed
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.counters = dict.fromkeys((TIMEOUT, CONNECTION, AUTH, PROTOCOL, RETRY, RESYNC, RECONNECT), 0)
+
+    @staticmethod
+    def classify(error):
+        """
+        Kind of error
+
+        :param error: exception raised talking to reader
+        :return: TIMEOUT, CONNECTION, AUTH or PROTOCOL
+        """
+        if isinstance(error, AuthenticationException):
+            return AUTH
+        if isinstance(error, (ReaderTimeoutException, socket.timeout)):
+            return TIMEOUT
+        if isinstance(error, (NotConnectedException, OSError, EOFError)):
+            return CONNECTION
+        return PROTOCOL
+
+    def action(self, error, attempt, in_flight=1):
+        """
+        Action to take for an error, counting both
+
+        Draining or discarding one response only puts the stream back in step when at most one response
+        was due, so with more in flight, as in a pipelined send_many, the connection is opened again.
+
+        :param error: exception raised talking to reader
+        :param attempt: number of recoveries already attempted for this operation
+        :param in_flight: responses still due from the reader when the error happened
+        :return: RAISE, RETRY, RESYNC or RECONNECT
+        """
+        kind = self.classify(error)
+        self.counters[kind] += 1
+        if kind == AUTH or attempt >= self.max_attempts:
+            return RAISE
+        if in_flight > 1:
+            action = RECONNECT
+        elif attempt == 0 and kind == TIMEOUT:
+            action = RESYNC
+        elif attempt == 0 and kind == PROTOCOL:
+            action = RETRY
+        else:
+            action = RECONNECT
+        self.counters[action] += 1
+        return action
+
+    def delay(self, attempt):
+        """
+        Seconds to wait before a recovery
+
+        :param attempt: number of recoveries already attempted for this operation
+        :return: seconds
+        """
+        if attempt == 0:
+            return 0
+        delay = min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
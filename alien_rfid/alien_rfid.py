@@ -1,8 +1,130 @@
-from binascii import hexlify
+import time
+from .alien_exceptions import NotConnectedException, ReaderTimeoutException, AuthenticationException  # noqa: F401
+from .alien_antenna import read_tags_by_antenna
+from .alien_framing import FrameBuffer
+from .alien_inventory import inventory_stream
+from .alien_metrics import FIRST_BYTE, FRAMING, PARSE, SEND, TOTAL, command_verb
+from .alien_reconnect import ReconnectPolicy, RAISE, RESYNC, RETRY, TIMEOUT
+from .alien_taglist import COMPACT_TAG_LIST_FORMATS, TEXT_TAG_LIST, tag_list_parser
 
+# RFLevel a reader may be given, shared by every check of it.
+RF_LEVEL_RANGE = (170, 290)
 
-class NotConnectedException(Exception):
-    pass
+
+# Command building and response parsing is kept out of _AlienReader, so it can be shared with
+# readers that do not use the blocking send_receive, such as AsyncAlienReaderNetwork.
+
+def g2_read_command(bank_number, start_word, word_count):
+    """
+    Build and validate G2Read command
+
+    :param bank_number: 0-3
+    :param start_word: position of first word to read (0-2097151)
+    :param word_count: number of words to read (0-32)
+    :return: command as str
+    """
+    if not 0 <= bank_number <= 3:
+        raise ValueError('Valid bank_number is 0-3.')
+    if not 0 <= word_count <= 32:
+        raise ValueError('Valid word_count is 0-32 (unless less supported by bank.)')
+    return 'G2Read={},{},{}'.format(bank_number, start_word, word_count)
+
+
+def parse_g2_read(values):
+    """
+    Parse response to G2Read command
+
+    :param values: response text
+    :return: bytearray of data read, or None if response did not contain data
+    """
+    if 'Read error.' in values:
+        raise Exception(values)
+    if 'G2Read' in values:
+        values = values.strip().replace(' ', '')
+        values = values.rsplit('G2Read=')[-1]
+        return bytearray.fromhex(values)
+    return None
+
+
+def g2_write_command(bank_number, start_word, byte_data):
+    """
+    Build G2Write command
+
+    :param bank_number: 0-3
+    :param start_word: position of first word to write (0-2097151)
+    :param byte_data: even number of bytes
+    :return: command as str
+    """
+    assert len(byte_data) % 2 == 0, 'byte_data must be an even number of bytes, due to word boundaries of data.'
+    # Convert to uppercase and space delimited hex string expected
+    return 'G2Write={},{},{}'.format(bank_number, start_word, bytes(byte_data).hex(' ').upper())
+
+
+def parse_get(response, name):
+    """
+    Parse response to a get command, such as 'RFLevel = 200'
+
+    :param response: response text
+    :param name: name of setting
+    :return: value as str
+    """
+    if 'Error' in response or '=' not in response:
+        raise Exception('Could not get {}: {}'.format(name, response))
+    return response.split('=', 1)[1].strip()
+
+
+def _changed_runs(current, target, merge_gap):
+    # (start, end) word ranges where target differs from current, joining runs separated by up to merge_gap words.
+    runs = []
+    for word in range(len(target) // 2):
+        if current[word * 2:word * 2 + 2] != target[word * 2:word * 2 + 2]:
+            if runs and word - runs[-1][1] <= merge_gap:
+                runs[-1][1] = word + 1
+            else:
+                runs.append([word, word + 1])
+    return runs
+
+
+def _write_chunks(runs, start_word, word_count, chunk_words, block_words, block_align):
+    # Split runs into (offset, count) chunks of up to chunk_words, on block boundaries where required.
+    chunks = []
+    if block_words:
+        chunk_words = max(chunk_words // block_words, 1) * block_words
+    if block_words and block_align:
+        widened = []
+        for run_start, run_end in runs:
+            # Widen run to whole blocks, relative to the start of the bank, within the range written.
+            run_start = max((start_word + run_start) // block_words * block_words - start_word, 0)
+            run_end = min(-(-(start_word + run_end) // block_words) * block_words - start_word, word_count)
+            if widened and run_start <= widened[-1][1]:
+                # Runs widened into the same block are written once.
+                widened[-1][1] = max(widened[-1][1], run_end)
+            else:
+                widened.append([run_start, run_end])
+        runs = widened
+    for run_start, run_end in runs:
+        offset = run_start
+        while offset < run_end:
+            count = min(chunk_words, run_end - offset)
+            if block_words and block_align:
+                # End chunk on a block boundary, so the next one starts on one.
+                boundary = (start_word + offset + count) // block_words * block_words - start_word
+                if offset < boundary < offset + count:
+                    count = boundary - offset
+            chunks.append((offset, count))
+            offset += count
+    return chunks
+
+
+def check_g2_write(result):
+    """
+    Raise if response to G2Write command was not successful
+
+    :param result: response text
+    :return: None
+    """
+    if 'Success!' not in result:
+        raise Exception("'Success!' not received: {}".format(result))
 
 
 class _AlienReader(object):
@@ -15,12 +137,26 @@ class _AlienReader(object):
     Try to implement all methods that can be in here, so there isn't duplication.  Only break out when required.
     """
 
+    # Commands sent ahead of their responses when pipelining.  1 waits for each response before the next send.
+    PIPELINE_DEPTH = 1
+
     def __init__(self, rf_level=200, timeout=2):
         self.timeout = timeout
-        if not 170 <= rf_level <= 290:
-            raise ValueError('rf_level must be between 170 and 290.')
+        if not RF_LEVEL_RANGE[0] <= rf_level <= RF_LEVEL_RANGE[1]:
+            raise ValueError('rf_level must be between {} and {}.'.format(*RF_LEVEL_RANGE))
         self.rf_level = rf_level
         self._connected = False
+        self._frames = FrameBuffer()
+        self.tag_list_parser = TEXT_TAG_LIST
+        self.reconnect_policy = ReconnectPolicy()
+        self._recovering = False
+        # Responses due for pipelined commands already sent.
+        self._in_flight = 0
+        # ReaderMetrics timing commands, None when not instrumented.
+        self.metrics = None
+        self._first_byte_time = None
+        # Known reader settings, lower case name to (name, value as str), kept across reconnects.
+        self._settings = {}
 
     @property
     def connected(self):
@@ -41,44 +177,104 @@ class _AlienReader(object):
     def _connect(self):
         raise NotImplementedError()
 
-    def receive(self):
+    def _reopen_on_failure(self, operation, *args):
         """
-        Receive Data from RFID Reader
-
-        :return: raw text data from reader (hex if memory read)
+        Run operation, recovering from errors as decided by reconnect_policy, and running it again.
         """
-        reopened = False
-        data = None
+        if self._recovering:
+            # Already recovering from an error, such as reconnecting, so let the recovery handle failures.
+            return operation(*args)
+        attempt = 0
         while True:
             try:
-                data = self._receive()
-                if 'Connection Timeout' in data:
-                    raise Exception('Need to reconnect.')
-                break
+                return operation(*args)
             except Exception as e:
-                if reopened:
-                    raise e
-                self.close()
+                error = e
+            while True:
+                action = self.reconnect_policy.action(error, attempt, self._in_flight)
+                self._in_flight = 0
+                if self.metrics is not None:
+                    self.metrics.count(self.reconnect_policy.classify(error) + '_error')
+                    if action != RAISE:
+                        self.metrics.count(action)
+                if action == RAISE:
+                    raise error
+                time.sleep(self.reconnect_policy.delay(attempt))
+                attempt += 1
+                try:
+                    self._recover(action)
+                    break
+                except Exception as e:
+                    error = e
+
+    def _recover(self, action):
+        self._recovering = True
+        try:
+            if action == RETRY:
+                self._frames.clear()
+            elif action == RESYNC:
+                self._resync()
+            else:
+                self.close(False)
                 self.open()
-                reopened = True
-        return data
+        finally:
+            self._recovering = False
+
+    def _resync(self):
+        """
+        Drain the stream up to the next frame terminator, dropping a late or partial response, so the
+        next receive gets the response to the next command.
+        """
+        try:
+            self._frames.read_frame(self._chunk_read)
+        except ReaderTimeoutException:
+            pass
+        except OSError as e:
+            if self.reconnect_policy.classify(e) != TIMEOUT:
+                raise
+        self._frames.clear()
+
+    def receive(self):
+        """
+        Receive Data from RFID Reader
+
+        :return: raw text data from reader (hex if memory read)
+        """
+        return self._reopen_on_failure(self._receive_bytes).decode('UTF-8')
 
     def _byte_read(self):
         raise NotImplementedError()
 
-    def _receive(self):
-        s = []
-        cur_char = self._byte_read()
-        while cur_char != b'\x00':
-            s.append(cur_char)
-            cur_char = self._byte_read()
-        packet = b''.join(s)
+    def _chunk_read(self):
+        """
+        Connection Specific read of all data currently available, blocking until at least one byte.
+
+        Falls back to a single byte read for interfaces that only implement _byte_read.
+        """
+        return self._byte_read()
+
+    def _timed_chunk_read(self):
+        chunk = self._chunk_read()
+        if self._first_byte_time is None:
+            self._first_byte_time = time.perf_counter()
+        return chunk
+
+    def _receive_bytes(self):
+        if self.metrics is None:
+            packet = self._frames.read_frame(self._chunk_read)
+        else:
+            packet = self._frames.read_frame(self._timed_chunk_read)
         packet = packet.strip()
 
         if b'Goodbye!' in packet:
             # Response to Quit, so socket will be automatically closed
             self.close(False)
-        return packet.decode('UTF-8')
+        if b'Connection Timeout' in packet:
+            raise NotConnectedException('Need to reconnect.')
+        return packet
+
+    def _receive(self):
+        return self._receive_bytes().decode('UTF-8')
 
     def _send(self, msg_bytes):
         """
@@ -92,6 +288,7 @@ class _AlienReader(object):
         :param msg: message to send
         :return: Exception, as this isn't defined.
         """
+        self._forget_sent_setting(msg)
         self._send(bytes("{0}\r\n".format(msg), 'UTF-8'))
 
     def send_receive(self, msg=""):
@@ -100,29 +297,98 @@ class _AlienReader(object):
         :param msg: Message to send
         :return: raw text data from reader (hex if memory read)
         """
-        reopened = False
-        data = None
-        while True:
-            try:
-                data = self._send_receive(msg)
-                if 'Connection Timeout' in data:
-                    raise Exception('Need to reconnect.')
-                break
-            except Exception as e:
-                if reopened:
-                    raise e
-                self.close()
-                self.open()
-                reopened = True
-        return data
+        return self.send_receive_bytes(msg).decode('UTF-8')
 
-    def _send_receive(self, msg=""):
+    def send_receive_bytes(self, msg=""):
+        """
+        Perform a send immediately followed by a receive and return received data undecoded
+        :param msg: Message to send
+        :return: raw bytes from reader
+        """
+        if self.metrics is None:
+            return self._reopen_on_failure(self._send_receive_bytes, msg)
+        start = time.perf_counter()
+        try:
+            return self._reopen_on_failure(self._send_receive_bytes, msg)
+        finally:
+            self.metrics.observe(TOTAL, command_verb(msg), time.perf_counter() - start)
+
+    def _send_receive_bytes(self, msg=""):
+        if self.metrics is not None:
+            return self._timed_send_receive_bytes(msg)
         self.send(msg)
-        # Calling internal _receive to bypass error handling in receive
+        # Calling internal _receive_bytes to bypass error handling in receive
         # This same error handling is in send_receive and we need to
         # resend if error required relogin, as send is needed to be
         # resent.
-        return self._receive()
+        return self._receive_bytes()
+
+    def _timed_send_receive_bytes(self, msg):
+        verb = command_verb(msg)
+        start = time.perf_counter()
+        self.send(msg)
+        sent = time.perf_counter()
+        self._first_byte_time = None
+        packet = self._receive_bytes()
+        done = time.perf_counter()
+        # No read when the response was already buffered, so it arrived before it was waited for.
+        first_byte = self._first_byte_time or sent
+        self.metrics.observe(SEND, verb, sent - start)
+        self.metrics.observe(FIRST_BYTE, verb, first_byte - sent)
+        self.metrics.observe(FRAMING, verb, done - first_byte)
+        return packet
+
+    def _send_receive(self, msg=""):
+        return self._send_receive_bytes(msg).decode('UTF-8')
+
+    def _send_receive_many_bytes(self, msgs, depth):
+        # Keep up to depth commands in flight, the reader answers them in order.
+        encoded = [bytes("{0}\r\n".format(msg), 'UTF-8') for msg in msgs]
+        if encoded:
+            self._in_flight = min(depth, len(encoded))
+            self._send(b''.join(encoded[:depth]))
+        responses = []
+        for index in range(len(encoded)):
+            responses.append(self._receive_bytes())
+            self._in_flight -= 1
+            if index + depth < len(encoded):
+                self._in_flight += 1
+                self._send(encoded[index + depth])
+        return responses
+
+    def send_many_bytes(self, msgs, depth=None):
+        """
+        Pipelined send_receive_bytes of several messages
+        :param msgs: Messages to send
+        :param depth: Messages sent ahead of their responses, default PIPELINE_DEPTH
+        :return: list of raw bytes from reader, in order of msgs
+        """
+        depth = max(depth or self.PIPELINE_DEPTH, 1)
+        msgs = list(msgs)
+        for msg in msgs:
+            self._forget_sent_setting(msg)
+        if self.metrics is None:
+            return self._reopen_on_failure(self._send_receive_many_bytes, msgs, depth)
+        start = time.perf_counter()
+        try:
+            return self._reopen_on_failure(self._send_receive_many_bytes, msgs, depth)
+        finally:
+            self.metrics.observe(TOTAL, 'send_many', time.perf_counter() - start)
+            self.metrics.count('commands', 'send_many', len(msgs))
+
+    def send_many(self, msgs, depth=None):
+        """
+        Perform several sends without waiting for each response, and return the received data in order
+
+        The first depth messages go out in one write, then the next one as each response arrives, so a batch
+        costs about one round trip instead of one per message.  After a reconnect the whole batch is sent
+        again, so only use for messages that are safe to repeat, such as gets and sets, or G2Writes to
+        separate words, as write_bank sends.
+        :param msgs: Messages to send
+        :param depth: Messages sent ahead of their responses, default PIPELINE_DEPTH
+        :return: list of raw text data from reader, in order of msgs
+        """
+        return [response.decode('UTF-8') for response in self.send_many_bytes(msgs, depth)]
 
     def _login(self):
         """
@@ -136,9 +402,13 @@ class _AlienReader(object):
 
         :return: None
         """
+        # Anything left from a previous connection is not a response to this one.
+        self._frames.clear()
+        # Nor are settings known from it, as the reader may have been restarted or changed since.
+        self._settings.clear()
         if self._connect():
             self._login()
-            _ = self.send_receive('RFLevel={}'.format(self.rf_level))
+            self.set_setting('RFLevel', self.rf_level)
 
     def close(self, send_quit=True):
         """
@@ -149,6 +419,65 @@ class _AlienReader(object):
         """
         raise NotImplementedError()
 
+    def set_tag_list_format(self, tag_list_format='Text', custom_format=None):
+        """
+        Set the TagListFormat used by the reader, and parsed by read_tags and read_tag_list
+
+        :param tag_list_format: Text or Custom
+        :param custom_format: TagListCustomFormat, such as '%k,%a,%r', when tag_list_format is Custom
+        :return: None
+        """
+        parser = tag_list_parser(tag_list_format, custom_format)
+        if custom_format:
+            result = self.send_receive('TagListCustomFormat={}'.format(custom_format))
+            if 'Error' in result:
+                raise Exception('Could not set TagListCustomFormat: {}'.format(result))
+        result = self.send_receive('TagListFormat={}'.format(parser.tag_list_format))
+        if 'Error' in result:
+            raise Exception('Could not set TagListFormat: {}'.format(result))
+        self.tag_list_parser = parser
+
+    def use_compact_tag_list(self, custom_formats=COMPACT_TAG_LIST_FORMATS):
+        """
+        Set the first label free Custom TagListFormat the reader accepts, to cut the bytes sent and parsed
+        per tag.  Falls back to the Text format if the reader supports none of them.
+
+        A format is only used once a sample TagList parses in full, as some firmware accepts a format
+        with tokens, such as %m, that it does not report.  A sample without tags is taken as parsing.
+
+        :param custom_formats: TagListCustomFormat strings, in order of preference
+        :return: TagListCustomFormat used, or None if Text format is used
+        """
+        for custom_format in custom_formats:
+            try:
+                self.set_tag_list_format('Custom', custom_format)
+            except Exception:
+                continue
+            sample = self.send_receive_bytes('t')
+            # Label free lines have no spaces, so every tag line of the sample must be a record.
+            if b'(No Tags)' in sample or len(self.tag_list_parser.parse_bytes(sample)) == len(sample.split()):
+                return custom_format
+        self.set_tag_list_format('Text')
+        return None
+
+    def _read_tag_list_data(self, retry_count):
+        data = b''
+        for i in range(retry_count + 1):
+            data = self.send_receive_bytes('t')
+            if b'(No Tags)' not in data:
+                break
+            if self.metrics is not None and i < retry_count:
+                self.metrics.count('no_tags_retry', 't')
+        return data
+
+    def _timed_parse(self, parse, data):
+        if self.metrics is None:
+            return parse(data)
+        start = time.perf_counter()
+        tags = parse(data)
+        self.metrics.observe(PARSE, 't', time.perf_counter() - start)
+        return tags
+
     def read_tags(self, retry_count=2):
         """
         Read default RFID tag
@@ -156,16 +485,38 @@ class _AlienReader(object):
         :param retry_count: attempts before aborting after failure
         :return: list of tags
         """
-        return_text = ''
-        for i in range(retry_count + 1):
-            return_text = self.send_receive('t')
-            if '(No Tags)' not in return_text:
-                break
-        tags = []
-        for line in return_text.split('\n'):
-            if line[:4] == 'Tag:':
-                tags.append(bytearray.fromhex(line[4:33].replace(' ', '')))
-        return tags
+        return self._timed_parse(self.tag_list_parser.epcs_bytes, self._read_tag_list_data(retry_count))
+
+    def read_tag_list(self, retry_count=2):
+        """
+        Read RFID tags with all fields reported by the reader
+
+        :param retry_count: attempts before aborting after failure
+        :return: list of TagRecord
+        """
+        return self._timed_parse(self.tag_list_parser.parse_bytes, self._read_tag_list_data(retry_count))
+
+    def read_tags_by_antenna(self, antennas=None, retry_count=0):
+        """
+        Read RFID tags on each antenna separately
+
+        :param antennas: antenna numbers in the order to use them, default the current AntennaSequence
+        :param retry_count: attempts before aborting after failure
+        :return: dict of antenna number to list of TagRecord
+        """
+        return read_tags_by_antenna(self, antennas, retry_count)
+
+    def inventory_stream(self, interval=1.0, window=5.0, max_tags=10000, duration=None):
+        """
+        Poll the TagList continuously, yielding a TagEvent only when a tag arrives or departs
+
+        :param interval: seconds between polls
+        :param window: seconds without a read before a tag departs
+        :param max_tags: most tags tracked at once
+        :param duration: seconds to run for, None for until the generator is closed
+        :return: generator of TagEvent
+        """
+        return inventory_stream(self, interval, window, max_tags, duration)
 
     def g2_read(self, bank_number, start_word, word_count, retry_count=2):
         """
@@ -177,18 +528,13 @@ class _AlienReader(object):
         :param retry_count: attemps before aborting after failure
         :return: Hexadecimal as str
         """
-        if not 0 <= bank_number <= 3:
-            raise ValueError('Valid bank_number is 0-3.')
-        if not 0 <= word_count <= 32:
-            raise ValueError('Valid word_count is 0-32 (unless less supported by bank.)')
+        command = g2_read_command(bank_number, start_word, word_count)
         for i in range(retry_count + 1):
-            values = self.send_receive('G2Read={},{},{}'.format(bank_number, start_word, word_count))
-            if 'Read error.' in values:
-                raise Exception(values)
-            if 'G2Read' in values:
-                values = values.strip().replace(' ', '')
-                values = values.rsplit('G2Read=')[-1]
-                return bytearray.fromhex(values)
+            values = parse_g2_read(self.send_receive(command))
+            if values is not None:
+                return values
+            if self.metrics is not None and i < retry_count:
+                self.metrics.count('g2_read_retry', 'G2Read')
         else:
             raise Exception('Error getting G2Read({},{},{})'.format(bank_number, start_word, word_count))
 
@@ -201,10 +547,185 @@ class _AlienReader(object):
         :param byte_data: even number of bytes
         :return: None
         """
+        check_g2_write(self.send_receive(g2_write_command(bank_number, start_word, byte_data)))
+
+    def _forget_sent_setting(self, msg):
+        # A set sent other than through set_setting makes the cached value unknown.
+        command = msg.strip().lower()
+        if command in ('reboot', 'factorysettings'):
+            self._settings.clear()
+        elif command == 'automodereset':
+            for name in [name for name in self._settings if name.startswith('auto')]:
+                del self._settings[name]
+        elif '=' in command:
+            name = command.split('=', 1)[0].strip()
+            if name.startswith('set '):
+                name = name[4:].strip()
+            self._settings.pop(name, None)
+
+    def get_setting(self, name, refresh=False):
+        """
+        Get a reader setting, from the cache of known settings when possible
+
+        :param name: setting name, such as 'RFLevel'
+        :param refresh: ask the reader even if the value is cached
+        :return: value as str
+        """
+        cached = self._settings.get(name.lower())
+        if cached is not None and not refresh:
+            return cached[1]
+        value = parse_get(self.send_receive('get {}'.format(name)), name)
+        self._settings[name.lower()] = (name, value)
+        return value
+
+    def set_setting(self, name, value, force=False):
+        """
+        Set a reader setting, skipped if the reader is known to have the value already
+
+        :param name: setting name, such as 'RFLevel'
+        :param value: value to set, compared with the cached value as str
+        :param force: send even if the value is cached
+        :return: True if sent to reader, False if skipped
+        """
+        value = str(value)
+        cached = self._settings.get(name.lower())
+        if cached is not None and cached[1] == value and not force:
+            return False
+        result = self.send_receive('{}={}'.format(name, value))
+        if 'Error' in result:
+            raise Exception('Could not set {}: {}'.format(name, result))
+        self._settings[name.lower()] = (name, value)
+        return True
+
+    def remember_setting(self, name, value):
+        """
+        Record a setting value known to be on the reader, such as one set in a send_many batch
+
+        :param name: setting name, such as 'RFLevel'
+        :param value: value of setting
+        :return: None
+        """
+        self._settings[name.lower()] = (name, str(value))
+
+    def invalidate_settings(self, *names):
+        """
+        Forget cached settings, such as after the reader is changed by another client
+
+        :param names: settings to forget, all of them if none given
+        :return: None
+        """
+        if not names:
+            self._settings.clear()
+        for name in names:
+            self._settings.pop(name.lower(), None)
+
+    @property
+    def settings(self):
+        """
+        Copy of the cached settings known for the reader, by name.
+        """
+        return dict(self._settings.values())
+
+    def prog_block(self):
+        """
+        Block mode programming parameters of the reader
+
+        :return: (ProgBlockSize in words, ProgBlockAlign as bool), (0, False) if not supported by reader
+        """
+        try:
+            block_words = int(self.get_setting('ProgBlockSize'))
+            block_align = self.get_setting('ProgBlockAlign').lower() in ('on', 'true', '1')
+        except Exception:
+            return 0, False
+        return block_words, block_align
+
+    def write_bank(self, bank_number, start_word, byte_data, skip_unchanged=True, verify=False, chunk_words=32,
+                   block=None, merge_gap=2, retry_count=2):
+        """
+        Write memory of any length, split into pipelined G2Write commands
+
+        :param bank_number: 0-3
+        :param start_word: position of first word to write (0-2097151)
+        :param byte_data: even number of bytes
+        :param skip_unchanged: read current memory first and only write the words that differ
+        :param verify: read memory back after writing and raise if it does not match
+        :param chunk_words: maximum words per G2Write
+        :param block: (ProgBlockSize, ProgBlockAlign) to use instead of asking the reader with prog_block
+        :param merge_gap: unchanged words between changed ones that are written anyway, to save a command
+        :param retry_count: attempts for each chunk before aborting after failure
+        :return: number of words written, including any words of whole blocks written back unchanged
+        """
         assert len(byte_data) % 2 == 0, 'byte_data must be an even number of bytes, due to word boundaries of data.'
-        # Convert to uppercase and space delimited hex string expected
-        hexed = hexlify(byte_data).upper().decode('UTF-8')
-        spaced_hexed = ' '.join([hexed[i:i + 2] for i in range(0, len(hexed), 2)])
-        result = self.send_receive('G2Write={},{},{}'.format(bank_number, start_word, spaced_hexed))
-        if 'Success!' not in result:
-            raise Exception("'Success!' not received: {}".format(result))
+        byte_data = bytes(byte_data)
+        word_count = len(byte_data) // 2
+        block_words, block_align = self.prog_block() if block is None else block
+        current = None
+        if block_words and block_align and word_count:
+            # Pad to whole blocks with the memory already there, as aligned readers only write from block boundaries.
+            pad_before = start_word % block_words
+            pad_after = -(start_word + word_count) % block_words
+            if pad_before or pad_after:
+                start_word -= pad_before
+                word_count += pad_before + pad_after
+                current = self.read_bank(bank_number, start_word, word_count, retry_count=retry_count)
+                byte_data = bytes(current[:pad_before * 2]) + byte_data + bytes(current[len(current) - pad_after * 2:])
+        if skip_unchanged:
+            if current is None:
+                current = self.read_bank(bank_number, start_word, word_count, retry_count=retry_count)
+            runs = _changed_runs(current, byte_data, merge_gap)
+        else:
+            runs = [[0, word_count]] if word_count else []
+        pending = _write_chunks(runs, start_word, word_count, chunk_words, block_words, block_align)
+        written = sum(count for offset, count in pending)
+        for i in range(retry_count + 1):
+            commands = [g2_write_command(bank_number, start_word + offset, byte_data[offset * 2:(offset + count) * 2])
+                        for offset, count in pending]
+            pending = [chunk for chunk, result in zip(pending, self.send_many(commands))
+                       if 'Success!' not in result]
+            if not pending:
+                break
+        else:
+            raise Exception('Error writing G2Write({},{}) for words at offsets {}'.format(
+                bank_number, start_word, [offset for offset, count in pending]))
+        if verify:
+            mismatched = _changed_runs(self.read_bank(bank_number, start_word, word_count, retry_count=retry_count),
+                                       byte_data, 0)
+            if mismatched:
+                raise Exception('Verify failed for G2Write({},{}) at word ranges {}'.format(
+                    bank_number, start_word, [tuple(run) for run in mismatched]))
+        return written
+
+    def read_bank(self, bank_number, start_word, word_count, chunk_words=32, retry_count=2):
+        """
+        Read memory of any length, split into G2Read commands of up to chunk_words
+
+        Chunks are pipelined, and only chunks that failed are read again on retry.
+
+        :param bank_number: 0-3
+        :param start_word: position of first word to read (0-2097151)
+        :param word_count: number of words to read
+        :param chunk_words: words per G2Read (1-32)
+        :param retry_count: attempts for each chunk before aborting after failure
+        :return: bytearray of data read
+        """
+        if not 1 <= chunk_words <= 32:
+            raise ValueError('Valid chunk_words is 1-32.')
+        data = bytearray(word_count * 2)
+        pending = [(offset, min(chunk_words, word_count - offset)) for offset in range(0, word_count, chunk_words)]
+        for i in range(retry_count + 1):
+            commands = [g2_read_command(bank_number, start_word + offset, count) for offset, count in pending]
+            failed = []
+            for (offset, count), response in zip(pending, self.send_many(commands)):
+                try:
+                    values = parse_g2_read(response)
+                except Exception:
+                    values = None
+                if values is None or len(values) != count * 2:
+                    failed.append((offset, count))
+                else:
+                    data[offset * 2:(offset + count) * 2] = values
+            pending = failed
+            if not pending:
+                return data
+        raise Exception('Error getting G2Read({},{},{}) for words at offsets {}'.format(
+            bank_number, start_word, word_count, [offset for offset, count in pending]))
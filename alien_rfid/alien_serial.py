@@ -51,6 +51,10 @@ class AlienReaderSerial(_AlienReader):
     def _byte_read(self):
         return self.ser.read()
 
+    def _chunk_read(self):
+        # Block for the first byte, then take whatever else has already arrived.
+        return self.ser.read(self.ser.in_waiting or 1)
+
     def _send(self, msg_bytes):
         self.ser.write(msg_bytes)
 
@@ -0,0 +1,237 @@
+import queue
+import threading
+from concurrent.futures import Future
+
+from .alien_settings import lookup
+
+# Queued to stop the worker.
+_STOP = object()
+
+# Commands that only read, so are safe to send again when send_many replays a batch after recovery.
+_READ_COMMANDS = ('t', 'taglist', 'g2read')
+
+
+def _repeatable(msg):
+    # A get, a set of a setting or a read, rather than an action such as Reboot or Quit, or a G2Write that
+    # could be sent again after another caller's write.
+    command = msg.strip()
+    if command[:4].lower() == 'get ':
+        return True
+    name, separator, _ = command.partition('=')
+    name = name.strip()
+    if name[:4].lower() == 'set ':
+        name = name[4:].strip()
+    if name.lower() in _READ_COMMANDS:
+        return True
+    if not separator:
+        return False
+    try:
+        return lookup(name).settable
+    except ValueError:
+        return False
+
+
+class _Request(object):
+    __slots__ = ('future', 'function', 'args', 'kwargs', 'command')
+
+    def __init__(self, function, args, kwargs, command=None):
+        self.future = Future()
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.command = command
+
+
+class ReaderSession(object):
+    """
+    Thread-safe use of one reader by any number of threads.
+
+    A single worker thread owns the reader and runs requests from a queue in order, so commands from
+    different threads never interleave on the connection, and recovery by the reader, closing and opening
+    the connection, never happens under another caller.  Every request returns a Future, the blocking
+    methods wait for it.  Gets, sets and reads queued together by several threads are sent as one
+    pipelined send_many, so callers share round trips instead of contending for the connection.  Other
+    commands, such as AutoModeTriggerNow or Reboot, are sent on their own, as send_many sends the whole
+    batch again after a recovery.  So are G2Writes submitted by callers, as one caller's write sent again
+    could undo another's write to the same words.  write_bank still pipelines its own G2Writes, which
+    cover separate words of one write, so sending them again writes the same data.
+
+    with ReaderSession(AlienReaderNetwork('10.0.0.1')) as session:
+        # From any thread
+        tags = session.read_tags()
+        future = session.submit(ar.g2_read, 3, 0, 8)
+
+    Futures work with asyncio.wrap_future, for use from a running event loop.
+    """
+
+    def __init__(self, reader, max_queued=0, pipeline=True):
+        """
+        :param reader: _AlienReader, used only by the worker thread from now on
+        :param max_queued: most requests waiting, further ones block, 0 for no limit
+        :param pipeline: send commands waiting together as one send_many
+        """
+        self.reader = reader
+        self.pipeline = pipeline
+        self._queue = queue.Queue(max_queued)
+        self._worker = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._worker is not None
+
+    def __enter__(self):
+        self.start()
+        if not self.reader.connected:
+            self.call(lambda reader: reader.open())
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def start(self):
+        """
+        Start the worker thread.
+
+        :return: None
+        """
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+
+    def close(self, close_reader=True):
+        """
+        Run requests already queued, stop the worker thread and optionally close the reader.
+
+        :param close_reader: also close the reader, from the worker thread
+        :return: None
+        """
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is None:
+            return
+        if close_reader:
+            self._queue.put(_Request(self._close_reader, (), {}))
+        self._queue.put(_STOP)
+        worker.join()
+
+    def _close_reader(self):
+        if self.reader.connected:
+            self.reader.close()
+
+    def _put(self, request):
+        if self._worker is None:
+            raise Exception('ReaderSession is not running.')
+        self._queue.put(request)
+        return request.future
+
+    def submit(self, function, *args, **kwargs):
+        """
+        Queue a call of function on the worker thread
+
+        :param function: callable, typically a bound method of the reader
+        :return: Future of the result
+        """
+        return self._put(_Request(function, args, kwargs))
+
+    def call(self, function, *args, **kwargs):
+        """
+        Run function(reader, *args, **kwargs) on the worker thread, with no other request in between, and
+        wait for the result.  For sequences of commands that must not be interleaved, such as setting a
+        mask then writing.
+
+        :param function: callable taking the reader first
+        :return: result of function
+        """
+        return self.submit(function, self.reader, *args, **kwargs).result()
+
+    def submit_command(self, msg):
+        """
+        Queue a command
+
+        :param msg: message to send
+        :return: Future of the raw text response
+        """
+        return self._put(_Request(self.reader.send_receive, (msg,), {}, msg if _repeatable(msg) else None))
+
+    def send_receive(self, msg="", timeout=None):
+        """
+        Send a command and return the response
+
+        :param msg: message to send
+        :param timeout: seconds to wait for the response, None for no limit
+        :return: raw text data from reader
+        """
+        return self.submit_command(msg).result(timeout)
+
+    def send_many(self, msgs, depth=None):
+        return self.submit(self.reader.send_many, msgs, depth).result()
+
+    def read_tags(self, retry_count=2):
+        return self.submit(self.reader.read_tags, retry_count).result()
+
+    def read_tag_list(self, retry_count=2):
+        return self.submit(self.reader.read_tag_list, retry_count).result()
+
+    def g2_read(self, bank_number, start_word, word_count, retry_count=2):
+        return self.submit(self.reader.g2_read, bank_number, start_word, word_count, retry_count).result()
+
+    def g2_write(self, bank_number, start_word, byte_data):
+        return self.submit(self.reader.g2_write, bank_number, start_word, byte_data).result()
+
+    def get_setting(self, name, refresh=False):
+        return self.submit(self.reader.get_setting, name, refresh).result()
+
+    def set_setting(self, name, value, force=False):
+        return self.submit(self.reader.set_setting, name, value, force).result()
+
+    def _run(self):
+        waiting = None
+        while True:
+            request = waiting if waiting is not None else self._queue.get()
+            waiting = None
+            if request is _STOP:
+                return
+            if request.command is None or not self.pipeline:
+                self._execute(request)
+                continue
+            batch = [request]
+            # Take the other commands already queued, up to the first request that is not a command.
+            while len(batch) < max(self.reader.PIPELINE_DEPTH, 1):
+                try:
+                    waiting = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if waiting is _STOP or waiting.command is None:
+                    break
+                batch.append(waiting)
+                waiting = None
+            self._execute_commands(batch)
+
+    @staticmethod
+    def _execute(request):
+        if not request.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = request.function(*request.args, **request.kwargs)
+        except BaseException as e:
+            request.future.set_exception(e)
+        else:
+            request.future.set_result(result)
+
+    def _execute_commands(self, batch):
+        batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            if len(batch) == 1:
+                responses = [self.reader.send_receive(batch[0].command)]
+            else:
+                responses = self.reader.send_many([request.command for request in batch])
+        except BaseException as e:
+            for request in batch:
+                request.future.set_exception(e)
+        else:
+            for request, response in zip(batch, responses):
+                request.future.set_result(response)
@@ -0,0 +1,289 @@
+import re
+from .alien_rfid import RF_LEVEL_RANGE, parse_get
+from .alien_tester import TesterIO
+
+
+class _Text(object):
+    """
+    Setting value passed through as text.
+    """
+
+    def to_python(self, value):
+        return value
+
+    def to_reader(self, value):
+        return str(value)
+
+
+class _Int(_Text):
+    def __init__(self, minimum=None, maximum=None):
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def to_python(self, value):
+        return int(value)
+
+    def to_reader(self, value):
+        value = int(value)
+        if (self.minimum is not None and value < self.minimum) or (self.maximum is not None and value > self.maximum):
+            raise ValueError('{} is not between {} and {}.'.format(value, self.minimum, self.maximum))
+        return str(value)
+
+
+class _OnOff(_Text):
+    def to_python(self, value):
+        return value.strip().lower() in ('on', 'true', '1')
+
+    def to_reader(self, value):
+        if isinstance(value, str):
+            value = value.strip().lower() in ('on', 'true', '1')
+        return 'On' if value else 'Off'
+
+
+class _Choice(_Text):
+    def __init__(self, *choices):
+        self.choices = {choice.lower(): choice for choice in choices}
+
+    def to_python(self, value):
+        return self.choices.get(value.strip().lower(), value)
+
+    def to_reader(self, value):
+        choice = self.choices.get(str(value).strip().lower())
+        if choice is None:
+            raise ValueError('{} is not one of {}.'.format(value, ', '.join(self.choices.values())))
+        return choice
+
+
+_ON_OFF = _OnOff()
+_FORMATS = _Choice('Text', 'Terse', 'XML', 'Custom')
+
+# Types of settings that are not plain text.  Ranges are those documented for the reader, and may be
+# further limited by a particular model.  RFLevel is limited to the range readers are opened with.
+_TYPES = {
+    'RFLevel': _Int(*RF_LEVEL_RANGE),
+    'RFAttenuation': _Int(0, 150),
+    'MaxAntenna': _Int(),
+    'ReaderNumber': _Int(0, 255),
+    'BaudRate': _Int(),
+    'DHCP': _ON_OFF,
+    'DHCPTimeout': _Int(0),
+    'NetworkTimeout': _Int(0),
+    'CommandPort': _Int(1, 65535),
+    'HeartbeatPort': _Int(1, 65535),
+    'HeartbeatTime': _Int(0),
+    'HeartbeatCount': _Int(-1),
+    'WWWPort': _Int(0, 65535),
+    'TagListFormat': _FORMATS,
+    'TagDataFormatGroupSize': _Int(0),
+    'TagListMillis': _ON_OFF,
+    'PersistTime': _Int(-1),
+    'TagListAntennaCombine': _ON_OFF,
+    'TagStreamMode': _ON_OFF,
+    'TagStreamFormat': _FORMATS,
+    'TagStreamKeepAliveTime': _Int(-1),
+    'StreamHeader': _ON_OFF,
+    'AcquireMode': _Choice('Inventory', 'Global Scroll'),
+    'AcqG2Cycles': _Int(1, 255),
+    'AcqG2Count': _Int(1, 255),
+    'AcqG2Q': _Int(0, 15),
+    'AcqG2QMax': _Int(0, 15),
+    'AcqG2Select': _Int(0, 255),
+    'AcqG2Session': _Int(0, 3),
+    'AcqG2MaskAction': _Choice('Include', 'Exclude'),
+    'AcqG2Target': _Choice('A', 'B', 'AB'),
+    'InvertExternalInput': _ON_OFF,
+    'InvertExternalOutput': _ON_OFF,
+    'IOStreamMode': _ON_OFF,
+    'IOStreamFormat': _FORMATS,
+    'IOStreamKeepAliveTime': _Int(-1),
+    'IOListFormat': _FORMATS,
+    'IOPersistTime': _Int(-1),
+    'AutoMode': _ON_OFF,
+    'AutoStartPause': _Int(0),
+    'AutoStopTimer': _Int(-1),
+    'AutoStopPause': _Int(0),
+    'AutoTruePause': _Int(0),
+    'AutoFalsePause': _Int(0),
+    'NotifyMode': _ON_OFF,
+    'NotifyFormat': _FORMATS,
+    'NotifyHeader': _ON_OFF,
+    'NotifyTime': _Int(0),
+    'NotifyKeepAliveTime': _Int(-1),
+    'NotifyRetryCount': _Int(-1),
+    'NotifyRetryPause': _Int(0),
+    'NotifyQueueLimit': _Int(0),
+    'ProgAntenna': _Int(0),
+    'ProgEPCDataInc': _ON_OFF,
+    'ProgUserDataInc': _ON_OFF,
+    'ProgBlockSize': _Int(0, 32),
+    'ProgBlockAlign': _ON_OFF,
+    'ProgAttempts': _Int(1),
+    'ProgSingulate': _ON_OFF,
+    'ProgDataUnit': _Int(1),
+}
+
+# Getters returning lists rather than a setting value.
+_NOT_SETTINGS = ('TagList', 't', 'to', 'IOList')
+
+
+class Setting(object):
+    """
+    A reader setting from the command catalogue, with its type.
+    """
+
+    __slots__ = ('name', 'description', 'settable', 'type')
+
+    def __init__(self, name, description, settable, setting_type):
+        self.name = name
+        self.description = description
+        self.settable = settable
+        self.type = setting_type
+
+    def __repr__(self):
+        return 'Setting({!r}{})'.format(self.name, '' if self.settable else ', read only')
+
+
+def _catalogue(doc):
+    # Build settings from the 'Name:' and 'Get|Set ...' description lines of the command help.
+    settings = {}
+    for name, description in re.findall(r'^  (\w+):\n     (.*)$', doc, re.M):
+        if name in _NOT_SETTINGS or not description.startswith('Get'):
+            continue
+        settings[name] = Setting(name, description, description.startswith('Get|Set'), _TYPES.get(name, _Text()))
+    return settings
+
+
+# Every Get and Get|Set setting listed in the reader command help, by name.
+SETTINGS = _catalogue(TesterIO.__doc__)
+_LOWER_SETTINGS = {name.lower(): setting for name, setting in SETTINGS.items()}
+
+
+def lookup(name):
+    """
+    Setting from the catalogue, by case insensitive name
+
+    :param name: setting name
+    :return: Setting
+    """
+    try:
+        return _LOWER_SETTINGS[name.lower()]
+    except KeyError:
+        raise ValueError('Unknown setting {}.'.format(name))
+
+
+class ReaderSettings(object):
+    """
+    Typed access to the settings of a reader, validated against the command catalogue in SETTINGS.
+
+    Values are converted to int, bool or the reader's spelling of a choice where the type is known.
+    Settings are held in the reader's settings cache, so values already known are not asked for again,
+    and values the reader already has are never sent again.  Read only settings, which the reader changes
+    itself, are asked for every time.  get_all and apply batch all the gets or sets
+    they need into one pipelined send_many.
+
+    settings = ReaderSettings(ar)
+    settings.apply({'AcqG2Q': 4, 'AcqG2Cycles': 2, 'TagStreamMode': False})
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+    def __setitem__(self, name, value):
+        self.set(name, value)
+
+    def get(self, name, refresh=False):
+        """
+        Get typed value of a setting
+
+        :param name: setting name
+        :param refresh: ask the reader even if the value is cached
+        :return: value
+        """
+        setting = lookup(name)
+        if not setting.settable:
+            # Read only settings, such as Uptime or ExternalInput, change on the reader and are never cached.
+            return setting.type.to_python(parse_get(self.reader.send_receive('get ' + setting.name), setting.name))
+        return setting.type.to_python(self.reader.get_setting(setting.name, refresh))
+
+    def set(self, name, value):
+        """
+        Set a setting, skipped if the reader already has the value
+
+        :param name: setting name
+        :param value: value to set
+        :return: True if sent to reader, False if skipped
+        """
+        return bool(self.apply({name: value}))
+
+    def snapshot(self):
+        """
+        Typed values of every setting known without asking the reader
+
+        :return: dict of setting name to value
+        """
+        values = {}
+        for name, value in self.reader.settings.items():
+            setting = _LOWER_SETTINGS.get(name.lower())
+            values[name] = setting.type.to_python(value) if setting else value
+        return values
+
+    def get_all(self, names=None, refresh=False):
+        """
+        Get typed values of many settings, asking the reader for all unknown ones in one batch
+
+        Settings the reader does not support are left out of the result.
+
+        :param names: setting names, default every setting in the catalogue
+        :param refresh: ask the reader even for values that are cached
+        :return: dict of setting name to value
+        """
+        settings = [lookup(name) for name in names] if names is not None else list(SETTINGS.values())
+        cached = {name.lower(): value for name, value in self.reader.settings.items()}
+        missing = [setting for setting in settings
+                   if refresh or not setting.settable or setting.name.lower() not in cached]
+        responses = self.reader.send_many(['get {}'.format(setting.name) for setting in missing])
+        for setting, response in zip(missing, responses):
+            try:
+                value = parse_get(response, setting.name)
+            except Exception:
+                cached.pop(setting.name.lower(), None)
+                continue
+            if setting.settable:
+                self.reader.remember_setting(setting.name, value)
+            cached[setting.name.lower()] = value
+        return {setting.name: setting.type.to_python(cached[setting.name.lower()]) for setting in settings
+                if setting.name.lower() in cached}
+
+    def apply(self, values):
+        """
+        Set many settings, sending only values that differ from the known ones, in one batch
+
+        Every value is validated before anything is sent.
+
+        :param values: dict of setting name to value
+        :return: list of names of settings sent to reader
+        """
+        cached = {name.lower(): value for name, value in self.reader.settings.items()}
+        changes = []
+        for name, value in values.items():
+            setting = lookup(name)
+            if not setting.settable:
+                raise ValueError('{} is read only.'.format(setting.name))
+            reader_value = setting.type.to_reader(value)
+            known = cached.get(setting.name.lower())
+            if known is not None and setting.type.to_python(known) == setting.type.to_python(reader_value):
+                continue
+            changes.append((setting.name, reader_value))
+        responses = self.reader.send_many(['{}={}'.format(name, value) for name, value in changes])
+        errors = []
+        for (name, value), response in zip(changes, responses):
+            if 'Error' in response:
+                errors.append('{}: {}'.format(name, response))
+            else:
+                self.reader.remember_setting(name, value)
+        if errors:
+            raise Exception('Could not set ' + '; '.join(errors))
+        return [name for name, value in changes]
@@ -0,0 +1,710 @@
+import collections
+import random
+import socket
+import socketserver
+import threading
+import time
+from .alien_settings import lookup
+from .alien_stream import _ThreadingTCPServer
+
+# Settings of a simulated reader after boot or FactorySettings.
+DEFAULT_SETTINGS = {
+    'ReaderName': 'Alien RFID Reader',
+    'ReaderType': 'Alien RFID Tag Reader, Model: ALR-9900 (Four Antenna / EPC Class 1 Gen 2 / 902-928 MHz)',
+    'ReaderVersion': '15.03.01.00 (simulated)',
+    'DSPVersion': '1.0.0',
+    'ReaderNumber': '255',
+    'MaxAntenna': '3',
+    'AntennaSequence': '0',
+    'RFLevel': '290',
+    'RFAttenuation': '0',
+    'Function': 'Reader',
+    'NetworkTimeout': '90',
+    'PersistTime': '-1',
+    'TagListFormat': 'Text',
+    'TagListCustomFormat': 'Tag:%k, Disc:%d %t, Last:%D %T, Count:%r, Ant:%a, Proto:%p',
+    'TagListAntennaCombine': 'On',
+    'TagListMillis': 'Off',
+    'TagStreamMode': 'Off',
+    'TagStreamFormat': 'Text',
+    'TagStreamCustomFormat': '%k',
+    'TagStreamAddress': '',
+    'TagStreamCountFilter': '0 0',
+    'AcquireMode': 'Inventory',
+    'AcqG2Cycles': '1',
+    'AcqG2Count': '1',
+    'AcqG2Q': '3',
+    'AcqG2QMax': '15',
+    'AcqG2Session': '1',
+    'AcqG2Select': '1',
+    'AcqG2Target': 'A',
+    'AcqG2Mask': '0',
+    'AcqG2MaskAction': 'Include',
+    'RSSIFilter': '0 0',
+    'AutoMode': 'Off',
+    'AutoAction': 'Acquire',
+    'AutoStartTrigger': '0 0',
+    'AutoStopTrigger': '0 0',
+    'AutoStopTimer': '-1',
+    'AutoStartPause': '0',
+    'AutoTruePause': '0',
+    'AutoFalsePause': '0',
+    'NotifyMode': 'Off',
+    'NotifyFormat': 'Text',
+    'ProgBlockSize': '0',
+    'ProgBlockAlign': 'Off',
+    'ProgAttempts': '3',
+}
+
+
+class SimulatedTag(object):
+    """
+    A tag in the field of a SimulatedReader.
+
+    banks holds the bytearray of each memory bank by number, the EPC bank (1) is built from the epc.
+    read_rate is the chance of the tag answering each inventory round on each of its antennas.  locked
+    holds the banks locked against writing, and the first fail_writes writes fail, as a marginal tag.
+    """
+
+    def __init__(self, epc, antennas=(0,), rssi=-55.0, read_rate=1.0, user=None, tid=None, fail_writes=0):
+        """
+        :param epc: bytes of EPC
+        :param antennas: antennas the tag is in the field of
+        :param rssi: mean RSSI of reads
+        :param read_rate: chance of a read in each inventory round, 0 to 1
+        :param user: bytes of user memory, default 64 bytes of zeros
+        :param tid: bytes of TID memory, default E2 class ID and serial from the EPC
+        :param fail_writes: number of writes that fail before writes succeed
+        """
+        epc = bytes(epc)
+        self.antennas = tuple(antennas)
+        self.rssi = rssi
+        self.read_rate = read_rate
+        self.first_seen = None
+        self.fail_writes = fail_writes
+        self.locked = set()
+        pc = (len(epc) // 2) << 11
+        self.banks = {
+            0: bytearray(8),
+            1: bytearray(2) + pc.to_bytes(2, 'big') + epc,
+            2: bytearray(tid if tid is not None else b'\xe2\x00\x34\x11' + epc[-8:]),
+            3: bytearray(user if user is not None else bytes(64)),
+        }
+
+    @property
+    def epc(self):
+        return bytes(self.banks[1][4:])
+
+    def __repr__(self):
+        return 'SimulatedTag({})'.format(self.epc.hex().upper())
+
+
+def random_tags(count, antennas=(0,), rssi=(-70.0, -40.0), read_rate=1.0, epc_length=12, seed=None):
+    """
+    Population of tags with random EPCs, each in the field of a random non-empty subset of antennas
+
+    :param count: number of tags
+    :param antennas: antennas of the reader
+    :param rssi: (low, high) range of mean RSSI
+    :param read_rate: chance of a read in each inventory round
+    :param epc_length: bytes of each EPC
+    :param seed: random seed, for a repeatable population
+    :return: list of SimulatedTag
+    """
+    rng = random.Random(seed)
+    tags = []
+    for _ in range(count):
+        seen_by = [antenna for antenna in antennas if rng.random() < 0.5] or [rng.choice(antennas)]
+        tags.append(SimulatedTag(bytes(rng.getrandbits(8) for _ in range(epc_length)), seen_by,
+                                 round(rng.uniform(*rssi), 1), read_rate))
+    return tags
+
+
+def _bits(data, start, length):
+    return int.from_bytes(data, 'big') >> (len(data) * 8 - start - length) & ((1 << length) - 1)
+
+
+def _range(value):
+    # (min, max) of an RSSIFilter or TagStreamCountFilter, None when off, max None when not given.
+    values = [float(field) for field in (value or '').replace(',', ' ').split()]
+    if not any(values):
+        return None
+    return values[0], values[1] if len(values) > 1 and values[1] else None
+
+
+def _in_range(value, limits):
+    if limits is None:
+        return True
+    minimum, maximum = limits
+    return value >= minimum and (maximum is None or value <= maximum)
+
+
+class SimulatedReader(object):
+    """
+    In-process simulation of an Alien RFID reader, for testing and benchmarking without hardware.
+
+    Answers the reader command set: get and set of any setting in the command catalogue, validated by
+    its type, TagList (t) in Text or Custom TagListFormat filtered by AcqG2Mask and RSSIFilter, G2Read
+    and G2Write on the first tag singulated, Clear TagList, Reboot, FactorySettings, AutoModeReset and
+    Quit.
+
+    With AutoMode on, acquisition runs on a background thread, every AutoStopTimer msec, or 50 msec if
+    not set, after AutoModeTriggerNow when an AutoStartTrigger is set.  With TagStreamMode on, tags
+    read are streamed over TCP to TagStreamAddress in the TagStreamFormat, leaving out those outside
+    the TagStreamCountFilter.
+
+    Each response is delayed by latency, plus tag_latency for each tag reported, and error_rate and
+    drop_rate inject error responses and lost responses.
+
+    With a slot_time, each round of an acquisition is a Gen2 slotted ALOHA frame of 2**AcqG2Q slots.
+    Tags replying in the same slot collide and are not read, and in AcqG2Session 1 to 3 tags stay quiet
+    for the rest of the acquisition once read.  The air time of the frames is added to the TagList
+    response delay, so dense populations read slowly or not at all with a Q too small.
+
+    The object is serial-like, so it can be the fake_interface of AlienReaderTester, and
+    ReaderSimulatorServer serves it over TCP.
+
+    sim = SimulatedReader(random_tags(500, antennas=(0, 1), seed=1), latency=0.01)
+    with AlienReaderTester(sim) as ar:
+        tags = ar.read_tag_list()
+    """
+
+    def __init__(self, tags=(), latency=0.0, tag_latency=0.0, error_rate=0.0, drop_rate=0.0,
+                 rssi_noise=2.0, settings=None, seed=None, slot_time=0.0):
+        """
+        :param tags: SimulatedTag in the field
+        :param latency: seconds before each response
+        :param tag_latency: extra seconds for each tag in a TagList response
+        :param error_rate: chance of answering a command with an error
+        :param drop_rate: chance of not answering a command at all
+        :param rssi_noise: standard deviation of RSSI of each read
+        :param settings: settings changed from DEFAULT_SETTINGS, by name
+        :param seed: random seed, for repeatable reads and errors
+        :param slot_time: seconds of air time of each Gen2 slot, 0 to read tags without collisions
+        """
+        self.tags = list(tags)
+        self.latency = latency
+        self.tag_latency = tag_latency
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.rssi_noise = rssi_noise
+        self.slot_time = slot_time
+        self.commands = []
+        self.is_open = True
+        self._initial_settings = dict(settings or {})
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._responses = collections.deque()
+        self._pending = bytearray()
+        self._boot_time = time.time()
+        self._auto_stop = None
+        self._auto_trigger = threading.Event()
+        self._air_time = 0.0
+        self.reset()
+
+    def reset(self):
+        """
+        Return settings to those given when created, as after a reboot.
+
+        :return: None
+        """
+        self._settings = {name.lower(): (name, value) for name, value in DEFAULT_SETTINGS.items()}
+        for name, value in self._initial_settings.items():
+            self._settings[name.lower()] = (name, str(value))
+
+    def setting(self, name):
+        """
+        Current value of a setting
+
+        :param name: setting name
+        :return: value as str, or None if not set
+        """
+        value = self._settings.get(name.lower())
+        return value[1] if value is not None else None
+
+    # Serial-like interface
+
+    def open(self):
+        self.is_open = True
+
+    def close(self):
+        self.is_open = False
+        self._stop_auto()
+        with self._io_lock:
+            self._responses.clear()
+            del self._pending[:]
+
+    def write(self, msg_bytes):
+        """
+        Execute each \\r\\n terminated command, queueing its response after the simulated latency.
+
+        :param msg_bytes: bytes of one or more commands
+        :return: number of bytes written
+        """
+        for line in bytes(msg_bytes).decode('UTF-8', 'replace').split('\n')[:-1]:
+            response, delay = self.execute(line.strip())
+            if response is not None:
+                with self._io_lock:
+                    # Commands are processed one at a time, so each waits for those before it.
+                    ready = max(time.monotonic(), self._responses[-1][0] if self._responses else 0) + delay
+                    self._responses.append((ready, response.encode('UTF-8') + b'\r\n\x00'))
+        return len(msg_bytes)
+
+    def _take_ready(self):
+        now = time.monotonic()
+        while self._responses and self._responses[0][0] <= now:
+            self._pending += self._responses.popleft()[1]
+
+    @property
+    def in_waiting(self):
+        with self._io_lock:
+            self._take_ready()
+            return len(self._pending)
+
+    def read(self, size=1):
+        """
+        Read up to size bytes, waiting for a response that is due.  Returns empty bytes, as a serial port
+        timing out, when no response is coming.
+
+        :param size: maximum bytes to read
+        :return: bytes
+        """
+        with self._io_lock:
+            self._take_ready()
+            while not self._pending and self._responses:
+                time.sleep(max(self._responses[0][0] - time.monotonic(), 0))
+                self._take_ready()
+            data = bytes(self._pending[:size])
+            del self._pending[:size]
+            return data
+
+    # Command set
+
+    def execute(self, command):
+        """
+        Execute one command
+
+        :param command: command text, without line ending
+        :return: (response text or None if dropped, seconds of latency)
+        """
+        with self._lock:
+            self.commands.append(command)
+            if self.drop_rate and self._random.random() < self.drop_rate:
+                return None, 0
+            if self.error_rate and self._random.random() < self.error_rate:
+                return 'Error 255: Simulated error.', self.latency
+            tag_count = 0
+            self._air_time = 0.0
+            try:
+                response = self._execute(command)
+            except ValueError as e:
+                response = 'Error 2: {}'.format(e)
+            if isinstance(response, tuple):
+                response, tag_count = response
+            return response, self.latency + tag_count * self.tag_latency + self._air_time
+
+    def _execute(self, command):
+        lower = command.lower()
+        if not command:
+            return 'Alien>'
+        if lower in ('quit', 'exit'):
+            return 'Goodbye!'
+        if lower in ('t', 'get taglist', 'taglist', 'get t'):
+            return self._tag_list()
+        if lower in ('clear', 'clear taglist', 'clear iolist'):
+            return '{} cleared.'.format(command.split(' ', 1)[-1] if ' ' in command else 'TagList')
+        if lower == 'reboot' or lower == 'factorysettings':
+            self.reset()
+            self._stop_auto()
+            return '{} complete.'.format(command)
+        if lower == 'automodereset':
+            for name, value in DEFAULT_SETTINGS.items():
+                if name.startswith('Auto'):
+                    self._set(name, value)
+            self._stop_auto()
+            return 'AutoModeReset: All AutoMode settings have been reset.'
+        if lower == 'automodetriggernow':
+            self._auto_trigger.set()
+            return 'AutoModeTriggerNow: OK'
+        if lower == 'get uptime':
+            return 'Uptime = {}'.format(int(time.time() - self._boot_time))
+        if lower == 'get time':
+            return 'Time = {}'.format(time.strftime('%Y/%m/%d %H:%M:%S'))
+        if lower.startswith('get '):
+            name = command[4:].strip()
+            value = self._settings.get(name.lower())
+            if value is None:
+                try:
+                    lookup(name)
+                except ValueError:
+                    return 'Error 1: Invalid command.'
+                return 'Error 1: {} is not supported by simulator.'.format(name)
+            return '{} = {}'.format(value[0], value[1])
+        if lower.split('=', 1)[0].strip() in _LOCK_COMMANDS:
+            return self._lock_command(command.split('=', 1)[0].strip())
+        if lower.startswith('set '):
+            command = command[4:]
+        name, separator, value = command.partition('=')
+        name = name.strip()
+        if not separator:
+            return 'Error 1: Invalid command.'
+        if name.lower() == 'g2read':
+            return self._g2_read(value)
+        if name.lower() == 'g2write':
+            return self._g2_write(value)
+        try:
+            setting = lookup(name)
+        except ValueError:
+            return 'Error 1: Invalid command.'
+        if not setting.settable:
+            return 'Error 3: {} is read only.'.format(setting.name)
+        value = value.strip()
+        if setting.name != 'AcqG2Mask':
+            value = setting.type.to_reader(value)
+        self._set(setting.name, value)
+        if setting.name == 'AutoMode':
+            if value == 'On':
+                self._start_auto()
+            else:
+                self._stop_auto()
+        return '{} = {}'.format(setting.name, value)
+
+    def _set(self, name, value):
+        self._settings[name.lower()] = (name, value)
+
+    def _masked(self, tag):
+        mask = self.setting('AcqG2Mask')
+        if not mask or mask.strip() == '0':
+            return True
+        fields = [field.strip() for field in mask.split(',')]
+        bank, pointer, length = int(fields[0]), int(fields[1]), int(fields[2])
+        if not length:
+            return True
+        data = tag.banks.get(bank, b'')
+        if pointer + length > len(data) * 8:
+            matched = False
+        else:
+            pattern = bytes.fromhex(fields[3])
+            matched = _bits(data, pointer, length) == _bits(pattern, 0, length)
+        return matched == (self.setting('AcqG2MaskAction') != 'Exclude')
+
+    def _antennas(self):
+        return [int(antenna) for antenna in self.setting('AntennaSequence').replace(',', ' ').split()]
+
+    def _inventory(self):
+        # One acquisition: AcqG2Cycles rounds on each antenna in sequence, counting reads of each tag.
+        cycles = int(self.setting('AcqG2Cycles')) * int(self.setting('AcqG2Count'))
+        antennas = self._antennas()
+        seen = collections.OrderedDict()
+        if self.slot_time:
+            return self._aloha_inventory(antennas, cycles, seen)
+        for tag in self.tags:
+            if not self._masked(tag):
+                continue
+            for antenna in antennas:
+                if antenna not in tag.antennas:
+                    continue
+                count = sum(1 for _ in range(cycles) if self._random.random() < tag.read_rate)
+                if count:
+                    # Antennas repeated in the sequence read again.
+                    seen[tag, antenna] = seen.get((tag, antenna), 0) + count
+        return seen
+
+    def _aloha_inventory(self, antennas, rounds, seen):
+        slots = 1 << int(self.setting('AcqG2Q'))
+        quiet = self.setting('AcqG2Session') != '0'
+        for antenna in antennas:
+            contending = [tag for tag in self.tags if antenna in tag.antennas and self._masked(tag)]
+            for _ in range(rounds):
+                replies = {}
+                for tag in contending:
+                    if self._random.random() < tag.read_rate:
+                        replies.setdefault(self._random.randrange(slots), []).append(tag)
+                self._air_time += slots * self.slot_time
+                read = [tags[0] for tags in replies.values() if len(tags) == 1]
+                for tag in read:
+                    seen[tag, antenna] = seen.get((tag, antenna), 0) + 1
+                if quiet and read:
+                    read = set(read)
+                    contending = [tag for tag in contending if tag not in read]
+        return seen
+
+    def _tag_list(self):
+        lines = self._format_reads(self._inventory(), self.setting('TagListFormat'),
+                                   self.setting('TagListCustomFormat'))
+        if not lines:
+            return '(No Tags)', 0
+        return '\r\n'.join(lines), len(lines)
+
+    def _format_reads(self, seen, tag_format, custom_format, count_filter=None):
+        now = time.time()
+        combine = self.setting('TagListAntennaCombine') != 'Off'
+        reads = collections.OrderedDict()
+        for (tag, antenna), count in seen.items():
+            if tag.first_seen is None:
+                tag.first_seen = now
+            key = tag if combine else (tag, antenna)
+            if key in reads:
+                reads[key][1] += count
+            else:
+                reads[key] = [antenna, count]
+        custom = tag_format.lower() == 'custom' and custom_format
+        rssi_range = _range(self.setting('RSSIFilter'))
+        count_range = _range(count_filter)
+        lines = []
+        for key, (antenna, count) in reads.items():
+            tag = key if combine else key[0]
+            rssi = tag.rssi + (self._random.gauss(0, self.rssi_noise) if self.rssi_noise else 0)
+            if not (_in_range(rssi, rssi_range) and _in_range(count, count_range)):
+                continue
+            fields = {
+                'k': tag.epc.hex().upper(),
+                'i': tag.epc.hex(' ', 2).upper(),
+                'a': str(antenna),
+                'r': str(count),
+                'p': '2',
+                'm': '{:.1f}'.format(rssi),
+                'd': time.strftime('%Y/%m/%d', time.localtime(tag.first_seen)),
+                't': time.strftime('%H:%M:%S', time.localtime(tag.first_seen)),
+                'D': time.strftime('%Y/%m/%d', time.localtime(now)),
+                'T': time.strftime('%H:%M:%S', time.localtime(now)),
+            }
+            if custom:
+                lines.append(_format_custom(custom, fields))
+            else:
+                lines.append('Tag:{i}, Disc:{d} {t}, Last:{D} {T}, Count:{r}, Ant:{a}, Proto:{p}'.format(**fields))
+        return lines
+
+    def _start_auto(self):
+        if self._auto_stop is None:
+            # Each run has its own stop event, so a run still finishing a cycle is not restarted.
+            self._auto_stop = threading.Event()
+            self._auto_trigger.clear()
+            threading.Thread(target=self._auto_mode, args=(self._auto_stop,), daemon=True).start()
+
+    def _stop_auto(self):
+        if self._auto_stop is not None:
+            self._auto_stop.set()
+            self._auto_stop = None
+
+    def _auto_mode(self, stop):
+        stream = None
+        try:
+            while not stop.is_set():
+                if self.setting('AutoStartTrigger').replace(',', ' ').split() not in ([], ['0', '0']):
+                    if not self._auto_trigger.wait(0.05):
+                        continue
+                    self._auto_trigger.clear()
+                    stop.wait(int(self.setting('AutoStartPause')) / 1000.0)
+                with self._lock:
+                    if stop.is_set():
+                        break
+                    lines = self._format_reads(self._inventory(), self.setting('TagStreamFormat'),
+                                               self.setting('TagStreamCustomFormat'),
+                                               self.setting('TagStreamCountFilter'))
+                    streaming = self.setting('TagStreamMode') == 'On'
+                    address = self.setting('TagStreamAddress')
+                    timer = int(self.setting('AutoStopTimer'))
+                    pause = int(self.setting('AutoTruePause' if lines else 'AutoFalsePause'))
+                if streaming and lines:
+                    stream = self._stream(stream, address, lines)
+                stop.wait((timer if timer > 0 else 50) / 1000.0 + pause / 1000.0)
+        finally:
+            if stream is not None:
+                stream.close()
+
+    @staticmethod
+    def _stream(stream, address, lines):
+        # Keep one connection to the TagStreamAddress, reconnecting on the next cycle after a failure.
+        try:
+            if stream is None:
+                host, port = address.rsplit(':', 1)
+                stream = socket.create_connection((host, int(port)), timeout=1)
+            stream.sendall(('\r\n'.join(lines) + '\r\n').encode('UTF-8'))
+            return stream
+        except OSError:
+            if stream is not None:
+                stream.close()
+            return None
+
+    def _singulated(self):
+        for tag, antenna in self._inventory():
+            return tag
+        return None
+
+    def _g2_read(self, args):
+        bank, start, count = (int(arg) for arg in args.split(','))
+        tag = self._singulated()
+        if tag is None:
+            return 'G2Read = No tags found.'
+        data = tag.banks[bank]
+        if (start + count) * 2 > len(data):
+            return 'G2Read = Read error.'
+        return 'G2Read = ' + data[start * 2:(start + count) * 2].hex(' ').upper()
+
+    def _g2_write(self, args):
+        bank, start, data = args.split(',', 2)
+        bank, start, data = int(bank), int(start) * 2, bytes.fromhex(data)
+        tag = self._singulated()
+        if tag is None:
+            return 'G2Write = No tags found.'
+        memory = tag.banks[bank]
+        if start + len(data) > len(memory) or bank in tag.locked:
+            return 'G2Write = Write error.'
+        if tag.fail_writes:
+            tag.fail_writes -= 1
+            return 'G2Write = Write error.'
+        memory[start:start + len(data)] = data
+        return 'G2Write = Success!'
+
+    def _lock_command(self, command):
+        tag = self._singulated()
+        if tag is None:
+            return '{} = No tags found.'.format(command)
+        unlock, bank = _LOCK_COMMANDS[command.lower()]
+        if unlock:
+            tag.locked.discard(bank)
+        else:
+            tag.locked.add(bank)
+        return '{} = Success!'.format(command)
+
+
+# Lock commands, as (unlock, bank locked).  Passwords are both in the reserved bank.
+_LOCK_COMMANDS = {}
+for _field, _bank in (('epc', 1), ('user', 3), ('killpwd', 0), ('accesspwd', 0)):
+    _LOCK_COMMANDS['lock' + _field] = (False, _bank)
+    _LOCK_COMMANDS['unlock' + _field] = (True, _bank)
+
+
+def _format_custom(custom_format, fields):
+    parts = custom_format.split('%')
+    line = [parts[0]]
+    for part in parts[1:]:
+        line.append(fields.get(part[:1], '') + part[1:] if part else '%')
+    return ''.join(line)
+
+
+class _SimulatorTCPHandler(socketserver.StreamRequestHandler):
+    def _write(self, text):
+        self.wfile.write(text.encode('UTF-8') + b'\x00')
+
+    def handle(self):
+        server = self.server.simulator_server
+        if not server._session_lock.acquire(blocking=False):
+            self._write('Alien RFID Reader is busy, try again later.\r\n')
+            return
+        try:
+            self._session(server)
+        finally:
+            server._session_lock.release()
+
+    def _session(self, server):
+        reader = server.reader
+        self._write('*' * 40 + '\r\n* Alien Technology : RFID Reader (simulated)\r\n' + '*' * 40 + '\r\n\r\nUsername>')
+        while True:
+            username = self.rfile.readline()
+            if not username:
+                return
+            self._write('Password>')
+            password = self.rfile.readline()
+            if not password:
+                return
+            if (username.strip().decode('UTF-8', 'replace'), password.strip().decode('UTF-8', 'replace')) == (
+                    server.username, server.password):
+                break
+            self._write('Error: Invalid username and/or password.\r\nUsername>')
+        self._write('\r\nAlien>')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            if server.disconnect_rate and server._random.random() < server.disconnect_rate:
+                return
+            response, delay = reader.execute(line.decode('UTF-8', 'replace').strip())
+            if response is None:
+                continue
+            if delay:
+                time.sleep(delay)
+            self._write(response + '\r\n')
+            if response == 'Goodbye!':
+                return
+
+
+class ReaderSimulatorServer(object):
+    """
+    Serves a SimulatedReader over TCP, with the telnet login of a networked reader, for
+    AlienReaderNetwork, AsyncAlienReaderNetwork, ReaderPool and ReaderFleet.
+
+    Like a reader, only one client is served at a time and others are told to try again later.
+    disconnect_rate injects dropped connections.
+
+    with ReaderSimulatorServer(SimulatedReader(random_tags(100)), port=0) as server:
+        with AlienReaderNetwork(*server.address) as ar:
+            tags = ar.read_tags()
+    """
+
+    def __init__(self, reader, host='127.0.0.1', port=23, username='alien', password='password',
+                 disconnect_rate=0.0, seed=None):
+        """
+        :param reader: SimulatedReader to serve
+        :param host: address to listen on
+        :param port: port to listen on, 0 to have one assigned
+        :param username: login username
+        :param password: login password
+        :param disconnect_rate: chance of closing the connection instead of answering a command
+        :param seed: random seed, for repeatable disconnects
+        """
+        self.reader = reader
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.disconnect_rate = disconnect_rate
+        self._random = random.Random(seed)
+        self._session_lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def address(self):
+        """
+        (host, port) being listened on, port is the one assigned if 0 was requested.
+        """
+        if self._server is None:
+            return self.host, self.port
+        return self._server.server_address[:2]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        """
+        Start serving on a background thread.
+
+        :return: None
+        """
+        if self._server is not None:
+            return
+        self._server = _ThreadingTCPServer((self.host, self.port), _SimulatorTCPHandler)
+        self._server.simulator_server = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop serving.
+
+        :return: None
+        """
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
@@ -0,0 +1,380 @@
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+
+_MAGIC = b'ATEV'
+_VERSION = 1
+# Magic, version, EPC bytes per record, records per index block.
+_HEADER = struct.Struct('<4sHHI')
+# Min and max timestamp of an index block.
+_BLOCK = struct.Struct('<qq')
+_SEGMENT_NAME = re.compile(r'^(\d{8})\.seg$')
+
+# Stored in place of fields a read did not have.
+_NO_READER = 0xFFFF
+_NO_ANTENNA = 0xFF
+_NO_RSSI = -0x8000
+
+
+def _record_struct(epc_size):
+    # Timestamp in usec, reader id, antenna, EPC length, RSSI in 0.01 dB, EPC padded to epc_size.
+    return struct.Struct('<qHBBh{}s'.format(epc_size))
+
+
+def _usec(timestamp):
+    return int(round(timestamp * 1000000))
+
+
+class StoredRead(object):
+    """
+    A tag read from a TagEventStore.
+
+    timestamp is from time.time(), epc is bytes, reader the name the read was stored with, antenna int
+    and rssi float, or None for fields the read did not have.
+    """
+
+    __slots__ = ('timestamp', 'epc', 'reader', 'antenna', 'rssi')
+
+    def __init__(self, timestamp, epc, reader=None, antenna=None, rssi=None):
+        self.timestamp = timestamp
+        self.epc = epc
+        self.reader = reader
+        self.antenna = antenna
+        self.rssi = rssi
+
+    def __eq__(self, other):
+        if not isinstance(other, StoredRead):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return 'StoredRead({:.6f}, {}, reader={!r}, antenna={!r}, rssi={!r})'.format(
+            self.timestamp, self.epc.hex().upper(), self.reader, self.antenna, self.rssi)
+
+
+class _Segment(object):
+    """
+    One segment file of fixed width records, with the min and max timestamp of each block of records.
+    """
+
+    def __init__(self, path, record, index_every):
+        self.path = path
+        self.index_path = path[:-len('.seg')] + '.idx'
+        self.record = record
+        self.index_every = index_every
+        self.count = 0
+        self.blocks = []
+        self._map = None
+
+    def offset(self, number):
+        return _HEADER.size + number * self.record.size
+
+    def add(self, timestamp):
+        # Track the index block of a record just appended, returning the block if now complete.
+        if self.count % self.index_every == 0:
+            self.blocks.append([timestamp, timestamp])
+        else:
+            block = self.blocks[-1]
+            block[0] = min(block[0], timestamp)
+            block[1] = max(block[1], timestamp)
+        self.count += 1
+        return self.blocks[-1] if self.count % self.index_every == 0 else None
+
+    def load(self):
+        # Count whole records, dropping any torn by a crash, and load or rebuild the index.
+        size = os.path.getsize(self.path)
+        self.count = max(size - _HEADER.size, 0) // self.record.size
+        if size > self.offset(self.count):
+            with open(self.path, 'r+b') as f:
+                f.truncate(self.offset(self.count))
+        complete = self.count // self.index_every
+        blocks = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'rb') as f:
+                data = f.read(complete * _BLOCK.size)
+            blocks = [list(block) for block in _BLOCK.iter_unpack(data[:len(data) - len(data) % _BLOCK.size])]
+        with open(self.index_path, 'wb' if not blocks else 'r+b') as f:
+            f.truncate(len(blocks) * _BLOCK.size)
+            f.seek(0, os.SEEK_END)
+            for number in range(len(blocks), complete):
+                block = self._scan(number * self.index_every, (number + 1) * self.index_every)
+                f.write(_BLOCK.pack(*block))
+                blocks.append(block)
+        if self.count > complete * self.index_every:
+            blocks.append(self._scan(complete * self.index_every, self.count))
+        self.blocks = blocks
+
+    def _scan(self, first, end):
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset(first))
+            data = f.read((end - first) * self.record.size)
+        timestamps = [fields[0] for fields in self.record.iter_unpack(data)]
+        return [min(timestamps), max(timestamps)]
+
+    def view(self):
+        # Map the file read only, again if it has grown since last mapped.
+        end = self.offset(self.count)
+        if self._map is None or len(self._map) < end:
+            self.close()
+            with open(self.path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class TagEventStore(object):
+    """
+    Append-only store of every tag read, for audit and replay.
+
+    Reads are fixed width binary records of the timestamp, EPC, reader, antenna and RSSI, appended to
+    segment files in a directory, a new segment started every segment_records records.  Each segment has
+    an index file holding the min and max timestamp of each block of index_every records, so a time range
+    query only reads the blocks that overlap it, from the segment files memory-mapped.  Timestamps need
+    not be in order.  Reader names are stored once, in a readers file, and by number in each record.
+
+    Appends are buffered, flush writes them to the files, and close flushes.  On opening an existing
+    store, a record torn by a crash is dropped and any missing index blocks are rebuilt.
+
+    with TagEventStore('/var/lib/tags') as store:
+        store.extend(ar.read_tag_list())
+        ...
+        for read in store.query(start=time.time() - 3600):
+            ...
+    """
+
+    def __init__(self, path, segment_records=1 << 20, index_every=1024, epc_size=18, sync=False):
+        """
+        :param path: directory of the store, created if missing
+        :param segment_records: records in each segment file
+        :param index_every: records in each index block
+        :param epc_size: longest EPC in bytes, for new stores, existing stores keep their own
+        :param sync: fsync files on each flush
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.segment_records = segment_records
+        self.index_every = index_every
+        self.epc_size = epc_size
+        self.sync = sync
+        self._lock = threading.Lock()
+        self._segments = []
+        self._file = None
+        self._index_file = None
+        self._readers_path = os.path.join(path, 'readers')
+        self._reader_names = []
+        if os.path.exists(self._readers_path):
+            with open(self._readers_path, encoding='UTF-8') as f:
+                self._reader_names = f.read().splitlines()
+        self._reader_ids = {name: number for number, name in enumerate(self._reader_names)}
+        self._readers_file = open(self._readers_path, 'a', encoding='UTF-8')
+        self._open_segments()
+
+    def _open_segments(self):
+        names = sorted(name for name in os.listdir(self.path) if _SEGMENT_NAME.match(name))
+        for name in names:
+            segment_path = os.path.join(self.path, name)
+            with open(segment_path, 'rb') as f:
+                header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                # Crashed before the header was written.
+                os.remove(segment_path)
+                continue
+            magic, version, epc_size, index_every = _HEADER.unpack(header)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError('{} is not a tag event segment.'.format(segment_path))
+            self.epc_size = epc_size
+            self.index_every = index_every
+            segment = _Segment(segment_path, _record_struct(epc_size), index_every)
+            segment.load()
+            self._segments.append(segment)
+        self._record = _record_struct(self.epc_size)
+        if self._segments and self._segments[-1].count < self.segment_records:
+            self._open_writer(self._segments[-1])
+
+    def _open_writer(self, segment):
+        self._file = open(segment.path, 'ab')
+        self._index_file = open(segment.index_path, 'ab')
+
+    def _new_segment(self):
+        self._close_writer()
+        number = int(os.path.basename(self._segments[-1].path)[:8]) + 1 if self._segments else 0
+        segment = _Segment(os.path.join(self.path, '{:08d}.seg'.format(number)), self._record, self.index_every)
+        self._segments.append(segment)
+        self._open_writer(segment)
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, self.epc_size, self.index_every))
+        return segment
+
+    def _close_writer(self):
+        if self._file is not None:
+            self._flush()
+            self._file.close()
+            self._index_file.close()
+            self._file = self._index_file = None
+
+    def __len__(self):
+        return sum(segment.count for segment in self._segments)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _reader_id(self, reader):
+        if reader is None:
+            return _NO_READER
+        name = str(reader)
+        number = self._reader_ids.get(name)
+        if number is None:
+            if '\n' in name or len(self._reader_names) >= _NO_READER:
+                raise ValueError('Cannot store reader {!r}.'.format(name))
+            number = self._reader_ids[name] = len(self._reader_names)
+            self._reader_names.append(name)
+            self._readers_file.write(name + '\n')
+            self._readers_file.flush()
+        return number
+
+    def append(self, read, timestamp=None):
+        """
+        Store one tag read
+
+        :param read: TagRecord, TagEvent, or bytes of EPC
+        :param timestamp: time of the read, default the TagEvent last_seen or time.time()
+        :return: None
+        """
+        self.extend((read,), timestamp)
+
+    def extend(self, reads, timestamp=None):
+        """
+        Store many tag reads
+
+        :param reads: TagRecord, TagEvent, or bytes of EPC
+        :param timestamp: time of the reads, default each TagEvent last_seen or time.time()
+        :return: number of reads stored
+        """
+        now = time.time() if timestamp is None else timestamp
+        stored = 0
+        with self._lock:
+            for read in reads:
+                if isinstance(read, (bytes, bytearray)):
+                    epc, reader, antenna, rssi, when = bytes(read), None, None, None, now
+                else:
+                    epc, reader, antenna, rssi = bytes(read.epc), read.reader, read.antenna, read.rssi
+                    when = getattr(read, 'last_seen', None) if timestamp is None else None
+                    when = now if when is None else when
+                if len(epc) > self.epc_size:
+                    raise ValueError('EPC of {} bytes is longer than {}.'.format(len(epc), self.epc_size))
+                segment = self._segments[-1] if self._file is not None else None
+                if segment is None or segment.count >= self.segment_records:
+                    segment = self._new_segment()
+                usec = _usec(when)
+                self._file.write(self._record.pack(
+                    usec, self._reader_id(reader), _NO_ANTENNA if antenna is None else antenna, len(epc),
+                    _NO_RSSI if rssi is None else int(round(rssi * 100)), epc))
+                block = segment.add(usec)
+                if block is not None:
+                    self._index_file.write(_BLOCK.pack(*block))
+                stored += 1
+        return stored
+
+    def _flush(self):
+        if self._file is not None:
+            self._file.flush()
+            self._index_file.flush()
+            if self.sync:
+                os.fsync(self._file.fileno())
+                os.fsync(self._index_file.fileno())
+
+    def flush(self):
+        """
+        Write reads appended so far to the files.
+
+        :return: None
+        """
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """
+        Flush and close the store.
+
+        :return: None
+        """
+        with self._lock:
+            self._close_writer()
+            for segment in self._segments:
+                segment.close()
+            self._readers_file.close()
+
+    def query(self, start=None, end=None, epc=None, reader=None, antenna=None):
+        """
+        Stored reads, in the order stored
+
+        :param start: earliest time, from time.time(), None for no limit
+        :param end: time after the last read wanted, None for no limit
+        :param epc: bytes of EPC to match, None for every tag
+        :param reader: reader name to match, None for every reader
+        :param antenna: antenna number to match, None for every antenna
+        :return: generator of StoredRead
+        """
+        first = None if start is None else _usec(start)
+        last = None if end is None else _usec(end)
+        epc = None if epc is None else bytes(epc)
+        if reader is not None:
+            reader = self._reader_ids.get(str(reader))
+            if reader is None:
+                return
+        with self._lock:
+            self._flush()
+            segments = [(segment, segment.count, [list(block) for block in segment.blocks])
+                        for segment in self._segments]
+        for segment, count, blocks in segments:
+            for number, (low, high) in enumerate(blocks):
+                if (last is not None and low >= last) or (first is not None and high < first):
+                    continue
+                begin = number * segment.index_every
+                with self._lock:
+                    # Copied out, so the map can be replaced while reads of the block are yielded.
+                    data = segment.view()[segment.offset(begin):segment.offset(min(begin + segment.index_every,
+                                                                                   count))]
+                for usec, reader_id, antenna_number, length, rssi, epc_data in segment.record.iter_unpack(data):
+                    if (first is not None and usec < first) or (last is not None and usec >= last):
+                        continue
+                    if (reader is not None and reader_id != reader) or (
+                            antenna is not None and antenna_number != antenna):
+                        continue
+                    epc_data = epc_data[:length]
+                    if epc is not None and epc_data != epc:
+                        continue
+                    yield StoredRead(
+                        usec / 1000000.0, epc_data,
+                        None if reader_id == _NO_READER else self._reader_names[reader_id],
+                        None if antenna_number == _NO_ANTENNA else antenna_number,
+                        None if rssi == _NO_RSSI else rssi / 100.0)
+
+    def replay(self, start=None, end=None, speed=1.0, **filters):
+        """
+        Stored reads, in the order stored, delivered with the time between them as when read
+
+        :param start: earliest time, from time.time(), None for no limit
+        :param end: time after the last read wanted, None for no limit
+        :param speed: multiple of the original pace, None for no delay
+        :param filters: epc, reader and antenna, as for query
+        :return: generator of StoredRead
+        """
+        began = None
+        for read in self.query(start, end, **filters):
+            if speed:
+                if began is None:
+                    began = (read.timestamp, time.monotonic())
+                delay = (read.timestamp - began[0]) / speed - (time.monotonic() - began[1])
+                if delay > 0:
+                    time.sleep(delay)
+            yield read
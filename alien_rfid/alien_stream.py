@@ -0,0 +1,216 @@
+import asyncio
+import queue
+import socketserver
+import threading
+import time
+from .alien_taglist import TEXT_TAG_LIST
+
+
+class _StreamTCPHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        listener = self.server.listener
+        reader = self.client_address[0]
+        for line in self.rfile:
+            listener._receive_line(line, reader)
+
+
+class _StreamUDPHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        listener = self.server.listener
+        reader = self.client_address[0]
+        for line in self.request[0].splitlines():
+            listener._receive_line(line, reader)
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class _ThreadingUDPServer(socketserver.ThreadingUDPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class TagStreamListener(object):
+    """
+    Server receiving tags pushed by Alien RFID readers in TagStreamMode.
+
+    Any number of readers may stream to the same listener, each connection is handled on its own thread
+    and the parsed TagRecords, with reader set to the address of the sending reader, are queued to be
+    consumed by iterating over the listener.
+
+    with TagStreamListener(port=4000) as listener:
+        listener.configure(ar, '10.0.0.50')
+        for tag in listener:
+            ...
+
+    Iterating with async for is also supported, for use with AsyncAlienReaderNetwork.
+
+    For a Custom TagStreamFormat, pass a CustomTagListParser as parser.
+    """
+
+    def __init__(self, host='0.0.0.0', port=4000, protocol='tcp', max_queued=0, parser=TEXT_TAG_LIST):
+        if protocol not in ('tcp', 'udp'):
+            raise ValueError("protocol must be 'tcp' or 'udp'.")
+        self.host = host
+        self.port = port
+        self.protocol = protocol
+        self.parser = parser
+        self.records = queue.Queue(max_queued)
+        # Lines that could not be parsed, skipped without dropping the connection.
+        self.parse_errors = 0
+        self._server = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._started = False
+
+    @property
+    def running(self):
+        return self._server is not None
+
+    @property
+    def address(self):
+        """
+        (host, port) being listened on, port is the one assigned if 0 was requested.
+        """
+        if self._server is None:
+            return self.host, self.port
+        return self._server.server_address[:2]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        """
+        Start listening for streamed tags on a background thread.
+
+        :return: None
+        """
+        if self._server is not None:
+            return
+        # A new event, so handler threads left from before a restart still see their listener stopped.
+        self._stopped = threading.Event()
+        self._started = True
+        if self.protocol == 'tcp':
+            self._server = _ThreadingTCPServer((self.host, self.port), _StreamTCPHandler)
+        else:
+            self._server = _ThreadingUDPServer((self.host, self.port), _StreamUDPHandler)
+        self._server.listener = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop listening.  Iteration ends once tags already queued are consumed.
+
+        :return: None
+        """
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+        # Not a marker in the queue, which could block on a full queue and outlive a restart.
+        self._stopped.set()
+
+    def _receive_line(self, line, reader):
+        line = line.strip(b'\x00\r\n ').decode('UTF-8', 'replace')
+        if not line or line[0] == '#':
+            # Blank keep alive or StreamHeader line
+            return
+        try:
+            record = self.parser.parse_line(line)
+        except Exception:
+            self.parse_errors += 1
+            return
+        if record is None:
+            return
+        record.reader = reader
+        stopped = self._stopped
+        # Wait for room in a full queue, but not once stopped, so handler threads are not left blocked.
+        while not stopped.is_set():
+            try:
+                self.records.put(record, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def configure(self, reader, address):
+        """
+        Set reader to stream tags to this listener, in the format of parser
+
+        :param reader: connected _AlienReader
+        :param address: host name or ip address of this listener, as reachable from the reader
+        :return: None
+        """
+        commands = ['TagStreamFormat={}'.format(self.parser.tag_list_format)]
+        if self.parser.custom_format:
+            commands.append('TagStreamCustomFormat={}'.format(self.parser.custom_format))
+        commands += ['TagStreamAddress={}:{}'.format(address, self.address[1]), 'TagStreamMode=On']
+        for command in commands:
+            result = reader.send_receive(command)
+            if 'Error' in result:
+                raise Exception('Could not configure TagStream: {}'.format(result))
+
+    @staticmethod
+    def unconfigure(reader):
+        """
+        Stop reader from streaming tags.
+
+        :param reader: connected _AlienReader
+        :return: None
+        """
+        reader.send_receive('TagStreamMode=Off')
+
+    def get(self, timeout=None):
+        """
+        Get next streamed tag, raising if the listener was never started
+
+        :param timeout: seconds to wait, None waits until a tag is received
+        :return: TagRecord, or None if timed out or listener stopped
+        """
+        return self._next_record(timeout) or None
+
+    def _next_record(self, timeout=None):
+        # Record, None once stopped and every queued record is consumed, or False if timed out.
+        if not self._started:
+            # Nothing could ever arrive, so waiting would never end.
+            raise Exception('TagStreamListener is not started.')
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            stopped = self._stopped.is_set()
+            try:
+                if stopped:
+                    return self.records.get_nowait()
+                # Short waits, so a stop is noticed by a consumer waiting on an empty queue.
+                return self.records.get(timeout=0.1 if deadline is None else
+                                        min(max(deadline - time.monotonic(), 0), 0.1))
+            except queue.Empty:
+                if stopped:
+                    return None
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+
+    def __iter__(self):
+        while True:
+            record = self._next_record()
+            if record is None:
+                return
+            yield record
+
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Short waits, so an executor thread is not held forever by a listener that is never stopped.
+            record = await loop.run_in_executor(None, self._next_record, 0.2)
+            if record is None:
+                return
+            if record is not False:
+                yield record
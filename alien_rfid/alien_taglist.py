@@ -0,0 +1,304 @@
+import re
+from binascii import unhexlify
+
+
+class TagRecord(object):
+    """
+    A single tag read from a TagList, TagStream or notification.
+
+    epc is bytes, antenna, count and protocol are int, rssi is float, disc and last are the text times
+    as given by the reader.  Fields not reported in the format used are None.  reader is set by
+    whatever received the record, to attribute it to a reader.
+    """
+
+    __slots__ = ('epc', 'disc', 'last', 'count', 'antenna', 'protocol', 'rssi', 'reader')
+
+    def __init__(self, epc, disc=None, last=None, count=None, antenna=None, protocol=None, rssi=None,
+                 reader=None):
+        self.epc = epc
+        self.disc = disc
+        self.last = last
+        self.count = count
+        self.antenna = antenna
+        self.protocol = protocol
+        self.rssi = rssi
+        self.reader = reader
+
+    def __eq__(self, other):
+        if not isinstance(other, TagRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ', '.join('{}={!r}'.format(name, getattr(self, name)) for name in self.__slots__[1:]
+                           if getattr(self, name) is not None)
+        return 'TagRecord({}{})'.format(self.epc.hex().upper(), ', ' + fields if fields else '')
+
+
+# Text format label to TagRecord attribute and conversion.
+_TEXT_FIELDS = {
+    'Disc': ('disc', str),
+    'Last': ('last', str),
+    'Count': ('count', int),
+    'Ant': ('antenna', int),
+    'Proto': ('protocol', int),
+    'Rssi': ('rssi', float),
+    'RSSI': ('rssi', float),
+}
+
+
+def parse_tag_line(line):
+    """
+    Parse a single Text format tag line, such as:
+
+    Tag:E200 3411 B802 0115 1612 0837, Disc:2017/06/02 10:00:00, Last:2017/06/02 10:00:01, Count:4, Ant:0, Proto:2
+
+    :param line: str line from reader
+    :return: TagRecord, or None if line is not a tag line
+    """
+    if not line.startswith('Tag:'):
+        return None
+    fields = line.split(', ')
+    record = TagRecord(bytes.fromhex(fields[0][4:]))
+    for field in fields[1:]:
+        label, _, value = field.partition(':')
+        converter = _TEXT_FIELDS.get(label)
+        if converter is not None:
+            setattr(record, converter[0], converter[1](value.strip()))
+    return record
+
+
+class TextTagListParser(object):
+    """
+    Parser for TagLists in the Text TagListFormat, the reader default.
+
+    Lines in the default field order are matched in a single regular expression pass over the whole
+    TagList, lines with other fields, such as Rssi, fall back to parse_tag_line.
+    """
+
+    # Not anchored with re.M, which is considerably slower; the Text format has no other 'Tag:' text.
+    _DEFAULT_LINE = re.compile(r'Tag:([0-9A-Fa-f ]*), Disc:([^,\r\n]*), Last:([^,\r\n]*), '
+                               r'Count:(\d+), Ant:(\d+), Proto:(\d+)(?![^\r\n])')
+    _EPC = re.compile(r'Tag:([^,\r\n]*)')
+
+    tag_list_format = 'Text'
+    custom_format = None
+
+    @staticmethod
+    def parse_line(line):
+        return parse_tag_line(line)
+
+    def parse(self, text):
+        """
+        Parse TagList text
+
+        :param text: response to 't' command
+        :return: list of TagRecord
+        """
+        fromhex = bytes.fromhex
+        records = [TagRecord(fromhex(epc), disc, last, int(count), int(antenna), int(protocol))
+                   for epc, disc, last, count, antenna, protocol in self._DEFAULT_LINE.findall(text)]
+        if len(records) != text.count('Tag:'):
+            records = [record for record in map(parse_tag_line, text.splitlines()) if record is not None]
+        return records
+
+    def epcs(self, text):
+        """
+        Parse only the EPC of each tag from TagList text
+
+        :param text: response to 't' command
+        :return: list of EPC bytearray
+        """
+        return list(map(bytearray.fromhex, self._EPC.findall(text)))
+
+    def parse_bytes(self, data):
+        return self.parse(data.decode('UTF-8'))
+
+    def epcs_bytes(self, data):
+        return self.epcs(data.decode('UTF-8'))
+
+
+def _fromhex_spaced(value):
+    return bytes.fromhex(value.decode('ascii') if isinstance(value, bytes) else value)
+
+
+def _text(value):
+    return value.decode('UTF-8') if isinstance(value, bytes) else value
+
+
+# TagListCustomFormat token to TagRecord attribute, pattern and conversion.  Date and time tokens are
+# joined into the one disc or last attribute.  Conversions accept str or bytes, so the same table
+# serves parsing the decoded text and the raw bytes received.
+_CUSTOM_TOKENS = {
+    'k': ('epc', r'[0-9A-Fa-f]*', unhexlify),
+    'i': ('epc', r'[0-9A-Fa-f ]*?', _fromhex_spaced),
+    'a': ('antenna', r'\d+', int),
+    'r': ('count', r'\d+', int),
+    'p': ('protocol', r'\d+', int),
+    'm': ('rssi', r'-?\d+(?:\.\d+)?', float),
+    'd': ('disc', r'\d{4}/\d{2}/\d{2}', _text),
+    't': ('disc', r'\d{2}:\d{2}:\d{2}(?:\.\d+)?', _text),
+    'D': ('last', r'\d{4}/\d{2}/\d{2}', _text),
+    'T': ('last', r'\d{2}:\d{2}:\d{2}(?:\.\d+)?', _text),
+}
+
+
+class CustomTagListParser(object):
+    """
+    Parser for TagLists in the Custom TagListFormat.
+
+    The TagListCustomFormat string is compiled once into a regular expression, so any separators and
+    labels between the % tokens are supported.  Supported tokens are %k and %i for the tag ID, %a
+    antenna, %r read count, %p protocol, %m RSSI, %d and %t discovery date and time, %D and %T last
+    seen date and time.  Other tokens are matched but not kept.
+    """
+
+    tag_list_format = 'Custom'
+
+    def __init__(self, custom_format):
+        self.custom_format = custom_format
+        pattern = []
+        self._fields = []
+        for index, part in enumerate(re.split(r'%(.)', custom_format)):
+            if index % 2 == 0:
+                pattern.append(re.escape(part))
+            elif part in _CUSTOM_TOKENS:
+                attribute, token_pattern, converter = _CUSTOM_TOKENS[part]
+                pattern.append('(' + token_pattern + ')')
+                self._fields.append((attribute, converter))
+            else:
+                pattern.append('.*?')
+        if not any(attribute == 'epc' for attribute, converter in self._fields):
+            raise ValueError('Custom format must contain %k or %i for the tag ID.')
+        pattern = ''.join(pattern)
+        self._line = re.compile('^' + pattern + r'\r?$', re.M)
+        self._line_bytes = re.compile(('^' + pattern + r'\r?$').encode('UTF-8'), re.M)
+        self._epc_index = [attribute for attribute, converter in self._fields].index('epc')
+        self._epc_converter = self._fields[self._epc_index][1]
+        self._joined = {attribute for attribute, converter in self._fields if converter is _text}
+
+    def _record(self, values):
+        record = TagRecord(None)
+        for (attribute, converter), value in zip(self._fields, values):
+            value = converter(value)
+            if attribute in self._joined and getattr(record, attribute) is not None:
+                value = getattr(record, attribute) + ' ' + value
+            setattr(record, attribute, value)
+        return record
+
+    def parse_line(self, line):
+        """
+        Parse a single tag line
+
+        :param line: str line from reader
+        :return: TagRecord, or None if line does not match the custom format
+        """
+        match = self._line.match(line.strip())
+        if match is None:
+            return None
+        return self._record(match.groups())
+
+    def parse(self, text):
+        """
+        Parse TagList text
+
+        :param text: response to 't' command
+        :return: list of TagRecord
+        """
+        if len(self._fields) == 1:
+            return [self._record((values,)) for values in self._line.findall(text)]
+        return [self._record(values) for values in self._line.findall(text)]
+
+    def epcs(self, text):
+        """
+        Parse only the EPC of each tag from TagList text
+
+        :param text: response to 't' command
+        :return: list of EPC bytearray
+        """
+        return self._epcs(self._line.findall(text))
+
+    def _epcs(self, matches):
+        converter = self._epc_converter
+        if len(self._fields) == 1:
+            return [bytearray(converter(values)) for values in matches]
+        index = self._epc_index
+        return [bytearray(converter(values[index])) for values in matches]
+
+    def parse_bytes(self, data):
+        """
+        Parse TagList bytes as received, without decoding them to text first
+
+        :param data: raw response to 't' command
+        :return: list of TagRecord
+        """
+        if len(self._fields) == 1:
+            return [self._record((values,)) for values in self._line_bytes.findall(data)]
+        return [self._record(values) for values in self._line_bytes.findall(data)]
+
+    def epcs_bytes(self, data):
+        """
+        Parse only the EPC of each tag from TagList bytes as received
+
+        :param data: raw response to 't' command
+        :return: list of EPC bytearray
+        """
+        return self._epcs(self._line_bytes.findall(data))
+
+
+class CompactTagListParser(CustomTagListParser):
+    """
+    Decoder for the label free COMPACT_TAG_LIST_FORMATS.
+
+    Builds each TagRecord directly from the fields of the raw bytes received, skipping the general field
+    mapping of CustomTagListParser.  EPCs alone are found as the first field of each line, without
+    matching the rest of it.
+    """
+
+    _EPC = re.compile(r'^([0-9A-Fa-f]+),', re.M)
+
+    def __init__(self, custom_format):
+        if custom_format not in COMPACT_TAG_LIST_FORMATS:
+            raise ValueError('Not a compact TagListCustomFormat: {}'.format(custom_format))
+        super().__init__(custom_format)
+        self._rssi = custom_format.endswith('%m')
+
+    def parse_bytes(self, data):
+        if self._rssi:
+            return [TagRecord(unhexlify(epc), None, None, int(count), int(antenna), None, float(rssi))
+                    for epc, antenna, count, rssi in self._line_bytes.findall(data)]
+        return [TagRecord(unhexlify(epc), None, None, int(count), int(antenna))
+                for epc, antenna, count in self._line_bytes.findall(data)]
+
+    def epcs(self, text):
+        return list(map(bytearray.fromhex, self._EPC.findall(text)))
+
+    def epcs_bytes(self, data):
+        # Decoding first is faster than unhexlify of each bytes match.
+        return self.epcs(data.decode('UTF-8'))
+
+
+TEXT_TAG_LIST = TextTagListParser()
+
+# Custom formats without labels, tried in order when negotiating a compact TagList.  Each keeps the
+# antenna and read count, the first adds RSSI, which older firmware does not report.
+COMPACT_TAG_LIST_FORMATS = ('%k,%a,%r,%m', '%k,%a,%r')
+
+
+def tag_list_parser(tag_list_format='Text', custom_format=None):
+    """
+    Parser for a TagListFormat
+
+    :param tag_list_format: Text or Custom
+    :param custom_format: TagListCustomFormat, when tag_list_format is Custom
+    :return: TextTagListParser, CustomTagListParser or CompactTagListParser
+    """
+    if tag_list_format.lower() == 'text':
+        return TEXT_TAG_LIST
+    if tag_list_format.lower() == 'custom':
+        if not custom_format:
+            raise ValueError('custom_format is required for Custom TagListFormat.')
+        if custom_format in COMPACT_TAG_LIST_FORMATS:
+            return CompactTagListParser(custom_format)
+        return CustomTagListParser(custom_format)
+    raise ValueError('Supported TagListFormat is Text or Custom.')
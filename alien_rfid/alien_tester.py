@@ -403,9 +403,10 @@ class AlienReaderTester(_AlienReader):
 
     def _connect(self):
         try:
-            s = self.receive()
-            if b'Alien>' not in s:
+            s = self.send_receive('')
+            if 'Alien>' not in s:
                 raise Exception('Did not received expected prompt after connecting.')
+            self._connected = True
             return True
         except RuntimeError as e:
             raise e
@@ -413,14 +414,20 @@ class AlienReaderTester(_AlienReader):
     def _byte_read(self):
         return self.io.read()
 
+    def _chunk_read(self):
+        # Take everything already received when the interface reports it, as a serial port does.
+        return self.io.read(getattr(self.io, 'in_waiting', 0) or 1)
+
     def _send(self, msg_bytes):
         self.io.write(msg_bytes)
 
     def close(self, send_quit=True):
         if self.io:
-            try:
-                self.io.send(b"quit\r\n")
-                time.sleep(0.1)
-            except:
-                pass
+            if send_quit:
+                try:
+                    self.io.write(b"quit\r\n")
+                    time.sleep(0.1)
+                except:
+                    pass
             self.io.close()
+        self._connected = False
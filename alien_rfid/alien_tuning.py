@@ -0,0 +1,179 @@
+import collections
+import math
+import time
+
+from .alien_settings import ReaderSettings
+
+
+class AcquisitionTuner(object):
+    """
+    Adaptive Gen2 acquisition, retuning AcqG2Q, AcqG2QMax, AcqG2Count, AcqG2Cycles and AcqG2Session
+    between inventories to read the most unique tags per second from the population in the field.
+
+    Q sets the 2**Q slots of each Gen2 frame.  Too few slots for the population and tags collide, too
+    many and the frame is mostly empty, so Q is hill climbed on the unique tags read per second, trying
+    each neighbouring Q and moving to the best.  The reader cannot tell an empty field from one so
+    crowded that every slot collides, so an inventory reading nothing raises Q by two until max_q, then
+    starts again from the first Q.  Q is kept no more than two below log2 of the population, the tags
+    read in the last window inventories, so a crowd found is not lost again to collisions.
+
+    Once Q has settled, rounds, AcqG2Count repeated up to max_count times per AcqG2Cycles, are added
+    while an inventory reads less than coverage of the population, and taken away again after window
+    inventories reading all of it.  Populations of session_threshold tags or more use session 1, where
+    tags read stay quiet for the rest of the inventory and leave the slots to the others, smaller ones
+    session 0, where every tag is read in every round.  A change of rounds or session, or a doubling or
+    halving of the population, starts the search for Q again.  Settings are only sent when they change.
+
+    tuner = AcquisitionTuner(ar)
+    while True:
+        tags = tuner.read()
+    """
+
+    def __init__(self, reader, min_q=0, max_q=15, max_rounds=8, max_count=4, coverage=0.95, window=5,
+                 session=None, session_threshold=16, q_headroom=2, smoothing=0.5):
+        """
+        :param reader: connected _AlienReader
+        :param min_q: smallest AcqG2Q
+        :param max_q: largest AcqG2Q
+        :param max_rounds: most rounds of each inventory, AcqG2Count times AcqG2Cycles
+        :param max_count: most AcqG2Count, further rounds are added as AcqG2Cycles
+        :param coverage: fraction of the population an inventory must read before rounds are taken away
+        :param window: inventories the population is counted over
+        :param session: AcqG2Session to use, None to choose from the population
+        :param session_threshold: population from which session 1 is used instead of 0
+        :param q_headroom: AcqG2QMax above AcqG2Q
+        :param smoothing: weight of the latest inventory in the smoothed rate of a Q, 0 to 1
+        """
+        if not 0 <= min_q <= max_q <= 15:
+            raise ValueError('Q must be from 0 to 15, min_q not above max_q.')
+        self.reader = reader
+        self.min_q = min_q
+        self.max_q = max_q
+        self.max_rounds = max_rounds
+        self.max_count = max_count
+        self.coverage = coverage
+        self.window = window
+        self.fixed_session = session
+        self.session_threshold = session_threshold
+        self.q_headroom = q_headroom
+        self.smoothing = smoothing
+        self.q = None
+        self.rounds = None
+        self.session = session
+        self.stats = None
+        self._start_q = None
+        self._rates = {}
+        self._direction = 1
+        self._rated_population = 0
+        self._full = 0
+        self._recent = collections.deque(maxlen=window)
+
+    def _load(self):
+        values = ReaderSettings(self.reader).get_all(['AcqG2Q', 'AcqG2Count', 'AcqG2Cycles', 'AcqG2Session'])
+        self.q = self._start_q = min(max(values.get('AcqG2Q', 3), self.min_q), self.max_q)
+        self.rounds = min(values.get('AcqG2Count', 1) * values.get('AcqG2Cycles', 1), self.max_rounds)
+        if self.session is None:
+            self.session = values.get('AcqG2Session', 1)
+
+    def settings(self):
+        """
+        Acquisition settings for the next inventory
+
+        :return: dict of setting name to value
+        """
+        if self.q is None:
+            self._load()
+        count = min(self.rounds, self.max_count)
+        return {
+            'AcqG2Q': self.q,
+            'AcqG2QMax': min(self.q + self.q_headroom, 15),
+            'AcqG2Count': count,
+            'AcqG2Cycles': -(-self.rounds // count),
+            'AcqG2Session': self.session,
+        }
+
+    def read(self, retry_count=0):
+        """
+        Run one inventory with the current settings, then retune them
+
+        :param retry_count: retries after '(No Tags)'
+        :return: list of TagRecord
+        """
+        ReaderSettings(self.reader).apply(self.settings())
+        start = time.monotonic()
+        records = self.reader.read_tag_list(retry_count)
+        self.update(records, time.monotonic() - start)
+        return records
+
+    def update(self, records, seconds):
+        """
+        Retune from the tags read by one inventory with the current settings
+
+        :param records: TagRecord read
+        :param seconds: time the inventory took
+        :return: None
+        """
+        if self.q is None:
+            self._load()
+        epcs = set(bytes(record.epc) for record in records)
+        self._recent.append(epcs)
+        population = len(set().union(*self._recent))
+        unique = len(epcs)
+        rate = unique / seconds if seconds > 0 else 0.0
+        self.stats = {'unique': unique, 'population': population, 'seconds': seconds, 'rate': rate}
+        if not unique:
+            self._empty()
+            return
+        if population >= 2 * self._rated_population or 2 * population <= self._rated_population:
+            self._rates.clear()
+            self._rated_population = population
+        previous = self._rates.get(self.q)
+        self._rates[self.q] = rate if previous is None else (
+            self.smoothing * rate + (1 - self.smoothing) * previous)
+        if self.fixed_session is None:
+            session = 1 if population >= self.session_threshold else 0
+            if session != self.session:
+                self.session = session
+                self._rates.clear()
+                return
+        floor = min(max(int(math.log2(population)) - 2, self.min_q), self.max_q)
+        q = max(self._climb(), floor)
+        if q != self.q:
+            self.q = q
+        elif self._retune(unique, population):
+            # Q has settled, but for other rounds.
+            self._rates.clear()
+
+    def _empty(self):
+        if self.q < self.max_q:
+            self.q = min(self.q + 2, self.max_q)
+        else:
+            self.q = self._start_q
+            self._rates.clear()
+
+    def _climb(self):
+        # Step towards the best Q measured, or try a neighbour of the best not measured yet.
+        best = max(self._rates, key=self._rates.get)
+        if best != self.q:
+            return self.q + (1 if best > self.q else -1)
+        for step in (self._direction, -self._direction):
+            neighbour = self.q + step
+            if self.min_q <= neighbour <= self.max_q and neighbour not in self._rates:
+                self._direction = step
+                return neighbour
+        return self.q
+
+    def _retune(self, unique, population):
+        # Add rounds while tags are missed, and take one away after window inventories reading all.
+        rounds = self.rounds
+        if unique < self.coverage * population:
+            self._full = 0
+            rounds = min(rounds + 1, self.max_rounds)
+        else:
+            self._full += 1
+            if self._full >= self.window and rounds > 1:
+                self._full = 0
+                rounds -= 1
+        changed = rounds != self.rounds
+        self.rounds = rounds
+        return changed
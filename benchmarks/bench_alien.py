@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+bench_alien
+----------------------------------
+
+Benchmarks of the protocol hot paths, run against the simulated reader:
+
+  framing      FrameBuffer and _receive_bytes throughput over pipelined responses
+  taglist      parse cost per tag of the epcs_bytes and parse_bytes used by read_tags and read_tag_list,
+               on TagList bytes in the Text and compact Custom formats, without the round trip
+  g2           g2_read and g2_write round trip latency over TCP
+  connect      connect and login time over TCP
+  fanout       ReaderFleet.read_tags time against 1 to 8 readers with simulated latency
+
+Results are saved as JSON.  Given a baseline of earlier results, any benchmark more than the
+threshold slower fails the run, so regressions are caught before release.  The TCP benchmarks vary
+more from run to run than the others, so compare results from the same, otherwise idle, machine.
+
+    python benchmarks/bench_alien.py --output benchmarks/results/latest.json
+    python benchmarks/bench_alien.py --baseline benchmarks/results/baseline.json --threshold 0.3
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from alien_rfid import AlienReaderNetwork, AlienReaderTester, ReaderFleet  # noqa: E402
+from alien_rfid.alien_framing import FrameBuffer  # noqa: E402
+from alien_rfid.alien_simulator import ReaderSimulatorServer, SimulatedReader, SimulatedTag, random_tags  # noqa: E402
+from alien_rfid.alien_taglist import COMPACT_TAG_LIST_FORMATS, TEXT_TAG_LIST, tag_list_parser  # noqa: E402
+
+
+def _timings(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)
+
+
+def _summary(timings, unit_count=1, unit='op'):
+    # Times in microseconds per unit, so results of different sizes compare directly.
+    per_unit = [timing / unit_count * 1e6 for timing in timings]
+    return {
+        'unit': 'us/' + unit,
+        'min': round(per_unit[0], 3),
+        'median': round(per_unit[len(per_unit) // 2], 3),
+        'p99': round(per_unit[min(int(len(per_unit) * 0.99), len(per_unit) - 1)], 3),
+        'samples': len(per_unit),
+    }
+
+
+class _ReplayIO(object):
+    """
+    Serial-like interface returning the same received data on each read, in chunks.
+    """
+
+    def __init__(self, data, chunk_size):
+        self.data = data
+        self.chunk_size = chunk_size
+        self.position = 0
+
+    def write(self, msg_bytes):
+        pass
+
+    def read(self, size=1):
+        if self.position >= len(self.data):
+            self.position = 0
+        chunk = self.data[self.position:self.position + self.chunk_size]
+        self.position += len(chunk)
+        return chunk
+
+
+def bench_framing(repeat):
+    frame = b'RFLevel = 200\r\n'
+    frames = 10000
+    stream = (frame + b'\x00') * frames
+    results = {}
+    for chunk_size in (64, 4096):
+        def frame_buffer():
+            buffer = FrameBuffer()
+            for start in range(0, len(stream), chunk_size):
+                buffer.feed(stream[start:start + chunk_size])
+                while buffer.next_frame() is not None:
+                    pass
+        results['frame_buffer_chunk_{}'.format(chunk_size)] = _summary(_timings(frame_buffer, repeat), frames,
+                                                                       'frame')
+    reader = AlienReaderTester(_ReplayIO(stream, 4096))
+
+    def receive_bytes():
+        for _ in range(frames):
+            reader._receive_bytes()
+    results['receive_bytes'] = _summary(_timings(receive_bytes, repeat), frames, 'frame')
+    return results
+
+
+def bench_taglist(repeat):
+    count = 1000
+    sim = SimulatedReader(random_tags(count, seed=1), seed=1)
+    text = sim.execute('t')[0].encode('UTF-8')
+    sim.execute('TagListFormat=Custom')
+    sim.execute('TagListCustomFormat={}'.format(COMPACT_TAG_LIST_FORMATS[0]))
+    compact = sim.execute('t')[0].encode('UTF-8')
+    # The parser use_compact_tag_list sets, so the compact fast paths are the ones timed.
+    compact_parser = tag_list_parser('Custom', COMPACT_TAG_LIST_FORMATS[0])
+    return {
+        'epcs_text': _summary(_timings(lambda: TEXT_TAG_LIST.epcs_bytes(text), repeat), count, 'tag'),
+        'records_text': _summary(_timings(lambda: TEXT_TAG_LIST.parse_bytes(text), repeat), count, 'tag'),
+        'epcs_compact': _summary(_timings(lambda: compact_parser.epcs_bytes(compact), repeat), count, 'tag'),
+        'records_compact': _summary(_timings(lambda: compact_parser.parse_bytes(compact), repeat), count, 'tag'),
+    }
+
+
+def bench_g2(repeat):
+    sim = SimulatedReader([SimulatedTag(bytes(12))])
+    with ReaderSimulatorServer(sim, port=0) as server:
+        with AlienReaderNetwork(*server.address) as reader:
+            return {
+                'g2_read_8_words': _summary(_timings(lambda: reader.g2_read(3, 0, 8), repeat * 20)),
+                'g2_write_8_words': _summary(_timings(lambda: reader.g2_write(3, 0, bytes(16)), repeat * 20)),
+            }
+
+
+def bench_connect(repeat):
+    with ReaderSimulatorServer(SimulatedReader(), port=0) as server:
+        def connect():
+            reader = AlienReaderNetwork(*server.address)
+            reader.open()
+            reader.close(False)
+        return {'connect_login': _summary(_timings(connect, repeat * 5))}
+
+
+def bench_fanout(repeat, latency=0.005):
+    results = {}
+    servers = [ReaderSimulatorServer(SimulatedReader(random_tags(100, seed=index), latency=latency), port=0)
+               for index in range(8)]
+    for server in servers:
+        server.start()
+    try:
+        for size in (1, 2, 4, 8):
+            fleet = ReaderFleet()
+            for index, server in enumerate(servers[:size]):
+                fleet.add(AlienReaderNetwork(*server.address), name='reader{}'.format(index))
+            with fleet:
+                results['fleet_read_tags_{}'.format(size)] = _summary(_timings(fleet.read_tags, repeat), 1,
+                                                                      'cycle')
+    finally:
+        for server in servers:
+            server.stop()
+    single = results['fleet_read_tags_1']['median']
+    for size in (2, 4, 8):
+        # 1.0 is perfect scaling, where a cycle of any number of readers takes as long as one.
+        results['fleet_read_tags_{}'.format(size)]['efficiency'] = round(
+            single / results['fleet_read_tags_{}'.format(size)]['median'], 3)
+    return results
+
+
+BENCHMARKS = {
+    'framing': bench_framing,
+    'taglist': bench_taglist,
+    'g2': bench_g2,
+    'connect': bench_connect,
+    'fanout': bench_fanout,
+}
+
+
+def compare(results, baseline, threshold):
+    """
+    Benchmarks slower than baseline by more than threshold, comparing the fastest sample, which is
+    least affected by other load on the machine
+
+    :param results: results of this run
+    :param baseline: earlier results
+    :param threshold: allowed fraction slower, such as 0.2
+    :return: list of (name, baseline min, min)
+    """
+    regressions = []
+    for group, benchmarks in results['benchmarks'].items():
+        for name, result in benchmarks.items():
+            before = baseline.get('benchmarks', {}).get(group, {}).get(name)
+            if before and result['min'] > before['min'] * (1 + threshold):
+                regressions.append(('{}.{}'.format(group, name), before['min'], result['min']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark alien_rfid protocol hot paths.')
+    parser.add_argument('benchmarks', nargs='*',
+                        help='benchmarks to run, default all of: ' + ', '.join(sorted(BENCHMARKS)))
+    parser.add_argument('--repeat', type=int, default=20, help='samples of each benchmark')
+    parser.add_argument('--output', help='file to save JSON results to')
+    parser.add_argument('--baseline', help='JSON results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.3, help='fraction slower than baseline that fails')
+    args = parser.parse_args(argv)
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error('unknown benchmark {}'.format(name))
+
+    results = {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'benchmarks': {},
+    }
+    for name in args.benchmarks or sorted(BENCHMARKS):
+        results['benchmarks'][name] = BENCHMARKS[name](args.repeat)
+        for benchmark, result in sorted(results['benchmarks'][name].items()):
+            print('{:<40} {:>12.3f} {}'.format(name + '.' + benchmark, result['median'], result['unit']))
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(results, json.load(baseline), args.threshold)
+        for name, before, after in regressions:
+            print('REGRESSION {}: {:.3f} -> {:.3f}'.format(name, before, after))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
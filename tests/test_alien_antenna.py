@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_antenna
+----------------------------------
+
+Tests for `alien_antenna` module.
+"""
+
+from alien_rfid import AlienReaderTester, AntennaSchedule, SimulatedReader, SimulatedTag
+from alien_rfid.alien_antenna import reader_antennas
+
+
+def test_read_tags_by_antenna():
+    sim = SimulatedReader([SimulatedTag(b'\x01' * 12, antennas=(0, 2)), SimulatedTag(b'\x02' * 12, antennas=(2,))])
+    reader = AlienReaderTester(sim)
+    assert reader_antennas(reader) == [0, 1, 2, 3]
+    by_antenna = reader.read_tags_by_antenna([0, 1, 2])
+    assert {antenna: sorted(record.epc[0] for record in records) for antenna, records in by_antenna.items()} == {
+        0: [1], 1: [], 2: [1, 2]}
+    reader.read_tags_by_antenna([0, 1, 2])
+    assert sim.commands.count('AntennaSequence=0 1 2') == 1
+    assert sim.commands.count('TagListAntennaCombine=Off') == 1
+
+
+def test_schedule_dwells_on_busy_antennas():
+    tags = [SimulatedTag(bytes([index]) * 12, antennas=(1,)) for index in range(10)]
+    tags.append(SimulatedTag(b'\xff' * 12, antennas=(3,)))
+    sim = SimulatedReader(tags)
+    reader = AlienReaderTester(sim)
+    schedule = AntennaSchedule([0, 1, 2, 3], max_weight=4, explore_every=3)
+    assert schedule.sequence() == [0, 1, 2, 3] * 4
+    schedule.read(reader)
+    assert schedule.weights() == {0: 0, 1: 4, 2: 0, 3: 1}
+    assert schedule.sequence() == [1, 3, 1, 1, 1]
+    schedule.read(reader)
+    schedule.read(reader)
+    assert schedule.sequence() == [0, 1, 2, 3, 1, 1, 1]
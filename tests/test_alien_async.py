@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_async
+----------------------------------
+
+Tests for `alien_async` module.
+"""
+
+import asyncio
+
+from alien_rfid import AsyncAlienReaderNetwork
+
+RESPONSES = {
+    b'alien': b'Password>',
+    b'password': b'Alien>',
+    b'RFLevel=200': b'RFLevel = 200',
+    b't': b'Tag:E200 3411 B802 0115 1612 0837, Disc:2017/06/02 10:00:00, Count:1, Ant:0\r\n',
+    b'G2Read=3,0,2': b'G2Read = 01 02 03 04',
+    b'G2Write=3,0,0A 0B': b'G2Write = Success!',
+    b'quit': b'Goodbye!',
+}
+
+
+async def fake_reader(reader, writer):
+    writer.write(b'Alien RFID Reader\r\nUsername>\x00')
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        writer.write(RESPONSES.get(line.strip(), b'Error: unknown command') + b'\r\n\x00')
+        await writer.drain()
+    writer.close()
+
+
+def run_against_fake_reader(session):
+    async def main():
+        server = await asyncio.start_server(fake_reader, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            async with AsyncAlienReaderNetwork('127.0.0.1', port) as reader:
+                return await session(reader)
+    return asyncio.run(main())
+
+
+def test_read_tags():
+    async def session(reader):
+        return await reader.read_tags()
+    assert run_against_fake_reader(session) == [bytearray.fromhex('E2003411B802011516120837')]
+
+
+def test_g2_read_write():
+    async def session(reader):
+        await reader.g2_write(3, 0, b'\x0a\x0b')
+        return await reader.g2_read(3, 0, 2)
+    assert run_against_fake_reader(session) == bytearray(b'\x01\x02\x03\x04')
+
+
+def test_concurrent_readers():
+    async def session(reader):
+        async def read_one():
+            async with AsyncAlienReaderNetwork(reader.ipaddress, reader.port) as other:
+                return await other.read_tags()
+        return await asyncio.gather(*[read_one() for _ in range(5)])
+    assert run_against_fake_reader(session) == [[bytearray.fromhex('E2003411B802011516120837')]] * 5
+
+
+def test_send_many():
+    async def session(reader):
+        return await reader.send_many(['t', 'G2Read=3,0,2', 'bogus'])
+    assert run_against_fake_reader(session) == [RESPONSES[b't'].decode().strip(), 'G2Read = 01 02 03 04',
+                                                'Error: unknown command']
+
+
+def test_open_gives_up_after_one_reopen():
+    connections = []
+
+    async def silent_reader(reader, writer):
+        connections.append(writer)
+        await reader.read()
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(silent_reader, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader = AsyncAlienReaderNetwork('127.0.0.1', port, timeout=0.2)
+            try:
+                await reader.open()
+            except Exception as e:
+                return e
+
+    assert isinstance(asyncio.run(asyncio.wait_for(main(), 5)), asyncio.TimeoutError)
+    assert len(connections) == 2
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_automode
+----------------------------------
+
+Tests for `alien_automode` module.
+"""
+
+import pytest
+
+from alien_rfid import (AlienReaderTester, AutoModeSession, NotifyReceiver, SimulatedReader, SimulatedTag,
+                        TagStreamListener)
+
+
+def test_stream_acquisition_and_teardown():
+    sim = SimulatedReader([SimulatedTag(b'\x01' * 12), SimulatedTag(b'\x02' * 12)])
+    reader = AlienReaderTester(sim)
+    with TagStreamListener('127.0.0.1', port=0) as listener:
+        with AutoModeSession(reader, listener, '127.0.0.1', stop_timer=20, antenna_sequence='0') as session:
+            assert sim.setting('AutoMode') == 'On'
+            assert sim.setting('TagStreamMode') == 'On'
+            events = session.events(interval=0.05, window=1)
+            arrived = {next(events).epc[0], next(events).epc[0]}
+            events.close()
+        assert arrived == {1, 2}
+        assert not session.running
+    assert sim.setting('AutoMode') == 'Off'
+    assert sim.setting('TagStreamMode') == 'Off'
+    assert sim.setting('AutoStopTimer') == '-1'
+
+
+def test_triggered_acquisition():
+    sim = SimulatedReader([SimulatedTag(b'\x03' * 12)])
+    reader = AlienReaderTester(sim)
+    with TagStreamListener('127.0.0.1', port=0) as listener:
+        with AutoModeSession(reader, listener, '127.0.0.1', start_trigger='1 0', stop_timer=10) as session:
+            assert listener.get(timeout=0.2) is None
+            session.trigger()
+            record = listener.get(timeout=2)
+        assert record.epc == b'\x03' * 12
+    assert sim.setting('AutoStartTrigger') == '0 0'
+
+
+def test_events_need_stream_listener():
+    session = AutoModeSession(AlienReaderTester(SimulatedReader()), NotifyReceiver(print), '127.0.0.1')
+    with pytest.raises(TypeError):
+        session.events()
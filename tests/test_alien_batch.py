@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_batch
+----------------------------------
+
+Tests for `alien_batch` module.
+"""
+
+from alien_rfid import (AlienReaderTester, BatchScheduler, LockOp, ReadOp, SimulatedReader, SimulatedTag,
+                        WriteOp)
+from alien_rfid.alien_batch import epc_mask
+
+
+def test_epc_mask_and_new_epc():
+    assert epc_mask(b'\xe2\x00\x01\x02') == '1, 32, 32, E2 00 01 02'
+    assert WriteOp(1, 3, b'\xaa\xbb').new_epc(b'\x00' * 6) == b'\x00\x00\xaa\xbb\x00\x00'
+    assert WriteOp(1, 1, b'\x30\x00\xaa\xbb').new_epc(b'\x00' * 4) == b'\xaa\xbb\x00\x00'
+    assert WriteOp(3, 0, b'\xaa\xbb').new_epc(b'\x00' * 4) == b'\x00' * 4
+
+
+def test_batch_run():
+    tags = [SimulatedTag(bytes([index]) * 12) for index in range(5)]
+    tags[1].fail_writes = 1
+    sim = SimulatedReader(tags[:4], settings={'AcqG2Mask': '1, 0, 0, 00'})
+    reader = AlienReaderTester(sim)
+    reader.PIPELINE_DEPTH = 8
+    epcs = [tag.epc for tag in tags]
+    batch = BatchScheduler(reader)
+    for epc in epcs:
+        batch.add(epc, WriteOp(3, 0, b'\x12\x34', skip_unchanged=False), ReadOp(3, 0, 1), LockOp('User'))
+    batch.add(epcs[2], WriteOp(1, 2, b'\xab\xcd'))
+    batch.add(epcs[2], ReadOp(1, 2, 1))
+    results = batch.run()
+
+    assert [result.ok for result in results.values()] == [True, True, True, True, False]
+    assert results[epcs[0]].results == [1, bytearray(b'\x12\x34'), 'LockUser = Success!']
+    assert results[epcs[1]].attempts == 2
+    assert results[epcs[2]].epc == b'\xab\xcd' + b'\x02' * 10
+    assert results[epcs[2]].results[-1] == bytearray(b'\xab\xcd')
+    assert results[epcs[4]].attempts == 0
+    assert str(results[epcs[4]].error) == 'Tag not in field.'
+    assert all(3 in tag.locked for tag in tags[:4])
+    assert sim.setting('AcqG2Mask') == '1, 0, 0, 00'
+    # One mask per tag per pass, plus the mask for the new EPC and the clear mask before each inventory.
+    assert sum(1 for command in sim.commands if command.startswith('AcqG2Mask=')) == 4 + 1 + 1 + 3 + 1
+
+
+def test_batch_epc_write_in_chunks_and_verified():
+    old = bytes.fromhex('E2003411B802011516120837')
+    new = bytes.fromhex('AA003411B802011516120899')
+    sim = SimulatedReader([SimulatedTag(old), SimulatedTag(bytes(12))])
+    reader = AlienReaderTester(sim)
+    reader.PIPELINE_DEPTH = 8
+    batch = BatchScheduler(reader)
+    # Words 0 and 5 of the EPC change, which skip_unchanged would write as two G2Writes.
+    batch.add(old, WriteOp(1, 2, new, verify=True), ReadOp(1, 2, 6))
+    batch.add(bytes(12), WriteOp(1, 2, b'\x30\x00', verify=True))
+    results = batch.run()
+
+    assert results[old].ok, results[old].error
+    assert results[old].epc == new
+    assert results[old].results == [6, bytearray(new)]
+    assert results[bytes(12)].ok, results[bytes(12)].error
+    assert [tag.epc for tag in sim.tags] == [new, b'\x30\x00' + bytes(10)]
+    assert sum(1 for command in sim.commands if command.startswith('G2Write')) == 2
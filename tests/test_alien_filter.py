@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_filter
+----------------------------------
+
+Tests for `alien_filter` module.
+"""
+
+import pytest
+
+from alien_rfid import AlienReaderTester, SimulatedReader, SimulatedTag, TagFilter
+from alien_rfid.alien_filter import NO_FILTER
+from alien_rfid.alien_taglist import TagRecord
+
+
+def test_settings():
+    assert TagFilter().settings() == NO_FILTER
+    assert TagFilter(epc_prefix='303', exclude=True, rssi=(-70, -30), min_count=2).settings() == {
+        'AcqG2Mask': '1, 32, 12, 30 30',
+        'AcqG2MaskAction': 'Exclude',
+        'RSSIFilter': '-70 -30',
+        'TagStreamCountFilter': '2 0',
+    }
+    assert TagFilter(mask=(3, 0, 16, b'\xab\xcd\xef')).settings()['AcqG2Mask'] == '3, 0, 16, AB CD'
+    with pytest.raises(ValueError):
+        TagFilter(epc_prefix=b'\x30', mask=(1, 32, 8, b'\x30'))
+    with pytest.raises(ValueError):
+        TagFilter(mask=(1, 32, 24, b'\x30'))
+
+
+def test_matches():
+    tag_filter = TagFilter(epc_prefix=b'\x30\x34', rssi=(-70, -30), min_count=2)
+    assert tag_filter.matches(TagRecord(b'\x30\x34\x00', count=3, rssi=-50.0))
+    assert not tag_filter.matches(TagRecord(b'\x30\x35\x00', count=3, rssi=-50.0))
+    assert not tag_filter.matches(TagRecord(b'\x30\x34\x00', count=1, rssi=-50.0))
+    assert not tag_filter.matches(TagRecord(b'\x30\x34\x00', count=3, rssi=-20.0))
+    assert TagFilter(epc_prefix='303', exclude=True).filter([TagRecord(b'\x30\x34'), TagRecord(b'\x30\x44')]) == [
+        TagRecord(b'\x30\x44')]
+
+
+def test_reader_side_filter():
+    tags = [SimulatedTag(b'\x30\x34' + bytes([index]) * 10, rssi=-40.0 - index) for index in range(10)]
+    tags += [SimulatedTag(b'\xe2\x00' + bytes([index]) * 10, rssi=-40.0) for index in range(10)]
+    sim = SimulatedReader(tags, rssi_noise=0)
+    reader = AlienReaderTester(sim)
+    tag_filter = TagFilter(epc_prefix='3034', rssi=(-45, -30))
+    tag_filter.apply(reader)
+    assert tag_filter.apply(reader) == []
+    epcs = reader.read_tags()
+    assert sorted(epc[2] for epc in epcs) == [0, 1, 2, 3, 4, 5]
+    assert TagFilter(epc_prefix='3034', rssi=(-42, -30)).apply(reader) == ['RSSIFilter']
+    assert len(reader.read_tags()) == 3
+    TagFilter.clear(reader)
+    assert len(reader.read_tags()) == 20
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_fleet
+----------------------------------
+
+Tests for `alien_fleet` module.
+"""
+
+import threading
+
+import pytest
+
+from alien_rfid import ReaderFleet
+from alien_rfid.alien_taglist import TagRecord
+
+
+class FakeReader(object):
+    def __init__(self, ipaddress, tags, barrier=None):
+        self.ipaddress = ipaddress
+        self.tags = tags
+        self.barrier = barrier
+        self.connected = False
+
+    def open(self):
+        self.connected = True
+
+    def close(self):
+        self.connected = False
+
+    def read_tags(self, retry_count=2):
+        if self.barrier:
+            # Only passes when every reader is being read at the same time.
+            self.barrier.wait(timeout=5)
+        if isinstance(self.tags, Exception):
+            raise self.tags
+        return [bytearray(tag) for tag in self.tags]
+
+    def read_tag_list(self, retry_count=2):
+        return [TagRecord(bytes(tag), antenna=1) for tag in self.read_tags(retry_count)]
+
+
+def test_inventory_merges_by_epc():
+    barrier = threading.Barrier(3)
+    readers = [FakeReader('10.0.0.1', [b'\x01', b'\x02'], barrier),
+               FakeReader('10.0.0.2', [b'\x02'], barrier),
+               FakeReader('10.0.0.3', [b'\x03'], barrier)]
+    with ReaderFleet(readers) as fleet:
+        assert all(reader.connected for reader in fleet)
+        inventory = fleet.inventory()
+    assert not any(reader.connected for reader in readers)
+    assert sorted(inventory) == [b'\x01', b'\x02', b'\x03']
+    assert inventory[b'\x02'].readers == ['10.0.0.1', '10.0.0.2']
+    assert inventory[b'\x03'].sightings == [('10.0.0.3', 1)]
+
+
+def test_failed_reader_kept_in_errors():
+    fleet = ReaderFleet([FakeReader('10.0.0.1', [b'\x01']), FakeReader('10.0.0.2', IOError('timed out'))])
+    assert list(fleet.inventory()) == [b'\x01']
+    assert list(fleet.errors) == ['10.0.0.2']
+    fleet.close()
+
+
+def test_duplicate_name_rejected():
+    fleet = ReaderFleet([FakeReader('10.0.0.1', [])])
+    with pytest.raises(ValueError):
+        fleet.add(FakeReader('10.0.0.1', []))
+    fleet.add(FakeReader('10.0.0.1', []), name='dock-2')
+    assert len(fleet) == 2
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_framing
+----------------------------------
+
+Tests for `alien_framing` module.
+"""
+
+import pytest
+
+from alien_rfid.alien_framing import FrameBuffer, ReaderTimeoutException
+
+
+def chunk_reader(*chunks):
+    remaining = list(chunks)
+
+    def read_chunk():
+        return remaining.pop(0) if remaining else b''
+    return read_chunk
+
+
+def test_frame_split_across_chunks():
+    frames = FrameBuffer()
+    assert frames.read_frame(chunk_reader(b'Tag:E200', b' 3411\r\n', b'\x00')) == b'Tag:E200 3411\r\n'
+    assert len(frames) == 0
+
+
+def test_leftover_kept_for_next_frame():
+    frames = FrameBuffer()
+    read_chunk = chunk_reader(b'RFLevel = 200\x00Goodbye!\x00Alien', b'>\x00')
+    assert frames.read_frame(read_chunk) == b'RFLevel = 200'
+    assert frames.read_frame(read_chunk) == b'Goodbye!'
+    assert frames.read_frame(read_chunk) == b'Alien>'
+
+
+def test_memoryview_chunks():
+    frames = FrameBuffer()
+    scratch = bytearray(b'abc\x00def')
+    frames.feed(memoryview(scratch)[:6])
+    scratch[:] = b'xxxxxxx'
+    assert frames.next_frame() == b'abc'
+    assert frames.next_frame() is None
+    frames.feed(b'\x00')
+    assert frames.next_frame() == b'de'
+
+
+def test_no_data_raises_timeout():
+    frames = FrameBuffer()
+    with pytest.raises(ReaderTimeoutException):
+        frames.read_frame(chunk_reader(b'partial'))
+    frames.clear()
+    assert frames.next_frame() is None
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_inventory
+----------------------------------
+
+Tests for `alien_inventory` module.
+"""
+
+import asyncio
+import queue
+import time
+
+from alien_rfid import (ARRIVAL, DEPARTURE, AlienReaderTester, AsyncAlienReaderNetwork, SimulatedReader,
+                        SimulatedTag)
+from alien_rfid.alien_inventory import SeenSet, inventory_stream
+from alien_rfid.alien_taglist import TagRecord
+
+
+def test_seen_set_window_and_bound():
+    seen = SeenSet(window=5, max_tags=2)
+    events = seen.update([TagRecord(b'\x01', count=2), TagRecord(b'\x02', count=1)], now=0)
+    assert [(event.kind, event.epc) for event in events] == [(ARRIVAL, b'\x01'), (ARRIVAL, b'\x02')]
+    assert seen.update([TagRecord(b'\x01', count=3)], now=3) == []
+    assert [event.epc for event in seen.expire(now=6)] == [b'\x02']
+    events = seen.update([TagRecord(b'\x03'), TagRecord(b'\x04')], now=7)
+    assert [(event.kind, event.epc, event.count) for event in events] == [
+        (ARRIVAL, b'\x03', 1), (ARRIVAL, b'\x04', 1), (DEPARTURE, b'\x01', 5)]
+    assert len(seen) == 2
+
+
+def test_polled_stream():
+    first, second = SimulatedTag(b'\x01' * 12), SimulatedTag(b'\x02' * 12)
+    sim = SimulatedReader([first])
+    reader = AlienReaderTester(sim)
+    events = []
+    for event in reader.inventory_stream(interval=0.01, window=0.05, duration=0.3):
+        events.append((event.kind, event.epc[0]))
+        if event.kind == ARRIVAL and event.epc[0] == 1:
+            sim.tags = [second]
+    assert events == [(ARRIVAL, 1), (ARRIVAL, 2), (DEPARTURE, 1), (DEPARTURE, 2)]
+    assert sim.commands.count('t') > 10
+
+
+def test_pushed_stream():
+    class Listener(object):
+        def __init__(self):
+            self.records = queue.Queue()
+            self.running = True
+
+        def get(self, timeout=None):
+            try:
+                return self.records.get(timeout=timeout)
+            except queue.Empty:
+                return None
+
+    listener = Listener()
+    for _ in range(3):
+        listener.records.put(TagRecord(b'\x05', count=1))
+    events = list(inventory_stream(listener, interval=0.01, window=0.05, duration=0.1))
+    assert [(event.kind, event.count) for event in events] == [(ARRIVAL, 1), (DEPARTURE, 3)]
+
+
+def test_pushed_stream_departs_while_tags_arrive():
+    class BusyListener(object):
+        # Tag 5 once, then tag 6 without a pause for half a second.
+        running = True
+
+        def __init__(self):
+            self.start = time.monotonic()
+            self.first = True
+
+        def get(self, timeout=None):
+            if self.first:
+                self.first = False
+                return TagRecord(b'\x05', count=1)
+            if time.monotonic() - self.start < 0.5:
+                return TagRecord(b'\x06', count=1)
+            time.sleep(timeout or 0)
+            return None
+
+    listener = BusyListener()
+    for event in inventory_stream(listener, interval=0.01, window=0.05, duration=0.6):
+        if event.kind == DEPARTURE:
+            assert event.epc == b'\x05'
+            assert time.monotonic() - listener.start < 0.3
+            break
+    else:
+        assert False, 'no departure'
+
+
+def test_async_stream():
+    class FakeAsyncReader(AsyncAlienReaderNetwork):
+        async def read_tag_list(self, retry_count=2):
+            return [TagRecord(b'\x07')]
+
+    async def collect():
+        return [event.kind async for event in FakeAsyncReader().inventory_stream(interval=0.01, duration=0.05)]
+    assert asyncio.run(collect()) == [ARRIVAL, DEPARTURE]
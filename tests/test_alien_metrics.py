@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_metrics
+----------------------------------
+
+Tests for `alien_metrics` module.
+"""
+
+from alien_rfid import AlienReaderNetwork, AlienReaderTester, ReaderMetrics, ReaderSimulatorServer, SimulatedReader
+from alien_rfid import SimulatedTag
+from alien_rfid.alien_metrics import FIRST_BYTE, Histogram, OTHER, PARSE, TOTAL, _known_verbs, command_verb
+
+
+def test_command_verb():
+    assert command_verb('get RFLevel') == 'RFLevel'
+    assert command_verb('set AcqG2Q = 3') == 'AcqG2Q'
+    assert command_verb('G2Read=3,0,2') == 'G2Read'
+    assert command_verb('t') == 't'
+    assert command_verb('quit') == 'Quit'
+    assert command_verb('s3cret') == OTHER
+    # Verbs are read from the TesterIO command help, so a change to the help shows here.
+    assert len(_known_verbs()) == 170
+
+
+def test_login_not_timed():
+    with ReaderSimulatorServer(SimulatedReader(), port=0, username='admin', password='s3cret') as server:
+        reader = AlienReaderNetwork(*server.address, username='admin', password='s3cret')
+        reader.metrics = ReaderMetrics()
+        with reader:
+            reader.get_setting('ReaderName')
+        verbs = set(reader.metrics.as_dict()['histograms'])
+        assert 'ReaderName' in verbs
+        assert not verbs & {'admin', 's3cret', OTHER}
+
+
+def test_histogram():
+    histogram = Histogram((0.001, 0.01, 0.1))
+    for value in (0.0005, 0.005, 0.005, 0.05, 0.5):
+        histogram.observe(value)
+    assert histogram.buckets == [1, 2, 1, 1]
+    assert histogram.percentile(0.5) == 0.01
+    assert histogram.percentile(1.0) == 0.5
+    assert histogram.as_dict()['count'] == 5
+
+
+def test_reader_metrics():
+    sim = SimulatedReader([SimulatedTag(bytes(12))])
+    reader = AlienReaderTester(sim)
+    reader.metrics = ReaderMetrics(labels={'reader': 'sim'})
+    events = []
+    reader.metrics.add_hook(lambda name, verb, value: events.append((name, verb)))
+    reader.read_tags()
+    reader.g2_read(3, 0, 2)
+    reader.send_receive('RFLevel=200')
+    assert reader.metrics.histogram('t').count == 1
+    assert reader.metrics.histogram('t', PARSE).count == 1
+    assert reader.metrics.histogram('G2Read', FIRST_BYTE).count == 1
+    assert ('total', 'RFLevel') in events
+
+    sim.tags = []
+    reader.read_tags(retry_count=2)
+    assert reader.metrics.counters['no_tags_retry', 't'] == 2
+    exported = reader.metrics.as_dict()
+    assert exported['histograms']['t'][TOTAL]['count'] == 4
+    assert exported['counters']['no_tags_retry'] == {'t': 2}
+    text = reader.metrics.prometheus()
+    assert 'alien_rfid_command_total_seconds_count{reader="sim",verb="t"} 4' in text
+    assert 'alien_rfid_no_tags_retry_total{reader="sim",verb="t"} 2' in text
+
+
+def test_recovery_counted():
+    sim = SimulatedReader(drop_rate=1.0)
+    reader = AlienReaderTester(sim)
+    reader.metrics = ReaderMetrics()
+    reader.reconnect_policy.max_attempts = 1
+    try:
+        reader.send_receive('get ReaderName')
+    except Exception:
+        pass
+    assert reader.metrics.counters['timeout_error', None] == 2
+    assert reader.metrics.counters['resync', None] == 1
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_notify
+----------------------------------
+
+Tests for `alien_notify` module.
+"""
+
+import socket
+import time
+
+from alien_rfid import NotifyReceiver
+from alien_rfid.alien_notify import parse_notification
+
+TEXT_MESSAGE = """#Alien RFID Reader Auto Notification Message
+#ReaderName: Dock Door 1
+#IPAddress: 10.0.0.21
+#Time: 2017/06/02 10:00:01
+#Reason: TAGS ADDED
+Tag:E200 3411 B802 0115 1612 0837, Disc:2017/06/02 10:00:00, Last:2017/06/02 10:00:01, Count:4, Ant:1, Proto:2
+Tag:3000 1234, Disc:2017/06/02 10:00:00, Last:2017/06/02 10:00:01, Count:1, Ant:0, Proto:2
+#End of Notification Message"""
+
+XML_MESSAGE = """<?xml version="1.0" encoding="UTF-8"?>
+<Alien-RFID-Reader-Auto-Notification>
+  <ReaderName>Dock Door 2</ReaderName>
+  <IPAddress>10.0.0.22</IPAddress>
+  <Reason>TAGS ADDED</Reason>
+  <Alien-RFID-Tag-List>
+    <Alien-RFID-Tag>
+      <TagID>E200 3411 B802 0115 1612 0837</TagID>
+      <DiscoveryTime>2017/06/02 10:00:00</DiscoveryTime>
+      <LastSeenTime>2017/06/02 10:00:01</LastSeenTime>
+      <Antenna>3</Antenna>
+      <ReadCount>7</ReadCount>
+      <Protocol>2</Protocol>
+    </Alien-RFID-Tag>
+  </Alien-RFID-Tag-List>
+</Alien-RFID-Reader-Auto-Notification>"""
+
+
+def test_parse_text():
+    notification = parse_notification(TEXT_MESSAGE)
+    assert notification.reader_name == 'Dock Door 1'
+    assert notification.reason == 'TAGS ADDED'
+    assert [tag.count for tag in notification.tags] == [4, 1]
+    assert notification.tags[1].reader == '10.0.0.21'
+
+
+def test_parse_xml():
+    notification = parse_notification(XML_MESSAGE)
+    assert notification.ip_address == '10.0.0.22'
+    assert len(notification.tags) == 1
+    tag = notification.tags[0]
+    assert (tag.epc, tag.antenna, tag.count) == (bytes.fromhex('E2003411B802011516120837'), 3, 7)
+
+
+def test_receiver_batches_to_sink():
+    batches = []
+    with NotifyReceiver(batches.append, '127.0.0.1', 0, batch_interval=0.2) as receiver:
+        with socket.create_connection(receiver.address) as sock:
+            sock.sendall(TEXT_MESSAGE.encode() + b'\x00' + XML_MESSAGE.encode() + b'\x00')
+        with socket.create_connection(receiver.address) as sock:
+            sock.sendall(b'not xml or text\x00<broken')
+        deadline = time.monotonic() + 5
+        while sum(len(batch) for batch in batches) + receiver.parse_errors < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    notifications = [notification for batch in batches for notification in batch]
+    assert {notification.reader_name for notification in notifications} == {'Dock Door 1', 'Dock Door 2', None}
+    assert receiver.parse_errors == 1
+
+
+def test_sink_error_keeps_dispatching():
+    batches = []
+
+    def sink(notifications):
+        batches.append(notifications)
+        if len(batches) == 1:
+            raise ValueError('sink failed')
+
+    with NotifyReceiver(sink, '127.0.0.1', 0, batch_interval=0.05) as receiver:
+        for _ in range(3):
+            with socket.create_connection(receiver.address) as sock:
+                sock.sendall(TEXT_MESSAGE.encode() + b'\x00')
+            deadline = time.monotonic() + 5
+            count = len(batches)
+            while len(batches) == count and time.monotonic() < deadline:
+                time.sleep(0.01)
+    assert len(batches) == 3
+    assert receiver.sink_errors == 1
+    assert isinstance(receiver.last_sink_error, ValueError)
+
+
+def test_configure_reader():
+    commands = []
+
+    class Reader(object):
+        def send_receive(self, msg=''):
+            commands.append(msg)
+            return msg
+
+    NotifyReceiver(None, port=4002).configure(Reader(), '10.0.0.50', 'XML', queue_limit=1000)
+    assert commands == ['NotifyFormat=XML', 'NotifyTrigger=Add', 'NotifyAddress=10.0.0.50:4002',
+                        'NotifyQueueLimit=1000', 'NotifyMode=On']
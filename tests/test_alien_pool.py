@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_pool
+----------------------------------
+
+Tests for `alien_pool` module.
+"""
+
+import socketserver
+import threading
+import time
+
+import pytest
+
+from alien_rfid import ReaderPool
+
+
+class FakeReaderHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.connections += 1
+        self.wfile.write(b'Alien RFID Reader\r\nUsername>\x00')
+        for line in self.rfile:
+            command = line.strip().decode()
+            self.server.commands.append(command)
+            if command == 'quit':
+                self.wfile.write(b'Goodbye!\r\n\x00')
+                return
+            self.wfile.write(command.replace('=', ' = ').encode() + b'\r\n\x00')
+
+
+@pytest.fixture
+def fake_reader():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), FakeReaderHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.commands = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_session_reused(fake_reader):
+    pool = ReaderPool(keepalive_interval=None)
+    port = fake_reader.server_address[1]
+
+    def use():
+        with pool.session('127.0.0.1', port) as reader:
+            assert reader.send_receive('RFLevel') == 'RFLevel'
+
+    threads = [threading.Thread(target=use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert fake_reader.connections == 1
+    assert len(pool) == 1
+    with pytest.raises(ValueError):
+        with pool.session('127.0.0.1', port, password='other'):
+            pass
+    pool.close()
+    time.sleep(0.2)
+    assert fake_reader.commands[-1] == 'quit'
+
+
+def test_keepalive_idle_sessions(fake_reader):
+    pool = ReaderPool(keepalive_interval=0.1)
+    with pool.session('127.0.0.1', fake_reader.server_address[1]):
+        pass
+    time.sleep(0.5)
+    pool.close()
+    assert 'get ReaderName' in fake_reader.commands
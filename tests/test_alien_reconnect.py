@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_reconnect
+----------------------------------
+
+Tests for `alien_reconnect` module.
+"""
+
+import socket
+
+import pytest
+
+from alien_rfid import AlienReaderTester
+from alien_rfid.alien_exceptions import AuthenticationException, NotConnectedException, ReaderTimeoutException
+from alien_rfid.alien_reconnect import ReconnectPolicy, RAISE, RECONNECT, RESYNC, RETRY
+from tests.test_alien_rfid import MemoryIO
+
+
+def test_classify():
+    assert ReconnectPolicy.classify(socket.timeout()) == 'timeout'
+    assert ReconnectPolicy.classify(ReaderTimeoutException()) == 'timeout'
+    assert ReconnectPolicy.classify(ConnectionResetError()) == 'connection'
+    assert ReconnectPolicy.classify(NotConnectedException()) == 'connection'
+    assert ReconnectPolicy.classify(AuthenticationException()) == 'auth'
+    assert ReconnectPolicy.classify(ValueError()) == 'protocol'
+
+
+def test_actions_and_counters():
+    policy = ReconnectPolicy(max_attempts=2)
+    assert policy.action(socket.timeout(), 0) == RESYNC
+    assert policy.action(socket.timeout(), 1) == RECONNECT
+    assert policy.action(socket.timeout(), 2) == RAISE
+    assert policy.action(ValueError(), 0) == RETRY
+    assert policy.action(AuthenticationException(), 0) == RAISE
+    assert policy.action(socket.timeout(), 0, in_flight=3) == RECONNECT
+    assert policy.counters['timeout'] == 4
+    assert policy.counters[RECONNECT] == 2
+
+
+def test_backoff_grows_with_jitter():
+    policy = ReconnectPolicy(base_delay=1, max_delay=4, jitter=0.25)
+    assert policy.delay(0) == 0
+    assert 0.75 <= policy.delay(1) <= 1.25
+    assert 1.5 <= policy.delay(2) <= 2.5
+    assert 3 <= policy.delay(10) <= 5
+
+
+class LateIO(object):
+    """
+    Serial-like interface whose first response arrives only after the read for it has timed out.
+    """
+
+    def __init__(self):
+        self.pending = []
+        self.written = []
+        self.closed = 0
+
+    def write(self, msg_bytes):
+        command = msg_bytes.decode().strip()
+        self.written.append(command)
+        if len(self.written) == 1:
+            self.pending += [b'', command.encode() + b' = late\r\n\x00']
+        else:
+            self.pending.append(command.encode() + b' = ok\r\n\x00')
+
+    def read(self, size=1):
+        return self.pending.pop(0) if self.pending else b''
+
+    def close(self):
+        self.closed += 1
+
+
+def test_timeout_resyncs_without_reconnect():
+    io = LateIO()
+    reader = AlienReaderTester(io)
+    assert reader.send_receive('get RFLevel') == 'get RFLevel = ok'
+    assert io.written == ['get RFLevel', 'get RFLevel']
+    assert io.closed == 0
+    assert reader.reconnect_policy.counters[RESYNC] == 1
+
+
+def test_auth_error_not_retried():
+    reader = AlienReaderTester(LateIO())
+
+    def login_failure():
+        raise AuthenticationException('Trouble logging in')
+
+    with pytest.raises(AuthenticationException):
+        reader._reopen_on_failure(login_failure)
+    assert reader.reconnect_policy.counters['auth'] == 1
+
+
+class StallIO(MemoryIO):
+    """
+    MemoryIO whose response to one command arrives only after the read for it has timed out, and which
+    drops anything not yet read when closed, as a new connection would.
+    """
+
+    def __init__(self, banks, stall):
+        super(StallIO, self).__init__(banks)
+        self.stall = stall
+        self.chunks = []
+        self.closed = 0
+
+    def _respond(self, command):
+        if not command:
+            return 'Alien>'
+        return super(StallIO, self)._respond(command)
+
+    def write(self, msg_bytes):
+        self.writes += 1
+        for line in msg_bytes.decode().split('\r\n')[:-1]:
+            self.commands.append(line)
+            if line == self.stall:
+                self.stall = None
+                self.chunks.append(b'')
+            self.chunks.append(self._respond(line).encode() + b'\r\n\x00')
+
+    def read(self, size=1):
+        return self.chunks.pop(0) if self.chunks else b''
+
+    def close(self):
+        self.closed += 1
+        self.chunks = []
+
+
+def test_stall_in_pipelined_batch_reconnects():
+    user = bytearray(range(64))
+    io = StallIO({3: user}, stall='G2Read=3,4,4')
+    reader = AlienReaderTester(io)
+    reader.PIPELINE_DEPTH = 4
+    assert reader.read_bank(3, 0, 16, chunk_words=4) == user[:32]
+    assert io.closed == 1
+    assert reader.reconnect_policy.counters[RECONNECT] == 1
+    assert reader.reconnect_policy.counters[RESYNC] == 0
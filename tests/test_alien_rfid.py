@@ -12,6 +12,7 @@ import pytest
 
 
 from alien_rfid import alien_rfid
+from alien_rfid import AlienReaderTester
 
 
 @pytest.fixture
@@ -28,3 +29,139 @@ def test_content(response):
     """
     # from bs4 import BeautifulSoup
     # assert 'GitHub' in BeautifulSoup(response.content).title.string
+
+
+class MemoryIO(object):
+    """
+    Serial-like interface answering G2Read and G2Write from memory banks, failing the listed reads once.
+    """
+
+    def __init__(self, banks, fail_reads=(), settings=None):
+        self.banks = banks
+        self.settings = settings or {}
+        self.fail_reads = set(fail_reads)
+        self.commands = []
+        self.writes = 0
+        self.pending = b''
+
+    def _respond(self, command):
+        if command.startswith('get '):
+            name = command[4:]
+            return '{} = {}'.format(name, self.settings[name]) if name in self.settings else 'Error: No such command.'
+        name, _, args = command.partition('=')
+        if name not in ('G2Read', 'G2Write'):
+            return command.replace('=', ' = ')
+        args = args.split(',')
+        bank, start = self.banks[int(args[0])], int(args[1]) * 2
+        if name == 'G2Read':
+            if command in self.fail_reads:
+                self.fail_reads.remove(command)
+                return 'G2Read = No tags found.'
+            return 'G2Read = ' + ' '.join('{:02X}'.format(b) for b in bank[start:start + int(args[2]) * 2])
+        data = bytes.fromhex(args[2])
+        bank[start:start + len(data)] = data
+        return 'G2Write = Success!'
+
+    def write(self, msg_bytes):
+        self.writes += 1
+        for line in msg_bytes.decode().split('\r\n')[:-1]:
+            self.commands.append(line)
+            self.pending += self._respond(line).encode() + b'\r\n\x00'
+
+    def read(self, size=1):
+        data, self.pending = self.pending[:size], self.pending[size:]
+        return data
+
+
+def test_read_bank_chunks_and_retries_failed():
+    user = bytearray(range(256)) * 2
+    io = MemoryIO({3: user}, fail_reads=['G2Read=3,37,32'])
+    reader = AlienReaderTester(io)
+    reader.PIPELINE_DEPTH = 4
+    assert reader.read_bank(3, 5, 70) == user[10:150]
+    assert io.commands == ['G2Read=3,5,32', 'G2Read=3,37,32', 'G2Read=3,69,6', 'G2Read=3,37,32']
+    assert io.writes == 2
+
+
+def test_read_bank_gives_up():
+    io = MemoryIO({3: bytearray(64)}, fail_reads=['G2Read=3,0,8'])
+    with pytest.raises(Exception):
+        AlienReaderTester(io).read_bank(3, 0, 8, retry_count=0)
+
+
+def test_write_bank_skips_unchanged_words():
+    user = bytearray(128)
+    target = bytearray(user)
+    target[10:14] = b'\x01\x02\x03\x04'
+    target[18:20] = b'\x05\x06'
+    target[100:102] = b'\x07\x08'
+    io = MemoryIO({3: user})
+    reader = AlienReaderTester(io)
+    reader.PIPELINE_DEPTH = 8
+    assert reader.write_bank(3, 0, target, verify=True) == 6
+    assert user == target
+    assert [command for command in io.commands if command.startswith('G2Write')] == [
+        'G2Write=3,5,01 02 03 04 00 00 00 00 05 06', 'G2Write=3,50,07 08']
+
+
+def test_write_bank_block_mode():
+    user = bytearray(range(64))
+    io = MemoryIO({3: user}, settings={'ProgBlockSize': 4, 'ProgBlockAlign': 'On'})
+    reader = AlienReaderTester(io)
+    assert reader.prog_block() == (4, True)
+    assert reader.write_bank(3, 2, b'\xff' * 28, skip_unchanged=False, chunk_words=10) == 16
+    assert user == bytearray(range(4)) + b'\xff' * 28 + bytearray(range(32, 64))
+    # Padded to whole blocks, with the words already there.
+    assert [command.split(',')[1] for command in io.commands if command.startswith('G2Write')] == ['0', '8']
+
+
+def test_write_chunks_merge_widened_runs():
+    assert alien_rfid._write_chunks([[0, 1], [5, 6]], 0, 16, 32, 8, True) == [(0, 8)]
+    assert alien_rfid._write_chunks([[0, 1], [9, 10]], 0, 16, 32, 8, True) == [(0, 16)]
+    assert alien_rfid._write_chunks([[0, 1], [9, 10]], 0, 16, 32, 8, False) == [(0, 1), (9, 1)]
+
+
+def test_prog_block_unsupported():
+    assert AlienReaderTester(MemoryIO({})).prog_block() == (0, False)
+
+
+def test_send_many_one_write_per_window():
+    io = MemoryIO({}, settings={'AcqG2Cycles': 8, 'AcqG2Q': 3, 'RFLevel': 200})
+    reader = AlienReaderTester(io)
+    commands = ['get AcqG2Cycles', 'get AcqG2Q', 'get RFLevel', 'get Missing']
+    assert reader.send_many(commands, depth=10) == ['AcqG2Cycles = 8', 'AcqG2Q = 3', 'RFLevel = 200',
+                                                    'Error: No such command.']
+    assert io.writes == 1
+    assert reader.send_many(commands) == reader.send_many(commands, depth=10)
+    assert reader.send_many([]) == []
+
+
+def test_settings_cache():
+    io = MemoryIO({}, settings={'ProgBlockSize': 2, 'ProgBlockAlign': 'Off'})
+    reader = AlienReaderTester(io)
+    assert reader.set_setting('RFLevel', 200) is True
+    assert reader.set_setting('rflevel', '200') is False
+    assert reader.get_setting('RFLevel') == '200'
+    assert reader.prog_block() == reader.prog_block() == (2, False)
+    assert io.commands == ['RFLevel=200', 'get ProgBlockSize', 'get ProgBlockAlign']
+    reader.send_receive('set RFLevel=250')
+    assert 'RFLevel' not in reader.settings
+    reader.send_receive('FactorySettings')
+    assert reader.settings == {}
+
+
+def test_open_sets_rf_level_once_per_session():
+    class LoginTester(AlienReaderTester):
+        def _connect(self):
+            return True
+
+        def _login(self):
+            self.set_setting('RFLevel', self.rf_level)
+
+    io = MemoryIO({})
+    reader = LoginTester(io)
+    reader.open()
+    assert io.commands == ['RFLevel=200']
+    reader.get_setting('RFLevel')
+    reader.open()
+    assert io.commands == ['RFLevel=200', 'RFLevel=200']
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_session
+----------------------------------
+
+Tests for `alien_session` module.
+"""
+
+import threading
+
+import pytest
+
+from alien_rfid import AlienReaderNetwork, AlienReaderTester, ReaderSession, ReaderSimulatorServer, SimulatedReader
+from alien_rfid import SimulatedTag
+from alien_rfid.alien_session import _repeatable
+
+
+def test_threads_share_reader():
+    sim = SimulatedReader([SimulatedTag(bytes(12))], latency=0.001)
+    errors = []
+
+    def work(session, thread):
+        for index in range(20):
+            name = 'thread{}-{}'.format(thread, index)
+            response = session.send_receive('ReaderName={}'.format(name))
+            if response != 'ReaderName = {}'.format(name):
+                errors.append(response)
+        if session.read_tags() != [bytearray(12)]:
+            errors.append('read_tags')
+
+    with ReaderSimulatorServer(sim, port=0) as server:
+        with ReaderSession(AlienReaderNetwork(*server.address)) as session:
+            threads = [threading.Thread(target=work, args=(session, thread)) for thread in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert session.call(lambda reader: reader.get_setting('RFLevel')) == '200'
+        assert not session.reader.connected
+    assert errors == []
+    assert len([command for command in sim.commands if command.startswith('ReaderName=')]) == 160
+
+
+def test_errors_and_closed_session():
+    sim = SimulatedReader()
+    with ReaderSimulatorServer(sim, port=0) as server:
+        session = ReaderSession(AlienReaderNetwork(*server.address))
+        with session:
+            with pytest.raises(ZeroDivisionError):
+                session.call(lambda reader: 1 / 0)
+            assert session.get_setting('RFLevel') == '200'
+        with pytest.raises(Exception):
+            session.send_receive('get RFLevel')
+
+
+def test_only_repeatable_commands_pipelined():
+    assert _repeatable('get RFLevel')
+    assert _repeatable('ReaderName=dock')
+    assert _repeatable('t')
+    assert _repeatable('G2Read=3,0,2')
+    for command in ('G2Write=3,0,00 01', 'AutoModeTriggerNow', 'Reboot', 'Quit', 'Clear TagList', 'LockUser'):
+        assert not _repeatable(command)
+
+    sim = SimulatedReader()
+    reader = AlienReaderTester(sim)
+    reader.PIPELINE_DEPTH = 8
+    session = ReaderSession(reader)
+    batches = []
+    send_many = reader.send_many
+    reader.send_many = lambda msgs, depth=None: batches.append(list(msgs)) or send_many(msgs, depth)
+    session.start()
+    # Hold the worker, so the commands all wait in the queue together.
+    release = threading.Event()
+    held = session.submit(release.wait)
+    futures = [session.submit_command(command) for command in (
+        'get RFLevel', 'ReaderName=dock', 'AutoModeTriggerNow', 'get ReaderName', 't')]
+    release.set()
+    assert held.result(5)
+    assert [future.result(5) for future in futures][3] == 'ReaderName = dock'
+    session.close(close_reader=False)
+    assert batches == [['get RFLevel', 'ReaderName=dock'], ['get ReaderName', 't']]
+    assert sim.commands[-3:] == ['AutoModeTriggerNow', 'get ReaderName', 't']
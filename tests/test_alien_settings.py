@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_settings
+----------------------------------
+
+Tests for `alien_settings` module.
+"""
+
+import pytest
+
+from alien_rfid import AlienReaderTester, ReaderSettings
+from alien_rfid.alien_settings import _TYPES, SETTINGS, lookup
+
+from .test_alien_rfid import MemoryIO
+
+
+def test_catalogue():
+    assert lookup('acqg2q') is SETTINGS['AcqG2Q']
+    assert SETTINGS['AcqG2Q'].settable
+    assert not SETTINGS['ReaderVersion'].settable
+    assert 'TagList' not in SETTINGS
+
+
+def test_catalogue_matches_command_help():
+    # The catalogue is read from the TesterIO command help, so a change to the help shows here.
+    assert len(SETTINGS) == 123
+    assert sorted(name for name, setting in SETTINGS.items() if not setting.settable) == [
+        'DSPVersion', 'ExternalInput', 'MACAddress', 'MaxAntenna', 'ReaderType', 'ReaderVersion', 'Uptime']
+    assert set(_TYPES) <= set(SETTINGS)
+    with pytest.raises(ValueError):
+        lookup('NoSuchSetting')
+
+
+def test_typed_get_set():
+    io = MemoryIO({}, settings={'AcqG2Q': '3', 'NotifyMode': 'OFF', 'TagListFormat': 'text'})
+    settings = ReaderSettings(AlienReaderTester(io))
+    assert settings['AcqG2Q'] == 3
+    assert settings['NotifyMode'] is False
+    assert settings.get('TagListFormat') == 'Text'
+    assert settings.set('AcqG2Q', 3) is False
+    assert settings.set('NotifyMode', True) is True
+    with pytest.raises(ValueError):
+        settings['AcqG2Q'] = 16
+    with pytest.raises(ValueError):
+        settings['TagListFormat'] = 'Binary'
+    with pytest.raises(ValueError):
+        settings['ReaderVersion'] = '1'
+    assert io.commands == ['get AcqG2Q', 'get NotifyMode', 'get TagListFormat', 'NotifyMode=On']
+
+
+def test_get_all_and_apply_batch():
+    io = MemoryIO({}, settings={'AcqG2Q': '3', 'AcqG2Cycles': '1', 'AutoMode': 'Off'})
+    reader = AlienReaderTester(io)
+    reader.PIPELINE_DEPTH = 10
+    settings = ReaderSettings(reader)
+    assert settings.get_all(['AcqG2Q', 'AcqG2Cycles', 'AutoMode', 'AcqG2Count']) == {
+        'AcqG2Q': 3, 'AcqG2Cycles': 1, 'AutoMode': False}
+    assert io.writes == 1
+    assert settings.get_all(['AcqG2Q', 'AutoMode']) == {'AcqG2Q': 3, 'AutoMode': False}
+    assert io.writes == 1
+
+    assert settings.apply({'AcqG2Q': 4, 'AcqG2Cycles': 1, 'AutoMode': 'off', 'AcqG2Session': 2}) == [
+        'AcqG2Q', 'AcqG2Session']
+    assert io.writes == 2
+    assert io.commands[-2:] == ['AcqG2Q=4', 'AcqG2Session=2']
+    assert settings.snapshot()['AcqG2Q'] == 4
+    assert settings.apply({'AcqG2Q': 4, 'AcqG2Session': 2}) == []
+    assert io.writes == 2
+
+
+def test_read_only_settings_not_cached():
+    io = MemoryIO({}, settings={'Uptime': '5', 'AcqG2Q': '3'})
+    settings = ReaderSettings(AlienReaderTester(io))
+    assert settings['Uptime'] == '5'
+    io.settings['Uptime'] = '9'
+    assert settings['Uptime'] == '9'
+    assert settings.get_all(['Uptime', 'AcqG2Q']) == {'Uptime': '9', 'AcqG2Q': 3}
+    io.settings['Uptime'] = '12'
+    assert settings.get_all(['Uptime', 'AcqG2Q']) == {'Uptime': '12', 'AcqG2Q': 3}
+    assert 'Uptime' not in settings.snapshot()
+    assert io.commands.count('get AcqG2Q') == 1
+
+
+def test_rf_level_range_matches_reader():
+    with pytest.raises(ValueError):
+        ReaderSettings(AlienReaderTester(MemoryIO({})))['RFLevel'] = 300
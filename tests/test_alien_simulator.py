@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_simulator
+----------------------------------
+
+Tests for `alien_simulator` module.
+"""
+
+import pytest
+
+from alien_rfid import (AlienReaderNetwork, AlienReaderTester, ReaderSettings, ReaderSimulatorServer, SimulatedReader,
+                        SimulatedTag)
+from alien_rfid.alien_exceptions import AuthenticationException, ReaderTimeoutException
+from alien_rfid.alien_settings import SETTINGS
+from alien_rfid.alien_simulator import DEFAULT_SETTINGS, random_tags
+
+EPC = bytes.fromhex('E2003411B802011516120837')
+
+
+def test_tester_session():
+    sim = SimulatedReader([SimulatedTag(EPC, antennas=(0, 1), rssi=-50.0)], rssi_noise=0, seed=1)
+    with AlienReaderTester(sim) as reader:
+        assert reader.connected
+        assert reader.read_tags() == [bytearray(EPC)]
+        reader.send_receive('AntennaSequence=0 1')
+        reader.send_receive('TagListAntennaCombine=Off')
+        reader.use_compact_tag_list()
+        records = reader.read_tag_list()
+        assert [(record.antenna, record.rssi) for record in records] == [(0, -50.0), (1, -50.0)]
+        reader.g2_write(3, 2, b'\x0a\x0b')
+        assert reader.g2_read(3, 2, 1) == bytearray(b'\x0a\x0b')
+        assert 'Error' in reader.send_receive('AcqG2Q=99')
+        assert 'Error' in reader.send_receive('ReaderVersion=1')
+    assert sim.commands[-1] == 'quit'
+    assert not reader.connected
+
+
+def test_mask_and_population():
+    tags = random_tags(50, antennas=(0, 1), seed=3)
+    sim = SimulatedReader(tags, settings={'AntennaSequence': '0 1'}, seed=3)
+    reader = AlienReaderTester(sim)
+    assert sorted(reader.read_tags()) == sorted(bytearray(tag.epc) for tag in tags)
+    mask = tags[0].epc[:4].hex(' ').upper()
+    reader.send_receive('AcqG2Mask=1, 32, 32, {}'.format(mask))
+    assert reader.read_tags() == [bytearray(tags[0].epc)]
+    reader.send_receive('AcqG2MaskAction=Exclude')
+    assert len(reader.read_tags()) == 49
+
+
+def test_error_injection():
+    reader = AlienReaderTester(SimulatedReader(drop_rate=1.0))
+    with pytest.raises(ReaderTimeoutException):
+        reader.send_receive('get ReaderName')
+    reader = AlienReaderTester(SimulatedReader(error_rate=1.0))
+    assert reader.send_receive('get ReaderName').startswith('Error')
+
+
+def test_network_server():
+    sim = SimulatedReader([SimulatedTag(EPC)])
+    with ReaderSimulatorServer(sim, port=0) as server:
+        host, port = server.address
+        with AlienReaderNetwork(host, port) as reader:
+            assert reader.read_tags() == [bytearray(EPC)]
+            assert reader.get_setting('RFLevel') == '200'
+        with pytest.raises(AuthenticationException):
+            AlienReaderNetwork(host, port, password='wrong').open()
+
+
+def test_default_settings_in_range():
+    # Every default the simulator boots with can be set back through the settings catalogue.
+    sim = SimulatedReader()
+    settings = ReaderSettings(AlienReaderTester(sim))
+    values = settings.get_all([name for name in DEFAULT_SETTINGS if name in SETTINGS and SETTINGS[name].settable])
+    assert values['RFLevel'] == 290
+    for name, value in values.items():
+        SETTINGS[name].type.to_reader(value)
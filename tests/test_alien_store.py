@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_store
+----------------------------------
+
+Tests for `alien_store` module.
+"""
+
+import os
+
+import pytest
+
+from alien_rfid import TagEventStore
+from alien_rfid.alien_store import StoredRead
+from alien_rfid.alien_taglist import TagRecord
+
+
+def _fill(store, count):
+    for index in range(count):
+        store.append(TagRecord(bytes([index]) * 12, antenna=index % 2, rssi=-50.25, reader='dock{}'.format(index % 3)),
+                     timestamp=1000.0 + index)
+
+
+def test_append_and_query(tmp_path):
+    with TagEventStore(str(tmp_path), segment_records=10, index_every=4) as store:
+        _fill(store, 25)
+        store.append(b'\xe2\x00\x01', timestamp=2000.5)
+        assert len(store) == 26
+        reads = list(store.query(1003, 1006))
+        assert reads == [StoredRead(1000.0 + index, bytes([index]) * 12, 'dock{}'.format(index % 3), index % 2, -50.25)
+                         for index in (3, 4, 5)]
+        assert [read.timestamp for read in store.query(1008, 1012, antenna=0)] == [1008.0, 1010.0]
+        assert [read.epc[0] for read in store.query(reader='dock1')] == list(range(1, 25, 3))
+        assert list(store.query(epc=b'\xe2\x00\x01')) == [StoredRead(2000.5, b'\xe2\x00\x01')]
+        assert list(store.query(reader='unknown')) == []
+        assert [read.epc[0] for read in store.replay(1020, speed=None, antenna=1)] == [21, 23]
+    assert sorted(name for name in os.listdir(str(tmp_path)) if name.endswith('.seg')) == [
+        '00000000.seg', '00000001.seg', '00000002.seg']
+    with TagEventStore(str(tmp_path), epc_size=2) as store:
+        assert store.epc_size == 18
+        with pytest.raises(ValueError):
+            store.append(b'\x00' * 19)
+
+
+def test_reopen_and_recover(tmp_path):
+    path = str(tmp_path)
+    with TagEventStore(path, segment_records=10, index_every=4, epc_size=12) as store:
+        _fill(store, 15)
+    segment = os.path.join(path, '00000001.seg')
+    with open(segment, 'ab') as f:
+        f.write(b'\x01\x02\x03')
+    os.remove(os.path.join(path, '00000000.idx'))
+    with TagEventStore(path) as store:
+        assert store.epc_size == 12
+        assert len(store) == 15
+        assert [read.timestamp for read in store.query(1007, 1012)] == [1007.0, 1008.0, 1009.0, 1010.0, 1011.0]
+        _fill(store, 2)
+        assert len(list(store.query(reader='dock2'))) == 5
+    assert os.path.getsize(os.path.join(path, '00000000.idx')) == 2 * 16
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_stream
+----------------------------------
+
+Tests for `alien_stream` module.
+"""
+
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+
+from alien_rfid import TagStreamListener
+from alien_rfid.alien_taglist import CustomTagListParser
+
+TAG_LINE = b'Tag:E200 3411 B802 0115 1612 0837, Disc:2017/06/02 10:00:00, Last:2017/06/02 10:00:01, ' \
+           b'Count:4, Ant:1, Proto:2\r\n'
+
+
+class CommandRecorder(object):
+    def __init__(self):
+        self.commands = []
+
+    def send_receive(self, msg=''):
+        self.commands.append(msg)
+        return msg.replace('=', ' = ')
+
+
+def test_tcp_stream_from_many_readers():
+    with TagStreamListener('127.0.0.1', 0) as listener:
+        for _ in range(3):
+            with socket.create_connection(listener.address) as sock:
+                sock.sendall(b'#Alien RFID Reader Stream\r\n' + TAG_LINE + b'\x00')
+        tags = [listener.get(timeout=2) for _ in range(3)]
+    assert [tag.antenna for tag in tags] == [1, 1, 1]
+    assert tags[0].epc == bytes.fromhex('E2003411B802011516120837')
+    assert tags[0].reader == '127.0.0.1'
+    assert list(listener) == []
+
+
+def test_udp_stream_async_iteration():
+    async def consume(listener):
+        return [tag async for tag in listener]
+
+    with TagStreamListener('127.0.0.1', 0, protocol='udp') as listener:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.sendto(TAG_LINE * 2, listener.address)
+        assert listener.get(timeout=2).count == 4
+    assert len(asyncio.run(consume(listener))) == 1
+
+
+def test_configure_reader():
+    reader = CommandRecorder()
+    listener = TagStreamListener(port=4001)
+    listener.configure(reader, '10.0.0.50')
+    listener.unconfigure(reader)
+    assert reader.commands == ['TagStreamFormat=Text', 'TagStreamAddress=10.0.0.50:4001', 'TagStreamMode=On',
+                               'TagStreamMode=Off']
+
+
+def test_custom_stream_format():
+    reader = CommandRecorder()
+    with TagStreamListener('127.0.0.1', 0, parser=CustomTagListParser('%k;%a')) as listener:
+        listener.configure(reader, '10.0.0.50')
+        with socket.create_connection(listener.address) as sock:
+            sock.sendall(b'E2003411;2\r\n')
+        tag = listener.get(timeout=2)
+    assert (tag.epc, tag.antenna) == (bytes.fromhex('E2003411'), 2)
+    assert reader.commands[:2] == ['TagStreamFormat=Custom', 'TagStreamCustomFormat=%k;%a']
+
+
+def test_bad_line_keeps_connection():
+    with TagStreamListener('127.0.0.1', 0) as listener:
+        with socket.create_connection(listener.address) as sock:
+            sock.sendall(b'Tag:E200, Count:many\r\n' + TAG_LINE)
+        assert listener.get(timeout=2).count == 4
+    assert listener.parse_errors == 1
+
+
+def test_stop_with_full_queue_and_restart():
+    listener = TagStreamListener('127.0.0.1', 0, max_queued=1)
+    listener.start()
+    with socket.create_connection(listener.address) as sock:
+        sock.sendall(TAG_LINE * 3)
+    deadline = time.monotonic() + 2
+    while not listener.records.full() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stopping = threading.Thread(target=listener.stop)
+    stopping.start()
+    stopping.join(2)
+    assert not stopping.is_alive()
+    # Time for the blocked handler to see the stop and give up its record.
+    time.sleep(0.3)
+    assert len(list(listener)) == 1
+    listener.start()
+    try:
+        assert listener.get(timeout=0.1) is None
+        assert listener.running
+        with socket.create_connection(listener.address) as sock:
+            sock.sendall(TAG_LINE)
+        assert listener.get(timeout=2).antenna == 1
+    finally:
+        listener.stop()
+
+
+def test_get_before_start_raises():
+    listener = TagStreamListener('127.0.0.1', 0)
+    with pytest.raises(Exception, match='not started'):
+        listener.get(timeout=0.1)
+    with pytest.raises(Exception, match='not started'):
+        next(iter(listener))
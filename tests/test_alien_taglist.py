@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_taglist
+----------------------------------
+
+Tests for `alien_taglist` module.
+"""
+
+import pytest
+
+from alien_rfid import AlienReaderTester
+from alien_rfid.alien_taglist import (COMPACT_TAG_LIST_FORMATS, TEXT_TAG_LIST, CompactTagListParser,
+                                      CustomTagListParser, TagRecord, parse_tag_line, tag_list_parser)
+
+
+def test_parse_text_line():
+    record = parse_tag_line('Tag:E200 3411 B802 0115 1612 0837, Disc:2017/06/02 10:00:00, '
+                            'Last:2017/06/02 10:00:01, Count:4, Ant:1, Proto:2, Rssi:-52.5')
+    assert record == TagRecord(bytes.fromhex('E2003411B802011516120837'), '2017/06/02 10:00:00',
+                               '2017/06/02 10:00:01', 4, 1, 2, -52.5)
+
+
+def test_parse_variable_length_epc():
+    assert parse_tag_line('Tag:3000 1234, Count:1').epc == b'\x30\x00\x12\x34'
+
+
+def test_non_tag_line():
+    assert parse_tag_line('(No Tags)') is None
+
+
+class ScriptedIO(object):
+    """
+    Serial-like interface replying to each written command from a dict of responses.
+    """
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.written = []
+        self.pending = b''
+
+    def write(self, msg_bytes):
+        command = msg_bytes.decode().strip()
+        self.written.append(command)
+        self.pending += self.responses.get(command, 'Error: unknown').encode() + b'\r\n\x00'
+
+    def read(self, size=1):
+        data, self.pending = self.pending[:size], self.pending[size:]
+        return data
+
+
+TAG_LIST = '\r\n'.join([
+    'Tag:E200 3411 B802 0115 1612 0837, Disc:2017/06/02 10:00:00, Last:2017/06/02 10:00:01, Count:4, Ant:1, Proto:2',
+    'Tag:3000 1234, Disc:2017/06/02 10:00:00, Last:2017/06/02 10:00:02, Count:9, Ant:0, Proto:2',
+])
+
+
+def test_text_tag_list():
+    records = TEXT_TAG_LIST.parse(TAG_LIST)
+    assert [record.epc for record in records] == [bytes.fromhex('E2003411B802011516120837'), b'\x30\x00\x12\x34']
+    assert [(record.count, record.antenna) for record in records] == [(4, 1), (9, 0)]
+    assert TEXT_TAG_LIST.epcs(TAG_LIST) == [bytearray(record.epc) for record in records]
+
+
+def test_text_tag_list_extra_fields():
+    records = TEXT_TAG_LIST.parse(TAG_LIST + ', Rssi:-40.5')
+    assert [record.rssi for record in records] == [None, -40.5]
+
+
+def test_custom_tag_list():
+    parser = CustomTagListParser('%k,%a,%r,%m,%d %t')
+    records = parser.parse('E2003411B802,3,12,-51.5,2017/06/02 10:00:00\r\n3000,0,1,-70,2017/06/02 10:00:01\r\n')
+    assert records[0] == TagRecord(bytes.fromhex('E2003411B802'), '2017/06/02 10:00:00', None, 12, 3, None, -51.5)
+    assert records[1].epc == b'\x30\x00'
+    assert parser.epcs('E2003411B802,3,12,-51.5,2017/06/02 10:00:00') == [bytearray.fromhex('E2003411B802')]
+    with pytest.raises(ValueError):
+        CustomTagListParser('%a,%r')
+
+
+def test_reader_read_tag_list():
+    io = ScriptedIO({'t': TAG_LIST, 'TagListCustomFormat=%k %a': 'TagListCustomFormat = %k %a',
+                     'TagListFormat=Custom': 'TagListFormat = Custom'})
+    reader = AlienReaderTester(io)
+    assert len(reader.read_tag_list()) == 2
+    assert reader.read_tags() == [bytearray.fromhex('E2003411B802011516120837'), bytearray.fromhex('30001234')]
+    reader.set_tag_list_format('Custom', '%k %a')
+    io.responses['t'] = 'E2003411 1\r\n30001234 2'
+    assert [record.antenna for record in reader.read_tag_list()] == [1, 2]
+
+
+def test_custom_tag_list_bytes():
+    parser = CustomTagListParser('%k,%a,%r,%m')
+    data = b'E2003411B802,3,12,-51.5\r\n3000,0,1,-70\r\n'
+    assert parser.parse_bytes(data) == parser.parse(data.decode())
+    assert parser.epcs_bytes(data) == [bytearray.fromhex('E2003411B802'), bytearray(b'\x30\x00')]
+    assert parser.parse_bytes(b'(No Tags)') == []
+
+
+def test_use_compact_tag_list():
+    # Accepted, but without the RSSI in the TagList, so not used.
+    io = ScriptedIO({'TagListCustomFormat=%k,%a,%r,%m': 'TagListCustomFormat = %k,%a,%r,%m',
+                     'TagListCustomFormat=%k,%a,%r': 'TagListCustomFormat = %k,%a,%r',
+                     'TagListFormat=Custom': 'TagListFormat = Custom',
+                     'TagListFormat=Text': 'TagListFormat = Text',
+                     't': 'E2003411,1,5\r\n30001234,2,7'})
+    reader = AlienReaderTester(io)
+    assert reader.use_compact_tag_list() == '%k,%a,%r'
+    assert [(record.antenna, record.count) for record in reader.read_tag_list()] == [(1, 5), (2, 7)]
+    assert reader.use_compact_tag_list(['%k;%m']) is None
+    assert reader.tag_list_parser.tag_list_format == 'Text'
+
+
+def test_compact_parser_matches_custom():
+    for custom_format in COMPACT_TAG_LIST_FORMATS:
+        data = b'E2003411B802,3,12,-51.5\r\n3000,0,1,-70\r\n'
+        if not custom_format.endswith('%m'):
+            data = data.replace(b',-51.5', b'').replace(b',-70', b'')
+        parser = tag_list_parser('Custom', custom_format)
+        assert isinstance(parser, CompactTagListParser)
+        expected = CustomTagListParser(custom_format).parse_bytes(data)
+        assert len(expected) == 2
+        assert parser.parse_bytes(data) == expected
+        assert parser.epcs_bytes(data) == CustomTagListParser(custom_format).epcs_bytes(data)
+        assert parser.epcs_bytes(b'(No Tags)') == []
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_alien_tuning
+----------------------------------
+
+Tests for `alien_tuning` module.
+"""
+
+from alien_rfid import AcquisitionTuner, AlienReaderTester, SimulatedReader, SimulatedTag
+from alien_rfid.alien_simulator import random_tags
+
+
+def test_dense_population():
+    sim = SimulatedReader(random_tags(300, seed=1), seed=2, slot_time=5e-5)
+    reader = AlienReaderTester(sim)
+    assert reader.read_tag_list(retry_count=0) == []
+    tuner = AcquisitionTuner(reader)
+    counts = []
+    for _ in range(30):
+        counts.append(len(tuner.read()))
+    assert max(counts[-10:]) >= 270
+    assert 7 <= tuner.q <= 10
+    settings = tuner.settings()
+    tuner.read()
+    assert {name: sim.setting(name) for name in settings} == {name: str(value) for name, value in settings.items()}
+
+
+def test_empty_field():
+    reader = AlienReaderTester(SimulatedReader())
+    tuner = AcquisitionTuner(reader, max_q=9)
+    qs = []
+    for _ in range(5):
+        tuner.read()
+        qs.append(tuner.q)
+    assert qs == [5, 7, 9, 3, 5]
+
+
+def test_small_population():
+    sim = SimulatedReader([SimulatedTag(bytes([index]) * 12) for index in range(4)], seed=1, slot_time=1e-4)
+    reader = AlienReaderTester(sim)
+    tuner = AcquisitionTuner(reader, window=2)
+    for _ in range(20):
+        tuner.read()
+    assert tuner.session == 0
+    assert sim.setting('AcqG2Session') == '0'
+    assert tuner.q <= 4
+    assert sum(1 for command in sim.commands if command.startswith('AcqG2Session=')) == 1